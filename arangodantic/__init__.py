@@ -1,13 +1,36 @@
 # flake8: noqa
+from arangodantic.buffers import WriteBuffer, close_write_buffers
+from arangodantic.caches import MemoryCache, ModelCache
+from arangodantic.changes import (
+    Change,
+    ChangeFeed,
+    ChangeSubscriber,
+    ReplayChangeFeed,
+    WALChangeFeed,
+)
 from arangodantic.configurations import CONF, configure
-from arangodantic.cursor import ArangodanticCursor
+from arangodantic.cursor import ArangodanticCursor, LazyModel
 from arangodantic.directions import ASCENDING, DESCENDING
 from arangodantic.exceptions import *
+from arangodantic.explain import QueryPlan
 from arangodantic.graphs import ArangodanticGraphConfig, EdgeDefinition, Graph
+from arangodantic.identity_map import IdentityMap, get_identity_map, use_identity_map
+from arangodantic.indexes import (
+    FulltextIndex,
+    GeoIndex,
+    HashIndex,
+    Index,
+    InvertedIndex,
+    PersistentIndex,
+    TTLIndex,
+)
 from arangodantic.models import (
     ArangodanticCollectionConfig,
     DocumentModel,
     EdgeModel,
     Model,
 )
+from arangodantic.pagination import Page
+from arangodantic.retries import RetryPolicy
+from arangodantic.transactions import Transaction, get_transaction, transaction
 from arangodantic.utils import SortTypes
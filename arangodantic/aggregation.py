@@ -0,0 +1,188 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+import pydantic
+
+from arangodantic.directions import DIRECTIONS
+from arangodantic.utils import SortTypes, split_field
+
+GroupByTypes = Union[List[str], Tuple[str, ...], Dict[str, str], None]
+MetricsTypes = Optional[Dict[str, Tuple[str, Optional[str]]]]
+
+# Aggregate functions supported by AQL, with their result type; None means the type of
+# the aggregated field
+AGGREGATE_FUNCTIONS: Dict[str, Any] = {
+    "COUNT": int,
+    "LENGTH": int,
+    "COUNT_DISTINCT": int,
+    "COUNT_UNIQUE": int,
+    "MIN": None,
+    "MAX": None,
+    "SUM": None,
+    "AVERAGE": float,
+    "AVG": float,
+    "STDDEV_POPULATION": float,
+    "STDDEV_SAMPLE": float,
+    "STDDEV": float,
+    "VARIANCE_POPULATION": float,
+    "VARIANCE_SAMPLE": float,
+    "VARIANCE": float,
+    "UNIQUE": List,
+    "SORTED_UNIQUE": List,
+    "BIT_AND": int,
+    "BIT_OR": int,
+    "BIT_XOR": int,
+}
+
+
+def normalize_group_by(group_by: GroupByTypes) -> Tuple[Tuple[str, str], ...]:
+    """
+    Get the names and fields to group by, as tuples of the name in the results and the
+    field. Fields given as a list are named after the field, with dots replaced by
+    underscores.
+
+    Example:
+        >>> normalize_group_by(["owner.name"])
+        (('owner_name', 'owner.name'),)
+    """
+    if not group_by:
+        return ()
+    if isinstance(group_by, dict):
+        return tuple(group_by.items())
+    return tuple((field.strip(".").replace(".", "_"), field) for field in group_by)
+
+
+def build_aggregate(
+    instance_name: str,
+    group_by: Tuple[Tuple[str, str], ...],
+    metrics: Tuple[Tuple[str, str, Optional[str]], ...],
+    sort: SortTypes = None,
+) -> Tuple[str, str, str, Dict[str, str]]:
+    """
+    Build the AQL COLLECT, SORT and RETURN clauses for an aggregation, and the
+    corresponding bind_vars. Fields are passed as bind_vars in the same way as for
+    filters, and the names of the results as dynamic attribute names.
+
+    Example:
+        >>> build_aggregate("i", (("type", "type"),), (("total", "SUM", "amount"),))
+        (
+            'COLLECT group_0 = i.@group_0_0 AGGREGATE metric_0 = SUM(i.@metric_0_0)',
+            '',
+            'RETURN {[@group_0_name]: group_0, [@metric_0_name]: metric_0}',
+            {
+                'group_0_0': 'type',
+                'group_0_name': 'type',
+                'metric_0_0': 'amount',
+                'metric_0_name': 'total'
+            }
+        )
+
+    :param instance_name: The name we're using in the AQL query for the instances we're
+    looping over.
+    :param group_by: Tuples of the name in the results and the field to group by.
+    :param metrics: Tuples of the name in the results, the aggregate function and the
+    field to aggregate (None for "COUNT").
+    :param sort: How to sort the results, by the names in the results.
+    :return: A tuple of the COLLECT, SORT and RETURN clauses and the bind_vars.
+    """
+    if not group_by and not metrics:
+        raise ValueError("Aggregation requires group_by or metrics")
+
+    bind_vars = {}
+    variables = {}
+
+    groups = []
+    for i, (name, field) in enumerate(group_by):
+        field_str, field_bind_vars = split_field(field, f"group_{i}")
+        bind_vars.update(field_bind_vars)
+        bind_vars[f"group_{i}_name"] = name
+        variables[name] = f"group_{i}"
+        groups.append(f"group_{i} = {instance_name}.{field_str}")
+
+    aggregates = []
+    for i, (name, function, metric_field) in enumerate(metrics):
+        if function not in AGGREGATE_FUNCTIONS:
+            raise NotImplementedError(f"Support for '{function}' not implemented")
+        if metric_field is None:
+            if function not in {"COUNT", "LENGTH"}:
+                raise ValueError(f"'{function}' of metric '{name}' requires a field")
+            value_str = "1"
+        else:
+            field_str, field_bind_vars = split_field(metric_field, f"metric_{i}")
+            bind_vars.update(field_bind_vars)
+            value_str = f"{instance_name}.{field_str}"
+        bind_vars[f"metric_{i}_name"] = name
+        variables[name] = f"metric_{i}"
+        aggregates.append(f"metric_{i} = {function}({value_str})")
+
+    collect_str = "COLLECT"
+    if groups:
+        collect_str += " " + ", ".join(groups)
+    if aggregates:
+        collect_str += " AGGREGATE " + ", ".join(aggregates)
+
+    sort_lst = []
+    for name, direction in sort or ():
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Invalid sort direction '{direction}' for {name}")
+        if name not in variables:
+            raise ValueError(f"Can not sort by '{name}', it is not in the results")
+        sort_lst.append(f"{variables[name]} {direction}")
+    sort_str = ""
+    if sort_lst:
+        sort_str = "SORT " + ", ".join(sort_lst)
+
+    return_str = "RETURN {%s}" % ", ".join(
+        f"[@{variable}_name]: {variable}" for variable in variables.values()
+    )
+
+    return collect_str, sort_str, return_str, bind_vars
+
+
+@lru_cache()
+def get_row_model(
+    cls: Type[pydantic.BaseModel],
+    group_by: Tuple[Tuple[str, str], ...],
+    metrics: Tuple[Tuple[str, str, Optional[str]], ...],
+) -> Type[pydantic.BaseModel]:
+    """
+    Get a model for the rows of an aggregation, typed after the fields of the model
+    that are grouped by and aggregated.
+
+    :param cls: The model class that is aggregated.
+    :param group_by: Tuples of the name in the results and the field to group by.
+    :param metrics: Tuples of the name in the results, the aggregate function and the
+    field to aggregate.
+    """
+    field_types = {field.alias: field.outer_type_ for field in cls.__fields__.values()}
+
+    fields: Dict[str, Any] = {}
+    for name, field in group_by:
+        fields[name] = Optional[field_types.get(field, Any)]
+
+    for name, function, metric_field in metrics:
+        field_type = field_types.get(metric_field or "", Any)
+        result_type = AGGREGATE_FUNCTIONS[function]
+        if result_type is None:
+            if function == "SUM" and field_type not in (int, float):
+                field_type = float
+            result_type = Optional[field_type]
+        elif result_type is List:
+            result_type = List[field_type]  # type: ignore
+        elif result_type is float:
+            result_type = Optional[float]
+        fields[name] = result_type
+
+    # Names starting with an underscore are renamed in the same way as "_key" etc.
+    return pydantic.create_model(  # type: ignore
+        f"{cls.__name__}Aggregate",
+        **{
+            f"{name.lstrip('_')}_"
+            if name.startswith("_")
+            else name: (
+                field_type,
+                pydantic.Field(None, alias=name),
+            )
+            for name, field_type in fields.items()
+        },
+    )
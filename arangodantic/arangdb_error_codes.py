@@ -1,6 +1,15 @@
 # Based on https://www.arangodb.com/docs/stable/appendix-error-codes.html
 
+ERROR_LOCK_TIMEOUT = 18
+ERROR_ARANGO_CONFLICT = 1200
 ERROR_ARANGO_DOCUMENT_NOT_FOUND = 1202
 ERROR_ARANGO_DATA_SOURCE_NOT_FOUND = 1203
 ERROR_ARANGO_UNIQUE_CONSTRAINT_VIOLATED = 1210
+ERROR_ARANGO_WRITE_THROTTLE_TIMEOUT = 1236
+ERROR_CLUSTER_TIMEOUT = 1457
+ERROR_CLUSTER_BACKEND_UNAVAILABLE = 1478
+ERROR_CLUSTER_SHARD_LEADER_REFUSES_REPLICATION = 1489
+ERROR_CLUSTER_SHARD_LEADER_RESIGNED = 1491
+ERROR_CLUSTER_LEADERSHIP_CHALLENGE_ONGOING = 1495
+ERROR_CLUSTER_NOT_LEADER = 1496
 ERROR_GRAPH_NOT_FOUND = 1924
@@ -0,0 +1,268 @@
+import asyncio
+import contextvars
+import logging
+import weakref
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from arangodantic.models import Model
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Buffers with a running background task, closed by "close_write_buffers"
+_running_buffers: "weakref.WeakSet[WriteBuffer]" = weakref.WeakSet()
+
+
+class WriteBuffer:
+    """
+    Write-behind buffer for new documents saved with "save(buffered=True)". The
+    documents are inserted by a background task with the multi-document endpoint of
+    ArangoDB, when **batch_size** documents are waiting or when the oldest document
+    has waited **flush_interval** seconds, whichever comes first.
+
+    Saving waits while **max_pending** documents are waiting or being written, so
+    the buffer does not grow without bounds when ArangoDB can not keep up.
+
+    Example:
+        >>> class Event(DocumentModel):
+        ...     class ArangodanticConfig:
+        ...         write_buffer = WriteBuffer(batch_size=500, flush_interval=0.1)
+        >>> future = await Event(name="login").save(buffered=True)
+        >>> await future
+        {'_key': '...', '_id': 'events/...', '_rev': '...'}
+
+    :param batch_size: Maximum number of documents to insert in one request.
+    :param flush_interval: Maximum number of seconds a document waits before it is
+    inserted.
+    :param max_pending: Maximum number of documents waiting or being written.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int = 1000,
+        flush_interval: float = 0.2,
+        max_pending: int = 10000,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        if max_pending < batch_size:
+            raise ValueError("max_pending must be at least batch_size")
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        # Documents waiting to be written, as tuples of the model, the arguments for
+        # "before_save" and the future of the document
+        self.pending: List[Tuple["Model", Dict[str, Any], asyncio.Future]] = []
+        self._task: Optional[asyncio.Future] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._oldest = 0.0
+
+    def __len__(self):
+        return len(self.pending)
+
+    async def put(self, model: "Model", **kwargs) -> "asyncio.Future[Dict[str, str]]":
+        """
+        Add a new document to the buffer, waiting while the buffer is full.
+
+        :param model: The model of the document.
+        :param kwargs: Passed on to "before_save" of the model.
+        :return: A future with the "_key", "_id" and "_rev" of the document once it
+        is inserted, or the error if inserting it failed.
+        """
+        self._start()
+        assert self._slots is not None and self._wakeup is not None
+        await self._slots.acquire()
+
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Dict[str, str]]" = loop.create_future()
+        if not self.pending:
+            self._oldest = loop.time()
+            self._wakeup.set()
+        self.pending.append((model, kwargs, future))
+        if len(self.pending) >= self.batch_size:
+            self._wakeup.set()
+        return future
+
+    async def flush(self) -> None:
+        """
+        Write all documents in the buffer, and wait until they are written.
+        """
+        if self._loop is not asyncio.get_running_loop():
+            return
+        await self._in_empty_context(self._write_all())
+
+    async def aclose(self) -> None:
+        """
+        Write all documents in the buffer and stop the background task. The buffer
+        starts again if more documents are saved.
+        """
+        if self._loop is not asyncio.get_running_loop():
+            return
+        task = self._task
+        self._task = None
+        await self._in_empty_context(self._write_all(stop=task))
+        if task is not None:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        _running_buffers.discard(self)
+
+    def _start(self) -> None:
+        """
+        Start the background task, unless it is running.
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+
+        if not self.pending or self._loop is not loop:
+            # Create the primitives in the running event loop
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._wakeup = asyncio.Event()
+            self._lock = asyncio.Lock()
+        self._loop = loop
+        self._task = self._in_empty_context(self._run())
+        _running_buffers.add(self)
+
+    @staticmethod
+    def _in_empty_context(coroutine: Coroutine[Any, Any, T]) -> "asyncio.Future[T]":
+        """
+        Run a coroutine as a task in an empty context, so the documents are not
+        written in the transaction or identity map of the code that happened to start
+        the background task or flush the buffer.
+        """
+        return contextvars.Context().run(lambda: asyncio.ensure_future(coroutine))
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None and self._lock is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self.pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            timeout = self._oldest + self.flush_interval - loop.time()
+            if len(self.pending) < self.batch_size and timeout > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            async with self._lock:
+                if self.pending:
+                    await self._write_batch()
+
+    async def _write_all(self, stop: Optional["asyncio.Future"] = None) -> None:
+        """
+        Write all documents in the buffer.
+
+        :param stop: The background task, to cancel once the documents are written
+        while holding the lock, so it is not stopped while writing.
+        """
+        assert self._lock is not None
+        async with self._lock:
+            while self.pending:
+                await self._write_batch()
+            if stop is not None:
+                stop.cancel()
+
+    async def _write_batch(self) -> None:
+        """
+        Insert the oldest documents in the buffer, at most **batch_size**, and
+        resolve their futures.
+        """
+        assert self._slots is not None
+        batch = self.pending[: self.batch_size]
+        # Any documents left are at least as old, so they are written right away
+        del self.pending[: self.batch_size]
+
+        # Groups of models as lists of the model class, the arguments and the items
+        groups: List[Tuple[Type["Model"], Dict[str, Any], list]] = []
+        for item in batch:
+            model, kwargs, future = item
+            for group_cls, group_kwargs, items in groups:
+                if group_cls is model.__class__ and group_kwargs == kwargs:
+                    items.append(item)
+                    break
+            else:
+                groups.append((model.__class__, kwargs, [item]))
+
+        try:
+            for model_cls, kwargs, items in groups:
+                await self._write_group(model_cls, kwargs, items)
+        finally:
+            # Also when the write was cancelled, so waiting for the documents or for
+            # space in the buffer does not hang
+            for _, _, future in batch:
+                self._slots.release()
+                if not future.done():
+                    future.cancel()
+
+    @staticmethod
+    async def _write_group(
+        model_cls: Type["Model"], kwargs: Dict[str, Any], items: list
+    ) -> None:
+        """
+        Insert documents of the same model class and resolve their futures.
+
+        :param model_cls: The model class.
+        :param kwargs: Passed on to "before_save" of the models.
+        :param items: The items of the buffer.
+        """
+        models = [model for model, _, _ in items]
+        try:
+            errors: List[Optional[BaseException]] = list(
+                await model_cls.save_many(models, batch_size=len(models), **kwargs)
+            )
+        except Exception as ex:
+            logger.warning(
+                "Failed to write %s buffered documents of %s: %s",
+                len(models),
+                model_cls.__name__,
+                ex,
+            )
+            errors = [ex] * len(models)
+
+        for (model, _, future), error in zip(items, errors):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(
+                    {
+                        "_key": str(model.key_),
+                        "_id": str(model.id_),
+                        "_rev": str(model.rev_),
+                    }
+                )
+
+
+async def close_write_buffers() -> None:
+    """
+    Write the documents in all write buffers and stop their background tasks, e.g.
+    when shutting down.
+    """
+    for buffer in list(_running_buffers):
+        await buffer.aclose()
@@ -0,0 +1,128 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Optional, Tuple
+
+
+class ModelCache(ABC):
+    """
+    Base class for caches of documents used by "load", keyed by the "_id" of the
+    documents. Implement the methods to store the documents elsewhere, e.g. in Redis.
+    """
+
+    # Confirm that a cached document is still current with a cheap revision check
+    # against the database before using it
+    validate_rev: bool = False
+
+    @abstractmethod
+    async def get(self, id_: str) -> Optional[dict]:
+        """
+        Get a cached document.
+
+        :param id_: The "_id" of the document.
+        :return: The document or None if it is not cached.
+        """
+
+    @abstractmethod
+    async def set(self, id_: str, document: dict) -> None:
+        """
+        Store a document in the cache.
+
+        :param id_: The "_id" of the document.
+        :param document: The document as returned by ArangoDB.
+        """
+
+    @abstractmethod
+    async def delete(self, id_: str) -> None:
+        """
+        Remove a document from the cache, if it is cached.
+
+        :param id_: The "_id" of the document.
+        """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """
+        Remove all documents from the cache.
+        """
+
+    async def clear_collection(self, collection_name: str) -> None:
+        """
+        Remove the documents of a collection from the cache. The cache can be shared
+        by models of other collections, so caches should only remove the documents of
+        the collection; by default the whole cache is cleared.
+
+        :param collection_name: The name of the collection.
+        """
+        await self.clear()
+
+
+class MemoryCache(ModelCache):
+    """
+    In-memory cache of documents with a maximum size, where the least recently used
+    documents are evicted first, and an optional time-to-live for the documents.
+    Documents are copied when stored and returned, as models keep references to the
+    nested objects of the documents they are built from.
+
+    :param maxsize: Maximum number of documents to keep.
+    :param ttl: Number of seconds a document is kept, None to keep documents until
+    they are evicted or invalidated.
+    :param validate_rev: Confirm that a cached document is still current with a
+    revision check against the database before using it.
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, ttl: Optional[float] = 60.0, validate_rev=False
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.validate_rev = validate_rev
+        self.documents: "OrderedDict[str, Tuple[Optional[float], dict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.documents)
+
+    def __contains__(self, id_: str) -> bool:
+        return id_ in self.documents
+
+    async def get(self, id_: str) -> Optional[dict]:
+        entry = self.documents.get(id_)
+        if entry is not None:
+            expires, document = entry
+            if expires is None or expires > time.monotonic():
+                self.documents.move_to_end(id_)
+                self.hits += 1
+                return deepcopy(document)
+            del self.documents[id_]
+
+        self.misses += 1
+        return None
+
+    async def set(self, id_: str, document: dict) -> None:
+        expires = None
+        if self.ttl is not None:
+            expires = time.monotonic() + self.ttl
+
+        self.documents[id_] = (expires, deepcopy(document))
+        self.documents.move_to_end(id_)
+        while len(self.documents) > self.maxsize:
+            self.documents.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, id_: str) -> None:
+        self.documents.pop(id_, None)
+
+    async def clear(self) -> None:
+        self.documents.clear()
+
+    async def clear_collection(self, collection_name: str) -> None:
+        prefix = f"{collection_name}/"
+        for id_ in [id_ for id_ in self.documents if id_.startswith(prefix)]:
+            del self.documents[id_]
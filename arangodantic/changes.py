@@ -0,0 +1,386 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Type,
+)
+
+from aioarangodb.database import StandardDatabase
+
+from arangodantic.configurations import CONF
+from arangodantic.identity_map import get_identity_map
+
+if TYPE_CHECKING:  # pragma: no cover
+    from arangodantic.models import Model
+
+logger = logging.getLogger(__name__)
+
+# Types of the WAL entries that are relevant for invalidation
+REPLICATION_COLLECTION_DROP = 2001
+REPLICATION_COLLECTION_TRUNCATE = 2004
+REPLICATION_MARKER_DOCUMENT = 2300
+REPLICATION_MARKER_REMOVE = 2302
+
+CHANGE_TYPES = {
+    REPLICATION_COLLECTION_DROP: "drop",
+    REPLICATION_COLLECTION_TRUNCATE: "truncate",
+    REPLICATION_MARKER_DOCUMENT: "save",
+    REPLICATION_MARKER_REMOVE: "remove",
+}
+
+
+class Change(NamedTuple):
+    """
+    A change to a document (or a whole collection) of a model.
+    """
+
+    tick: str
+    # One of "save", "remove", "truncate" or "drop"
+    type: str
+    model: Type["Model"]
+    key: Optional[str] = None
+    rev: Optional[str] = None
+
+
+class ChangeBatch(NamedTuple):
+    """
+    The entries returned by one call to "ChangeFeed.tail".
+    """
+
+    entries: List[dict]
+    # The tick to continue tailing from
+    tick: str
+    # More entries are available right away
+    check_more: bool = False
+    # False if entries might have been missed since the requested tick
+    from_present: bool = True
+
+
+ChangeCallback = Callable[[Change], Awaitable[None]]
+
+
+class ChangeFeed(ABC):
+    """
+    Base class for sources of the entries of the write-ahead log of ArangoDB.
+    """
+
+    @abstractmethod
+    async def last_tick(self) -> str:
+        """
+        Get the tick of the last operation, to start tailing from.
+        """
+
+    @abstractmethod
+    async def tail(self, tick: str) -> ChangeBatch:
+        """
+        Get the entries after the given tick.
+
+        :param tick: The tick of the last entry that has been handled.
+        """
+
+
+class WALChangeFeed(ChangeFeed):
+    """
+    Tail the write-ahead log of the database using the WAL API of ArangoDB.
+
+    :param db: The database to follow, by default the configured database.
+    :param chunk_size: Approximate maximum size of one response in bytes.
+    :param server_id: Unique ID of the process, lets the server keep the log until
+    this process has fetched it.
+    """
+
+    def __init__(
+        self,
+        db: Optional[StandardDatabase] = None,
+        *,
+        chunk_size: Optional[int] = None,
+        server_id: Optional[int] = None,
+    ):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.server_id = server_id
+        self.last_scanned = "0"
+
+    def get_db(self) -> StandardDatabase:
+        return self.db or CONF.db
+
+    async def last_tick(self) -> str:
+        result = await self.get_db().wal.last_tick()
+        tick: str = result["tick"]
+        return tick
+
+    async def tail(self, tick: str) -> ChangeBatch:
+        result = await self.get_db().wal.tail(
+            lower=tick,
+            last_scanned=self.last_scanned,
+            chunk_size=self.chunk_size,
+            server_id=self.server_id,
+            client_info="arangodantic",
+            deserialize=True,
+        )
+        self.last_scanned = result.get("last_scanned", self.last_scanned)
+
+        last_included = result.get("last_included", "0")
+        return ChangeBatch(
+            entries=result["content"],
+            tick=tick if last_included == "0" else last_included,
+            check_more=result.get("check_more", False),
+            from_present=result.get("from_present", True),
+        )
+
+
+class ReplayChangeFeed(ChangeFeed):
+    """
+    Replay a recorded log of WAL entries, e.g. in tests. Entries can be added while
+    the feed is in use.
+
+    :param entries: The WAL entries, in the format returned by the WAL API and
+    ordered by their "tick".
+    :param chunk_size: Maximum number of entries returned by one call to "tail".
+    """
+
+    def __init__(self, entries: Iterable[dict] = (), chunk_size: int = 100):
+        self.entries = list(entries)
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "ReplayChangeFeed":
+        """
+        Load the entries from a file with one JSON encoded entry per line, like the
+        responses of the WAL API.
+
+        :param path: Path of the file.
+        """
+        with open(path) as f:
+            return cls((json.loads(line) for line in f if line.strip()), **kwargs)
+
+    def append(self, entry: dict) -> None:
+        """
+        Add an entry to the end of the log.
+        """
+        self.entries.append(entry)
+
+    async def last_tick(self) -> str:
+        return "0"
+
+    async def tail(self, tick: str) -> ChangeBatch:
+        entries = [entry for entry in self.entries if int(entry["tick"]) > int(tick)]
+        batch = entries[: self.chunk_size]
+        return ChangeBatch(
+            entries=batch,
+            tick=batch[-1]["tick"] if batch else tick,
+            check_more=len(entries) > len(batch),
+        )
+
+
+class ChangeSubscriber:
+    """
+    Follow the changes to the collections of the registered models, e.g. by other
+    processes, and remove the changed documents from the cache of the models and the
+    identity map. Async callbacks can be registered to act on the changes as well.
+
+    The subscriber works on the identity map of the scope it is started in, if any.
+
+    Example:
+        >>> subscriber = ChangeSubscriber([Identity], feed=WALChangeFeed())
+        >>> subscriber.add_callback(on_change)
+        >>> await subscriber.start()
+
+    :param models: The models to follow the changes of.
+    :param feed: The source of the changes, by default the WAL of the configured
+    database.
+    :param poll_interval: Number of seconds to wait for new changes when all changes
+    have been handled.
+    :param tick: The tick to start following the changes after, by default the last
+    tick of the feed when starting.
+    """
+
+    def __init__(
+        self,
+        models: Iterable[Type["Model"]] = (),
+        *,
+        feed: Optional[ChangeFeed] = None,
+        poll_interval: float = 1.0,
+        tick: Optional[str] = None,
+    ):
+        self.feed = feed or WALChangeFeed()
+        self.poll_interval = poll_interval
+        self.tick = tick
+        self.models: Dict[str, List[Type["Model"]]] = {}
+        self.callbacks: List[ChangeCallback] = []
+        self._collection_ids: Optional[Dict[str, str]] = None
+        self._task: Optional[asyncio.Task] = None
+        for model in models:
+            self.register(model)
+
+    async def __aenter__(self) -> "ChangeSubscriber":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    def register(self, model: Type["Model"]) -> None:
+        """
+        Follow the changes to the collection of a model.
+
+        :param model: The model class.
+        """
+        models = self.models.setdefault(model.get_collection_name(), [])
+        if model not in models:
+            models.append(model)
+        self._collection_ids = None
+
+    def add_callback(self, callback: ChangeCallback) -> None:
+        """
+        Register an async function that is called with each "Change" to the
+        collections of the registered models, after the caches have been updated.
+
+        :param callback: The function.
+        """
+        self.callbacks.append(callback)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """
+        Start following the changes in the background.
+        """
+        if self.running:
+            return
+        if self.tick is None:
+            self.tick = await self.feed.last_tick()
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop following the changes.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to handle changes after tick %s", self.tick)
+            await asyncio.sleep(self.poll_interval)
+
+    async def poll(self) -> int:
+        """
+        Handle all changes that are available right away.
+
+        :return: The number of changes to the registered models that were handled.
+        """
+        if self.tick is None:
+            self.tick = await self.feed.last_tick()
+
+        handled = 0
+        while True:
+            batch = await self.feed.tail(self.tick)
+            if not batch.from_present:
+                # Changes might have been missed, so nothing cached can be trusted
+                await self._clear_all()
+            for entry in batch.entries:
+                for change in await self._get_changes(entry):
+                    await self._apply(change)
+                    handled += 1
+            self.tick = batch.tick
+            if not batch.check_more:
+                return handled
+
+    async def _get_changes(self, entry: dict) -> List[Change]:
+        """
+        Get the changes to the registered models described by a WAL entry.
+        """
+        change_type = CHANGE_TYPES.get(entry.get("type", 0))
+        if change_type is None:
+            return []
+
+        collection_name = entry.get("cname")
+        if collection_name is None and "cuid" in entry:
+            collection_name = (await self._get_collection_ids()).get(entry["cuid"])
+
+        data = entry.get("data") or {}
+        return [
+            Change(
+                tick=entry["tick"],
+                type=change_type,
+                model=model,
+                key=data.get("_key"),
+                rev=data.get("_rev"),
+            )
+            for model in self.models.get(collection_name or "", [])
+        ]
+
+    async def _get_collection_ids(self) -> Dict[str, str]:
+        """
+        Get the names of the collections of the registered models by their globally
+        unique IDs, used to identify collections in the WAL.
+        """
+        if self._collection_ids is None:
+            collection_ids = {}
+            for models in self.models.values():
+                properties = await models[0].get_collection().properties()
+                collection_ids[properties["global_id"]] = properties["name"]
+            self._collection_ids = collection_ids
+        return self._collection_ids
+
+    async def _apply(self, change: Change) -> None:
+        """
+        Remove the changed documents from the cache and identity map, and call the
+        callbacks.
+        """
+        model = change.model
+        cache = model.get_cache()
+        identity_map = get_identity_map()
+
+        if change.key is not None:
+            if cache is not None:
+                await cache.delete(f"{model.get_collection_name()}/{change.key}")
+            if identity_map is not None:
+                known = identity_map.get(model, change.key)
+                # Keep models that already have the revision, e.g. after own writes
+                if known is not None and known.rev_ != change.rev:
+                    identity_map.remove(model, change.key)
+        else:
+            if cache is not None:
+                await cache.clear_collection(model.get_collection_name())
+            if identity_map is not None:
+                identity_map.remove_collection(model)
+
+        for callback in self.callbacks:
+            await callback(change)
+
+    async def _clear_all(self) -> None:
+        """
+        Clear the caches and identity map entries of all registered models.
+        """
+        identity_map = get_identity_map()
+        for models in self.models.values():
+            for model in models:
+                cache = model.get_cache()
+                if cache is not None:
+                    await cache.clear_collection(model.get_collection_name())
+                if identity_map is not None:
+                    identity_map.remove_collection(model)
@@ -4,6 +4,9 @@ from aioarangodb.database import StandardDatabase
 from inflection import pluralize, underscore
 from pydantic import BaseModel
 
+from arangodantic.caches import ModelCache
+from arangodantic.retries import RetryPolicy
+
 
 class Configuration(BaseModel):
     """
@@ -17,6 +20,10 @@ class Configuration(BaseModel):
     graph_generator: Optional[Callable] = None
     lock: Optional[Callable] = None
     lock_name_prefix = "arangodantic_"
+    cache: Optional[ModelCache] = None
+    full_scan_threshold: Optional[int] = None
+    full_scan_action: str = "warn"
+    retry_policy: Optional[RetryPolicy] = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -53,6 +60,10 @@ def configure(
     collection_generator: Optional[Callable] = pluralize_underscore_class,
     graph_generator: Optional[Callable] = underscore_class,
     lock: Optional[Callable] = None,
+    cache: Optional[ModelCache] = None,
+    full_scan_threshold: Optional[int] = None,
+    full_scan_action: str = "warn",
+    retry_policy: Optional[RetryPolicy] = None,
 ) -> None:
     """Configures the DB.
 
@@ -64,10 +75,26 @@ def configure(
     :param graph_generator: A function that converts the class to a graph name.
     :param lock: A lock class (for example AsyncLock from Shylock) that provides access
     to named locks.
+    :param cache: A cache (for example a MemoryCache) for documents loaded with
+    "load", can be overridden per model in the "ArangodanticConfig".
+    :param full_scan_threshold: Explain the queries of "find" and act when they read
+    all documents of a collection with more documents than this, meant for
+    development and tests. None disables the check.
+    :param full_scan_action: What to do on such full collection scans, "warn" to log a
+    warning or "raise" to raise a FullCollectionScanError.
+    :param retry_policy: A RetryPolicy for retrying writes that fail with transient
+    errors, can be overridden per model in the "ArangodanticConfig".
     """
+    if full_scan_action not in {"warn", "raise"}:
+        raise ValueError(f"Invalid full_scan_action '{full_scan_action}'")
+
     CONF.db = db
     CONF.prefix = prefix
     CONF.key_gen = key_gen
     CONF.collection_generator = collection_generator
     CONF.graph_generator = graph_generator
     CONF.lock = lock
+    CONF.cache = cache
+    CONF.full_scan_threshold = full_scan_threshold
+    CONF.full_scan_action = full_scan_action
+    CONF.retry_policy = retry_policy
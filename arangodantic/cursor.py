@@ -1,9 +1,135 @@
-from typing import List, Optional, Type
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Deque, Dict, List, Mapping, Optional, Tuple, Type
 
 from aioarangodb import CursorCloseError
 from aioarangodb.cursor import Cursor
 
 from arangodantic.exceptions import CursorError, CursorNotFoundError
+from arangodantic.identity_map import IdentityMap, get_identity_map
+from arangodantic.utils import chunks
+
+
+def build_model(
+    cls,
+    row: dict,
+    validate: bool = True,
+    identity_map: Optional[IdentityMap] = None,
+    endpoints: Optional[Dict[str, Any]] = None,
+):
+    """
+    Build a model from a document returned by ArangoDB.
+
+    :param cls: The model class.
+    :param row: The document.
+    :param validate: Validate the document, if set to False the model is built from
+    the data as is.
+    :param identity_map: Identity map to give back a known instance from, instead of
+    building a new one.
+    :param endpoints: Resolved vertex models to set on an edge model, by field name.
+    """
+    if identity_map is not None and "_key" in row:
+        known = identity_map.get(cls, row["_key"])
+        if known is not None:
+            return set_endpoints(known, endpoints)
+
+    if validate:
+        model = cls(**row)
+    else:
+        model = cls._construct(row)
+    model._mark_saved()
+
+    if identity_map is not None:
+        model = identity_map.add(model)
+    return set_endpoints(model, endpoints)
+
+
+def set_endpoints(model, endpoints: Optional[Dict[str, Any]]):
+    """
+    Set the resolved vertex models of an edge model. They are set after building the
+    model, as validation would give back copies of the vertex models.
+
+    :param model: The edge model.
+    :param endpoints: Resolved vertex models by field name.
+    """
+    for name, vertex in (endpoints or {}).items():
+        setattr(model, name, vertex)
+    return model
+
+
+def build_models(cls, rows: List[dict], validate: bool = True) -> List:
+    """
+    Build models from a list of documents returned by ArangoDB. Used to build models
+    in an executor, so it needs to be a plain function.
+
+    :param cls: The model class.
+    :param rows: The documents.
+    :param validate: Validate the documents, see "build_model".
+    """
+    return [build_model(cls, row, validate=validate) for row in rows]
+
+
+class LazyModel:
+    """
+    Proxy for a model that is built (and validated) from the document only when one of
+    its attributes is first accessed.
+    """
+
+    __slots__ = ["_cls", "_row", "_validate", "_identity_map", "_endpoints", "_model"]
+
+    def __init__(
+        self,
+        cls,
+        row: dict,
+        validate: bool = True,
+        identity_map: Optional[IdentityMap] = None,
+        endpoints: Optional[Dict[str, Any]] = None,
+    ):
+        object.__setattr__(self, "_cls", cls)
+        object.__setattr__(self, "_row", row)
+        object.__setattr__(self, "_validate", validate)
+        object.__setattr__(self, "_identity_map", identity_map)
+        object.__setattr__(self, "_endpoints", endpoints)
+        object.__setattr__(self, "_model", None)
+
+    def get_model(self):
+        """
+        Get the actual model, building it if needed.
+        """
+        model = object.__getattribute__(self, "_model")
+        if model is None:
+            model = build_model(
+                object.__getattribute__(self, "_cls"),
+                object.__getattribute__(self, "_row"),
+                validate=object.__getattribute__(self, "_validate"),
+                identity_map=object.__getattribute__(self, "_identity_map"),
+                endpoints=object.__getattribute__(self, "_endpoints"),
+            )
+            object.__setattr__(self, "_model", model)
+            object.__setattr__(self, "_row", None)
+            object.__setattr__(self, "_endpoints", None)
+        return model
+
+    @property  # type: ignore
+    def __class__(self):
+        # Makes isinstance() checks work against the model class
+        return object.__getattribute__(self, "_cls")
+
+    def __getattr__(self, name):
+        return getattr(self.get_model(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.get_model(), name, value)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyModel):
+            other = other.get_model()
+        return self.get_model() == other
+
+    def __repr__(self):
+        return repr(self.get_model())
 
 
 class ArangodanticCursor:
@@ -15,13 +141,80 @@ class ArangodanticCursor:
     __slots__ = [
         "cls",
         "cursor",
+        "validate",
+        "identity_map",
+        "raw",
+        "lazy",
+        "prefetch",
+        "resolve",
+        "rows_fetched",
+        "batches_fetched",
+        "batch_wait_time",
+        "_rows",
+        "_started",
+        "_prefetch_queue",
+        "_prefetch_task",
+        "_vertex_identity_map",
+        "_vertices",
     ]
 
-    def __init__(self, cls, cursor: Cursor):
+    def __init__(
+        self,
+        cls,
+        cursor: Cursor,
+        *,
+        validate: bool = True,
+        partial: bool = False,
+        raw: bool = False,
+        lazy: bool = False,
+        prefetch: int = 0,
+        resolve: Optional[Mapping[str, Optional[Type]]] = None,
+    ):
+        """
+        :param cls: The model class to build instances of.
+        :param cursor: The aioarangodb cursor to wrap.
+        :param validate: Validate the documents when building the models, if set to
+        False the models are built from the data as is.
+        :param partial: Tells that the documents only contain some of the fields, so
+        the models are not shared through the identity map.
+        :param raw: Give back the documents as dictionaries instead of models.
+        :param lazy: Give back proxies that build the models on first attribute
+        access.
+        :param prefetch: Number of batches to fetch from the server in the background
+        while the current batch is being consumed, 0 disables prefetching.
+        :param resolve: The fields of edge models that hold vertex documents (instead
+        of their "_id") in the results, with the model class to build the vertices
+        as, or None to find the class by the collection of the vertex.
+        """
         from arangodantic.models import Model
 
+        if prefetch < 0:
+            raise ValueError("prefetch must not be negative")
+        if raw and lazy:
+            raise ValueError("raw and lazy can not be combined")
+
         self.cls: Type[Model] = cls
         self.cursor: Cursor = cursor
+        self.validate = validate
+        self.identity_map = None if partial else get_identity_map()
+        self.raw = raw
+        self.lazy = lazy
+        self.prefetch = prefetch
+        self.resolve = resolve or {}
+
+        # Statistics about the consumption of the cursor
+        self.rows_fetched = 0
+        self.batches_fetched = 0
+        self.batch_wait_time = 0.0
+
+        self._rows: Deque[dict] = deque()
+        self._started = time.monotonic()
+        self._prefetch_queue: Optional[asyncio.Queue] = None
+        self._prefetch_task: Optional[asyncio.Task] = None
+
+        # Vertices of resolved edges, so each vertex is only built once
+        self._vertex_identity_map = get_identity_map()
+        self._vertices: Dict[str, Any] = {}
 
     def __aiter__(self):
         return self
@@ -56,6 +249,17 @@ class ArangodanticCursor:
         :raise CursorNotFoundError: If the cursor was missing and **ignore_missing** was
         False.
         """
+        if self._prefetch_task is not None:
+            # Wait for the task to stop, so no fetch is in flight when the cursor is
+            # deleted on the server
+            task = self._prefetch_task
+            self._prefetch_task = None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
         try:
             result: Optional[bool] = await self.cursor.close(
                 ignore_missing=ignore_missing
@@ -68,14 +272,216 @@ class ArangodanticCursor:
         return result
 
     async def next(self):
-        return self.cls(**(await self.cursor.next()))
+        if not self._rows:
+            batch = await self._next_batch()
+            if batch is None:
+                raise StopAsyncIteration
+            self._rows.extend(batch)
+        return self._build(self._rows.popleft())
+
+    async def batches(self) -> AsyncIterator[List]:
+        """
+        Iterate over the results one batch at a time, as they are fetched from the
+        server. Only one batch is held in memory at a time (plus any prefetched
+        batches), which makes it possible to go through large results with bounded
+        memory, especially together with the "batch_size" and "stream" options of
+        "find".
+
+        Example:
+            >>> async with await Model.find(batch_size=1000, stream=True) as cursor:
+            ...     async for models in cursor.batches():
+            ...         ...
+        """
+        if self._rows:
+            rows = list(self._rows)
+            self._rows.clear()
+            yield [self._build(row) for row in rows]
+
+        while True:
+            batch = await self._next_batch()
+            if batch is None:
+                return
+            yield [self._build(row) for row in batch]
+
+    @property
+    def throughput(self) -> float:
+        """
+        The number of rows fetched per second since the cursor was created.
+        """
+        elapsed = time.monotonic() - self._started
+        if elapsed <= 0:
+            return 0.0
+        return self.rows_fetched / elapsed
+
+    async def _next_batch(self) -> Optional[List[dict]]:
+        """
+        Get the next batch of rows, fetching it from the server if needed.
+
+        :return: The rows of the batch, or None if the results are depleted.
+        """
+        batch: Optional[List[dict]]
+        start = time.monotonic()
+        if self.prefetch:
+            if self._prefetch_queue is None:
+                self._prefetch_queue = asyncio.Queue(maxsize=self.prefetch)
+                self._prefetch_task = asyncio.ensure_future(self._prefetch_batches())
+            item = await self._prefetch_queue.get()
+            if item is None or isinstance(item, BaseException):
+                # Keep the end marker or error for any later calls
+                self._prefetch_queue.put_nowait(item)
+                if item is not None:
+                    raise item
+            batch = item
+        else:
+            batch = self._pop_batch()
+            if batch is None and self.cursor.has_more():
+                await self.cursor.fetch()
+                batch = self._pop_batch()
+        self.batch_wait_time += time.monotonic() - start
+
+        if batch is not None:
+            self.rows_fetched += len(batch)
+            self.batches_fetched += 1
+        return batch
+
+    def _pop_batch(self) -> Optional[List[dict]]:
+        """
+        Take the current batch of the underlying cursor, if it is not empty.
+        """
+        batch = self.cursor.batch()
+        if not batch:
+            return None
+        rows = list(batch)
+        batch.clear()
+        return rows
+
+    async def _prefetch_batches(self) -> None:
+        """
+        Fetch batches from the server in the background and put them in the prefetch
+        queue, ending with None when the results are depleted. Any error is put in
+        the queue to be raised to the consumer.
+        """
+        assert self._prefetch_queue is not None
+        try:
+            while True:
+                batch = self._pop_batch()
+                if batch is not None:
+                    await self._prefetch_queue.put(batch)
+                if not self.cursor.has_more():
+                    break
+                await self.cursor.fetch()
+            await self._prefetch_queue.put(None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            await self._prefetch_queue.put(ex)
+
+    def _build(self, row: dict):
+        """
+        Build a model (or dictionary or lazy model, depending on the mode of the
+        cursor) from a row of the results.
+        """
+        if self.raw:
+            return row
+        row, endpoints = self._resolve(row)
+        if self.lazy:
+            return LazyModel(
+                self.cls,
+                row,
+                validate=self.validate,
+                identity_map=self.identity_map,
+                endpoints=endpoints,
+            )
+        return build_model(
+            self.cls,
+            row,
+            validate=self.validate,
+            identity_map=self.identity_map,
+            endpoints=endpoints,
+        )
+
+    def _resolve(self, row: dict) -> Tuple[dict, Optional[Dict[str, Any]]]:
+        """
+        Build the vertex models of the resolved fields of a row, reusing the vertices
+        that were already built.
 
-    async def to_list(self) -> List:
+        :param row: The row of the results.
+        :return: The row with the vertices replaced by their "_id", and the vertex
+        models by field name.
+        """
+        if not self.resolve:
+            return row, None
+
+        row = dict(row)
+        endpoints = {}
+        for name, vertex_cls in self.resolve.items():
+            alias = self.cls.__fields__[name].alias
+            document = row.get(alias)
+            if not isinstance(document, dict):
+                # The vertex does not exist, so only the "_id" is known
+                continue
+
+            id_ = document["_id"]
+            vertex = self._vertices.get(id_)
+            if vertex is None:
+                if vertex_cls is None:
+                    from arangodantic.models import get_document_model
+
+                    vertex_cls = get_document_model(id_.split("/", 1)[0])
+                vertex = build_model(
+                    vertex_cls,
+                    document,
+                    validate=self.validate,
+                    identity_map=self._vertex_identity_map,
+                )
+                self._vertices[id_] = vertex
+            row[alias] = id_
+            endpoints[name] = vertex
+        return row, endpoints
+
+    async def to_list(
+        self, executor: Optional[Executor] = None, chunk_size: int = 1000
+    ) -> List:
         """
         Convert the cursor to a list.
+
+        :param executor: Build the models in this executor (e.g. a
+        ThreadPoolExecutor or ProcessPoolExecutor) instead of in the event loop, to
+        avoid blocking the event loop when building large numbers of models. Ignored
+        for raw and lazy cursors and when resolving vertices. Process pools require
+        the model classes to be importable, and arangodantic to be configured in the
+        worker processes when partial updates are used.
+        :param chunk_size: Maximum number of models to build in one call in the
+        executor.
         """
-        async with self as cursor:
-            return [i async for i in cursor]
+        if executor is None or self.raw or self.lazy or self.resolve:
+            async with self as cursor:
+                return [i async for i in cursor]
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        loop = asyncio.get_event_loop()
+        results = []
+        async with self:
+            rows: Optional[List[dict]] = list(self._rows)
+            self._rows.clear()
+            while rows is not None:
+                built = await asyncio.gather(
+                    *[
+                        loop.run_in_executor(
+                            executor, build_models, self.cls, chunk, self.validate
+                        )
+                        for chunk in chunks(rows, chunk_size)
+                    ]
+                )
+                for models in built:
+                    if self.identity_map is not None:
+                        models = [self.identity_map.add(model) for model in models]
+                    results.extend(models)
+                rows = await self._next_batch()
+
+        return results
 
     @property
     def full_count(self) -> int:
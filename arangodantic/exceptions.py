@@ -24,6 +24,10 @@ class UniqueConstraintError(ArangodanticError):
     pass
 
 
+class RevisionConflictError(ArangodanticError):
+    pass
+
+
 class GraphNotFoundError(ArangodanticError):
     pass
 
@@ -34,3 +38,7 @@ class ConfigError(ArangodanticError):
 
 class CursorError(ArangodanticError):
     pass
+
+
+class FullCollectionScanError(ArangodanticError):
+    pass
@@ -0,0 +1,80 @@
+from typing import Any, Dict, Iterator, List, NamedTuple
+
+from aioarangodb.database import StandardDatabase
+from aioarangodb.exceptions import AQLQueryExplainError
+from aioarangodb.request import Request
+
+# Plan node that reads all documents of a collection
+ENUMERATE_COLLECTION_NODE = "EnumerateCollectionNode"
+
+
+class QueryPlan(NamedTuple):
+    """
+    The execution plan chosen by the optimizer of ArangoDB for a query.
+    """
+
+    # The plan as returned by the explain API of ArangoDB
+    plan: dict
+    # The indexes used by the plan
+    indexes: List[dict]
+    # The estimated cost of the plan, only comparable to other plans
+    estimated_cost: float
+    # Names of the collections of which all documents are read
+    collection_scans: List[str]
+    # Warnings about the query from the optimizer
+    warnings: List[dict]
+
+
+def iter_plan_nodes(nodes: List[dict]) -> Iterator[dict]:
+    """
+    Iterate over the nodes of a plan, including the nodes of subqueries.
+
+    :param nodes: The "nodes" of the plan.
+    """
+    for node in nodes:
+        yield node
+        subquery = node.get("subquery")
+        if subquery:
+            yield from iter_plan_nodes(subquery.get("nodes", []))
+
+
+async def explain_query(
+    db: StandardDatabase, query: str, bind_vars: Dict[str, Any]
+) -> QueryPlan:
+    """
+    Get the execution plan of a query without running it. The explain method of
+    aioarangodb does not support bind_vars, so the request is made here.
+
+    :param db: The database to explain the query in.
+    :param query: The AQL query.
+    :param bind_vars: The bind_vars of the query.
+    :return: The plan.
+    """
+    request = Request(
+        method="post",
+        endpoint="/_api/explain",
+        data={"query": query, "bindVars": bind_vars, "options": {"allPlans": False}},
+    )
+
+    def response_handler(resp) -> QueryPlan:
+        if not resp.is_success:
+            raise AQLQueryExplainError(resp, request)
+
+        plan = resp.body["plan"]
+        indexes = []
+        collection_scans = []
+        for node in iter_plan_nodes(plan.get("nodes", [])):
+            indexes.extend(node.get("indexes", []))
+            if node.get("type") == ENUMERATE_COLLECTION_NODE:
+                collection_scans.append(node["collection"])
+
+        return QueryPlan(
+            plan=plan,
+            indexes=indexes,
+            estimated_cost=plan.get("estimatedCost", 0.0),
+            collection_scans=list(dict.fromkeys(collection_scans)),
+            warnings=resp.body.get("warnings", []),
+        )
+
+    result: QueryPlan = await db._execute(request, response_handler)
+    return result
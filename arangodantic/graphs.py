@@ -1,6 +1,6 @@
 from abc import ABC
 from functools import lru_cache
-from typing import Dict, List, Optional, Type, Union
+from typing import Dict, List, Optional, Type, Union, cast
 
 import aioarangodb.graph
 import pydantic
@@ -8,7 +8,12 @@ from aioarangodb import GraphDeleteError
 from aioarangodb.database import StandardDatabase
 from pydantic import Field
 
-from arangodantic import GraphNotFoundError, ModelNotFoundError, UniqueConstraintError
+from arangodantic import (
+    GraphNotFoundError,
+    ModelNotFoundError,
+    RevisionConflictError,
+    UniqueConstraintError,
+)
 from arangodantic.arangdb_error_codes import (
     ERROR_ARANGO_DOCUMENT_NOT_FOUND,
     ERROR_ARANGO_UNIQUE_CONSTRAINT_VIOLATED,
@@ -16,6 +21,7 @@ from arangodantic.arangdb_error_codes import (
 )
 from arangodantic.configurations import CONF
 from arangodantic.models import DocumentModel, EdgeModel, Model
+from arangodantic.transactions import get_transaction
 
 
 class EdgeDefinition(pydantic.BaseModel):
@@ -47,6 +53,9 @@ class Graph(ABC):
 
     @classmethod
     def get_db(cls) -> StandardDatabase:
+        transaction = get_transaction()
+        if transaction is not None:
+            return cast(StandardDatabase, transaction.db)
         return CONF.db
 
     @classmethod
@@ -66,6 +75,8 @@ class Graph(ABC):
         :raise UniqueConstraintViolated: Raised when there is a unique constraint
         violation.
         :raise ModelNotFoundError: If any of the models are not found.
+        :raise RevisionConflictError: Raised when an existing document has another
+        revision than the model.
         """
 
         graph = cls.get_graph()
@@ -86,12 +97,20 @@ class Graph(ABC):
             try:
                 collection_name = model.get_collection_name()
                 if isinstance(model, EdgeModel):
-                    response = await graph.insert_edge(
-                        collection=collection_name, edge=data
+                    response = await model._with_retry(
+                        "save",
+                        lambda: graph.insert_edge(
+                            collection=collection_name, edge=data
+                        ),
+                        idempotent=False,
                     )
                 else:
-                    response = await graph.insert_vertex(
-                        collection=collection_name, vertex=data
+                    response = await model._with_retry(
+                        "save",
+                        lambda: graph.insert_vertex(
+                            collection=collection_name, vertex=data
+                        ),
+                        idempotent=False,
                     )
             except aioarangodb.exceptions.DocumentInsertError as ex:
                 if ex.error_code == ERROR_ARANGO_UNIQUE_CONSTRAINT_VIOLATED:
@@ -105,9 +124,19 @@ class Graph(ABC):
             data = model.get_arangodb_data()
             try:
                 if isinstance(model, EdgeModel):
-                    response = await graph.replace_edge(edge=data)
+                    # Replacing checks the revision, which fails for a retry once
+                    # the request was applied
+                    response = await model._with_retry(
+                        "save", lambda: graph.replace_edge(edge=data), idempotent=False
+                    )
                 else:
-                    response = await graph.replace_vertex(vertex=data)
+                    response = await model._with_retry(
+                        "save",
+                        lambda: graph.replace_vertex(vertex=data),
+                        idempotent=False,
+                    )
+            except aioarangodb.exceptions.DocumentRevisionError as ex:
+                raise RevisionConflictError(ex.error_message)
             except aioarangodb.exceptions.DocumentReplaceError as ex:
                 if ex.error_code == ERROR_ARANGO_UNIQUE_CONSTRAINT_VIOLATED:
                     raise UniqueConstraintError(ex.error_message)
@@ -117,6 +146,9 @@ class Graph(ABC):
 
         model.key_ = response["_key"]
         model.rev_ = response["_rev"]
+        model._mark_saved(data)
+        model._add_to_identity_map()
+        await model._remove_from_cache()
 
     @classmethod
     async def delete_vertex(cls, document: DocumentModel, ignore_missing=False) -> bool:
@@ -133,9 +165,15 @@ class Graph(ABC):
         """
         data = document.get_arangodb_data()
         try:
-            result: bool = await cls.get_graph().delete_vertex(
-                data, ignore_missing=ignore_missing
+            result: bool = await document._with_retry(
+                "delete",
+                lambda: cls.get_graph().delete_vertex(
+                    data, ignore_missing=ignore_missing
+                ),
+                idempotent=ignore_missing,
             )
+        except aioarangodb.exceptions.DocumentRevisionError as ex:
+            raise RevisionConflictError(ex.error_message)
         except aioarangodb.exceptions.DocumentDeleteError as ex:
             if ex.error_code == ERROR_ARANGO_DOCUMENT_NOT_FOUND:
                 raise ModelNotFoundError(
@@ -143,6 +181,9 @@ class Graph(ABC):
                     f"'{document.key_}'"
                 )
             raise
+        finally:
+            document._remove_from_identity_map()
+            await document._remove_from_cache()
 
         return result
 
@@ -160,15 +201,24 @@ class Graph(ABC):
         """
         data = edge.get_arangodb_data()
         try:
-            result: bool = await cls.get_graph().delete_edge(
-                data, ignore_missing=ignore_missing
+            result: bool = await edge._with_retry(
+                "delete",
+                lambda: cls.get_graph().delete_edge(
+                    data, ignore_missing=ignore_missing
+                ),
+                idempotent=ignore_missing,
             )
+        except aioarangodb.exceptions.DocumentRevisionError as ex:
+            raise RevisionConflictError(ex.error_message)
         except aioarangodb.exceptions.DocumentDeleteError as ex:
             if ex.error_code == ERROR_ARANGO_DOCUMENT_NOT_FOUND:
                 raise ModelNotFoundError(
                     f"No '{edge.__class__.__name__}' found with _key '{edge.key_}'"
                 )
             raise
+        finally:
+            edge._remove_from_identity_map()
+            await edge._remove_from_cache()
 
         return result
 
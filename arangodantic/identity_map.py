@@ -0,0 +1,109 @@
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Dict, Optional, Type
+
+try:
+    from contextlib import asynccontextmanager  # type: ignore
+except ImportError:
+    from arangodantic.asynccontextmanager import asynccontextmanager
+
+if TYPE_CHECKING:  # pragma: no cover
+    from arangodantic.models import Model
+
+_identity_map: ContextVar[Optional["IdentityMap"]] = ContextVar(
+    "arangodantic_identity_map", default=None
+)
+
+
+class IdentityMap:
+    """
+    Keeps track of the models loaded within a scope, so the same document is only
+    loaded once and is always represented by the same instance.
+    """
+
+    __slots__ = ["models"]
+
+    def __init__(self):
+        self.models: Dict[str, "Model"] = {}
+
+    def __len__(self):
+        return len(self.models)
+
+    def __contains__(self, id_: str) -> bool:
+        return id_ in self.models
+
+    def get(self, cls: Type["Model"], key: str) -> Optional["Model"]:
+        """
+        Get the model of the given class with the given "_key", if it is known.
+
+        :param cls: The model class.
+        :param key: The "_key" of the model.
+        :return: The model or None if the model is not known.
+        """
+        model = self.models.get(f"{cls.get_collection_name()}/{key}")
+        if model is None or not isinstance(model, cls):
+            return None
+        return model
+
+    def add(self, model: "Model") -> "Model":
+        """
+        Add a model, unless a model with the same "_id" is already known.
+
+        :param model: The model to add.
+        :return: The known model with the same "_id" if any, else the given model.
+        """
+        id_ = model.id_
+        if id_ is None:
+            return model
+        return self.models.setdefault(id_, model)
+
+    def remove(self, cls: Type["Model"], key: str) -> None:
+        """
+        Remove the model of the given class with the given "_key", if it is known.
+
+        :param cls: The model class.
+        :param key: The "_key" of the model.
+        """
+        self.models.pop(f"{cls.get_collection_name()}/{key}", None)
+
+    def remove_collection(self, cls: Type["Model"]) -> None:
+        """
+        Remove all models in the collection of the given model class.
+
+        :param cls: The model class.
+        """
+        prefix = f"{cls.get_collection_name()}/"
+        for id_ in [id_ for id_ in self.models if id_.startswith(prefix)]:
+            del self.models[id_]
+
+    def clear(self) -> None:
+        """
+        Remove all models.
+        """
+        self.models.clear()
+
+
+def get_identity_map() -> Optional[IdentityMap]:
+    """
+    Get the identity map of the current scope, if any.
+    """
+    return _identity_map.get()
+
+
+@asynccontextmanager
+async def use_identity_map():
+    """
+    Context manager for a scope (e.g. a request) within which each document is
+    represented by a single model instance. Within the scope "load", "load_many" and
+    "find" give back the same instance for the same "_id", and models already loaded
+    by their "_key" are returned without querying the database.
+
+    Example:
+        >>> async with use_identity_map():
+        ...     a = await Model.load("key")
+        ...     assert await Model.load("key") is a
+    """
+    token = _identity_map.set(IdentityMap())
+    try:
+        yield _identity_map.get()
+    finally:
+        _identity_map.reset(token)
@@ -0,0 +1,192 @@
+from typing import Any, ClassVar, Dict, List, Optional, Union
+
+import pydantic
+
+# Index types that ArangoDB reports as persistent indexes
+INDEX_TYPE_ALIASES = {"hash": "persistent", "skiplist": "persistent"}
+
+
+class Index(pydantic.BaseModel):
+    """
+    Base class for indexes declared in the "indexes" of the "ArangodanticConfig" of a
+    model, and created with "ensure_indexes".
+    """
+
+    index_type: ClassVar[str]
+
+    fields: List[str]
+    name: Optional[str] = None
+    in_background: bool = False
+
+    def get_definition(self) -> dict:
+        """
+        Get the definition of the index for the index API of ArangoDB.
+        """
+        definition: Dict[str, Any] = {"type": self.index_type, "fields": self.fields}
+        if self.name is not None:
+            definition["name"] = self.name
+        if self.in_background:
+            definition["inBackground"] = True
+        definition.update(self._get_options())
+        return definition
+
+    def matches(self, index: dict) -> bool:
+        """
+        Tell if an existing index, as returned by "collection.indexes()", is this
+        index. Indexes with the same name are considered the same index, as ArangoDB
+        does not allow creating another one.
+
+        :param index: The existing index.
+        """
+        if self.name is not None and index.get("name") == self.name:
+            return True
+
+        index_type = index.get("type", "")
+        if INDEX_TYPE_ALIASES.get(index_type, index_type) != INDEX_TYPE_ALIASES.get(
+            self.index_type, self.index_type
+        ):
+            return False
+        if _get_field_names(index.get("fields", [])) != _get_field_names(self.fields):
+            return False
+        return all(
+            index.get(name, default) == value
+            for name, (value, default) in self._get_match_attributes().items()
+        )
+
+    def _get_options(self) -> Dict[str, Any]:
+        """
+        Get the options specific to the type of the index, for the definition.
+        """
+        return {}
+
+    def _get_match_attributes(self) -> Dict[str, Any]:
+        """
+        Get the attributes of an existing index that must match, as returned by
+        "collection.indexes()", with the value and the default if it is not returned.
+        """
+        return {}
+
+
+class PersistentIndex(Index):
+    """
+    A persistent index, used for equality and range filters and sorting.
+
+    Example:
+        >>> PersistentIndex(fields=["name", "age"], stored_values=["email"])
+
+    :param unique: Only allow one document per combination of the values.
+    :param sparse: Leave out documents where any of the fields is null or missing.
+    :param stored_values: Additional fields stored in the index, so queries can
+    return them without reading the documents.
+    """
+
+    index_type: ClassVar[str] = "persistent"
+
+    unique: bool = False
+    sparse: bool = False
+    stored_values: Optional[List[str]] = None
+
+    def _get_options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"unique": self.unique, "sparse": self.sparse}
+        if self.stored_values:
+            options["storedValues"] = self.stored_values
+        return options
+
+    def _get_match_attributes(self) -> Dict[str, Any]:
+        return {"unique": (self.unique, False), "sparse": (self.sparse, False)}
+
+
+class HashIndex(PersistentIndex):
+    """
+    A hash index, which is an alias for a persistent index in recent versions of
+    ArangoDB.
+    """
+
+    index_type: ClassVar[str] = "hash"
+
+
+class TTLIndex(Index):
+    """
+    A time-to-live index, which removes documents after they expire.
+
+    :param expire_after: Number of seconds after the time in the field that the
+    documents are removed.
+    """
+
+    index_type: ClassVar[str] = "ttl"
+
+    expire_after: int
+
+    def _get_options(self) -> Dict[str, Any]:
+        return {"expireAfter": self.expire_after}
+
+    def _get_match_attributes(self) -> Dict[str, Any]:
+        return {"expiry_time": (self.expire_after, None)}
+
+
+class GeoIndex(Index):
+    """
+    A geo index, on one field with coordinates or GeoJSON, or two fields with the
+    latitude and longitude.
+
+    :param geo_json: The coordinates in the field are in GeoJSON order, longitude
+    first.
+    """
+
+    index_type: ClassVar[str] = "geo"
+
+    geo_json: bool = False
+
+    def _get_options(self) -> Dict[str, Any]:
+        return {"geoJson": self.geo_json}
+
+    def _get_match_attributes(self) -> Dict[str, Any]:
+        return {"geo_json": (self.geo_json, False)}
+
+
+class FulltextIndex(Index):
+    """
+    A fulltext index on one field.
+
+    :param min_length: Minimum length of the words that are indexed.
+    """
+
+    index_type: ClassVar[str] = "fulltext"
+
+    min_length: Optional[int] = None
+
+    def _get_options(self) -> Dict[str, Any]:
+        if self.min_length is None:
+            return {}
+        return {"minLength": self.min_length}
+
+
+class InvertedIndex(Index):
+    """
+    An inverted index, used for search with the SEARCH operation. Fields can be
+    given by name or as the field definitions of ArangoDB.
+
+    :param stored_values: Additional fields stored in the index, as the stored value
+    definitions of ArangoDB.
+    :param options: Any other properties of the index, e.g. "analyzer".
+    """
+
+    index_type: ClassVar[str] = "inverted"
+
+    fields: List[Union[str, Dict[str, Any]]]  # type: ignore
+    stored_values: Optional[List[Dict[str, Any]]] = None
+    options: Dict[str, Any] = {}
+
+    def _get_options(self) -> Dict[str, Any]:
+        options = dict(self.options)
+        if self.stored_values:
+            options["storedValues"] = self.stored_values
+        return options
+
+
+def _get_field_names(fields: List[Any]) -> List[str]:
+    """
+    Get the names of the fields of an index, that are given either as names or as
+    field definitions.
+    """
+    return [field["name"] if isinstance(field, dict) else field for field in fields]
@@ -1,33 +1,78 @@
+import asyncio
+import inspect
+import logging
 import textwrap
 from abc import ABC
 from functools import lru_cache
-from typing import Optional, Type, TypeVar, Union
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import aioarangodb.exceptions
 import pydantic
 from aioarangodb.collection import StandardCollection
 from aioarangodb.database import StandardDatabase
-from pydantic import Field
-
+from aioarangodb.request import Request
+from pydantic import Field, PrivateAttr
+
+from arangodantic.aggregation import (
+    GroupByTypes,
+    MetricsTypes,
+    build_aggregate,
+    get_row_model,
+    normalize_group_by,
+)
 from arangodantic.arangdb_error_codes import (
+    ERROR_ARANGO_CONFLICT,
     ERROR_ARANGO_DATA_SOURCE_NOT_FOUND,
     ERROR_ARANGO_DOCUMENT_NOT_FOUND,
     ERROR_ARANGO_UNIQUE_CONSTRAINT_VIOLATED,
 )
+from arangodantic.buffers import WriteBuffer
+from arangodantic.caches import ModelCache
 from arangodantic.configurations import CONF
-from arangodantic.cursor import ArangodanticCursor
+from arangodantic.cursor import ArangodanticCursor, build_model
+from arangodantic.directions import ASCENDING
 from arangodantic.exceptions import (
     ConfigError,
     DataSourceNotFound,
+    FullCollectionScanError,
     ModelNotFoundError,
     MultipleModelsFoundError,
+    RevisionConflictError,
     UniqueConstraintError,
 )
+from arangodantic.explain import QueryPlan, explain_query
+from arangodantic.identity_map import get_identity_map
+from arangodantic.indexes import Index
+from arangodantic.pagination import Page, decode_page_token, encode_page_token
+from arangodantic.retries import RetryPolicy
+from arangodantic.transactions import get_transaction
 from arangodantic.utils import (
+    FiltersShape,
     FilterTypes,
     SortTypes,
+    build_filter_values,
     build_filters,
+    build_keyset_filter,
     build_sort,
+    chunks,
+    get_field_value,
+    get_filters_shape,
+    get_placeholder_filters,
     remove_whitespace_lines,
 )
 
@@ -36,13 +81,193 @@ try:
 except ImportError:
     from arangodantic.asynccontextmanager import asynccontextmanager
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 TModel = TypeVar("TModel", bound="Model")
 
+# Write buffers of the models without a buffer in the "ArangodanticConfig"
+_write_buffers: Dict[Type["Model"], WriteBuffer] = {}
+
+# Maximum number of compiled "find" queries to cache
+QUERY_CACHE_SIZE = 256
+
+# Meta fields of ArangoDB documents
+META_FIELDS = {"_key", "_rev", "_id"}
+
+
+class _DistinctRow(pydantic.BaseModel):
+    value: Any
+
 
 class ArangodanticCollectionConfig(pydantic.BaseModel):
     collection_name: Optional[str] = Field(
         None, description="Override the name of the collection to use"
     )
+    partial_updates: bool = Field(
+        False,
+        description="Only send the fields that changed when saving existing documents",
+    )
+    cache: Any = Field(
+        None,
+        description=(
+            "Cache for documents loaded with 'load', overrides the cache set with "
+            "'configure'; set to False to not cache the documents of the model"
+        ),
+    )
+    retry_policy: Any = Field(
+        None,
+        description=(
+            "Policy for retrying writes, overrides the policy set with 'configure'; "
+            "set to False to not retry the writes of the model"
+        ),
+    )
+    indexes: List[Index] = Field(
+        [], description="Indexes of the collection, created with 'ensure_indexes'"
+    )
+    write_buffer: Any = Field(
+        None,
+        description=(
+            "Buffer for documents saved with 'buffered=True'; by default each model "
+            "has a buffer with the default options"
+        ),
+    )
+
+
+def _compile_find_query(
+    filters_shape: FiltersShape,
+    sort: Tuple[Tuple[str, str], ...],
+    has_limit: bool,
+    has_fields: bool,
+    resolve: Tuple[str, ...] = (),
+    keyset: bool = False,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Get the AQL query used by "find" for a query of the given shape, and the
+    bind_vars that do not depend on the values of the filters. The results are cached,
+    so queries of the same shape only need to fill in the values.
+
+    :param filters_shape: The shape of the filters, see "get_filters_shape".
+    :param sort: The sort specification.
+    :param has_limit: If the query uses a limit (and offset).
+    :param has_fields: If only some fields of the documents are returned.
+    :param resolve: The attributes (e.g. "_from") holding the "_id" of documents
+    that are returned in their place.
+    :param keyset: If the query continues after a position in the sort order, see
+    "build_keyset_filter".
+    :return: A tuple of the AQL query and a new dictionary of bind_vars.
+    """
+    query, bind_vars = _compile_find_query_cached(
+        filters_shape, sort, has_limit, has_fields, resolve, keyset
+    )
+    return query, dict(bind_vars)
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _compile_find_query_cached(
+    filters_shape: FiltersShape,
+    sort: Tuple[Tuple[str, str], ...],
+    has_limit: bool,
+    has_fields: bool,
+    resolve: Tuple[str, ...],
+    keyset: bool,
+) -> Tuple[str, Dict[str, Any]]:
+    # The name we use to refer to the items we're looping over in the AQL FOR loop
+    instance_name = "i"
+
+    # Compile the filters with placeholders for the values
+    filters = get_placeholder_filters(filters_shape)
+    filter_str, bind_vars = Model._build_filter_str(
+        filters, instance_name=instance_name
+    )
+
+    keyset_str = ""
+    if keyset:
+        keyset_filter, keyset_bind_vars = build_keyset_filter(
+            instance_name=instance_name, sort=sort
+        )
+        keyset_str = f"FILTER {keyset_filter}"
+        bind_vars.update(keyset_bind_vars)
+
+    limit_str = ""
+    if has_limit:
+        limit_str = "LIMIT @offset, @limit"
+
+    sort_str, sort_bind_vars = build_sort(sort=sort, instance_name=instance_name)
+    bind_vars.update(sort_bind_vars)
+
+    return_str = instance_name
+    if has_fields:
+        return_str = f"KEEP({instance_name}, @fields)"
+    if resolve:
+        # Join the documents, keeping the "_id" if the document does not exist
+        documents = ", ".join(
+            f'"{attribute}": DOCUMENT({instance_name}.{attribute}) '
+            f"|| {instance_name}.{attribute}"
+            for attribute in resolve
+        )
+        return_str = f"MERGE({return_str}, {{{documents}}})"
+
+    query = remove_whitespace_lines(
+        textwrap.dedent(
+            """
+            FOR {instance_name} IN @@collection
+                {filter_str}
+                {keyset_str}
+                {sort_str}
+                {limit_str}
+                RETURN {return_str}
+            """
+        ).format(
+            instance_name=instance_name,
+            filter_str=filter_str,
+            keyset_str=keyset_str,
+            limit_str=limit_str,
+            sort_str=sort_str,
+            return_str=return_str,
+        )
+    )
+    return query, bind_vars
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _compile_upsert_query(filters_shape: FiltersShape) -> Tuple[str, Dict[str, Any]]:
+    """
+    Get the AQL query used by "upsert_many" for filters of the given shape, and the
+    bind_vars for the fields of the filters. The query loops over rows with the values
+    of the filters, the document to insert and the fields to update.
+
+    Don't modify the returned bind_vars, they are cached.
+
+    :param filters_shape: The shape of the filters, see "get_filters_shape".
+    :return: A tuple of the AQL query and the bind_vars.
+    """
+    filter_list, bind_vars = build_filters(
+        get_placeholder_filters(filters_shape),
+        instance_name="i",
+        values_name="row.values",
+    )
+
+    # UPSERT only matches documents with equality of the attributes of an object, so
+    # the filters find the "_key" of the document to update first
+    query = textwrap.dedent(
+        """
+        FOR row IN @rows
+            LET existing = FIRST(
+                FOR i IN @@collection
+                    FILTER {filter_str}
+                    LIMIT 1
+                    RETURN i._key
+            )
+            UPSERT {{_key: existing}}
+            INSERT row.insert
+            UPDATE row.update
+            IN @@collection
+            OPTIONS {{keepNull: @keep_null, mergeObjects: @merge_objects}}
+            RETURN {{new: NEW, created: OLD == null}}
+        """
+    ).format(filter_str="\n                    AND ".join(filter_list))
+    return query.strip(), bind_vars
 
 
 class Model(pydantic.BaseModel, ABC):
@@ -56,6 +281,10 @@ class Model(pydantic.BaseModel, ABC):
     key_: Optional[str] = Field(alias="_key")
     rev_: Optional[str] = Field(alias="_rev")
 
+    # Snapshot of the data as last loaded from or saved to the database, used to
+    # detect changed fields when partial updates are enabled
+    _saved_data: Optional[dict] = PrivateAttr(None)
+
     @property
     def id_(self) -> Optional[str]:
         """
@@ -89,15 +318,163 @@ class Model(pydantic.BaseModel, ABC):
         """
         Get a model based on the ArangoDB "_key".
 
+        Within "use_identity_map" models that are already loaded are returned without
+        querying the database. When a cache is configured, the document is read from
+        the cache if possible, see "get_cache".
+
         :param key: The "_key" of the model to get.
         :return: The model.
         :raise ModelNotFoundError: Raised if no matching document is found.
         """
-        response = await cls.get_collection().get(document={"_key": key})
+        identity_map = get_identity_map()
+        if identity_map is not None:
+            known = identity_map.get(cls, key)
+            if known is not None:
+                return known  # type: ignore
+
+        model = await cls._load(key)
+        if identity_map is not None:
+            model = identity_map.add(model)  # type: ignore
+        return model
+
+    @classmethod
+    async def _load(cls: Type[TModel], key: str, use_cache: bool = True) -> TModel:
+        """
+        Get a model based on the ArangoDB "_key" from the cache or the database.
+
+        :param key: The "_key" of the model to get.
+        :param use_cache: Use a cached document if there is one, else always get the
+        document from the database (and update the cache).
+        :return: The model.
+        :raise ModelNotFoundError: Raised if no matching document is found.
+        """
+        # Documents read in a transaction might not be committed yet
+        cache = cls.get_cache() if get_transaction() is None else None
+        id_ = f"{cls.get_collection_name()}/{key}"
+
+        response = None
+        if cache is not None and use_cache:
+            response = await cache.get(id_)
+            if response is not None and cache.validate_rev:
+                current = await cls._check_rev(key, response["_rev"])
+                if not current:
+                    await cache.delete(id_)
+                    response = None
+                if current is None:
+                    raise ModelNotFoundError(
+                        f"No '{cls.__name__}' found with _key '{key}'"
+                    )
+
         if response is None:
-            raise ModelNotFoundError(f"No '{cls.__name__}' found with _key '{key}'")
+            response = await cls.get_collection().get(document={"_key": key})
+            if response is None:
+                raise ModelNotFoundError(f"No '{cls.__name__}' found with _key '{key}'")
+            if cache is not None:
+                await cache.set(id_, response)
+
+        model = cls(**response)
+        model._mark_saved()
+        return model
+
+    @classmethod
+    async def load_many(
+        cls: Type[TModel], keys: Iterable[str], *, missing: str = "raise"
+    ) -> List[Optional[TModel]]:
+        """
+        Get multiple models based on their ArangoDB "_key"s in a single query.
+
+        :param keys: The "_key"s of the models to get.
+        :param missing: How to handle keys that are not found; "raise" raises a
+        ModelNotFoundError, "skip" leaves them out of the result and "none" puts None in
+        their place.
+        :return: The models in the same order as the given keys.
+        :raise ModelNotFoundError: Raised if any of the documents is not found and
+        **missing** is set to "raise" (the default value).
+        """
+        if missing not in {"raise", "skip", "none"}:
+            raise ValueError(f"Invalid value '{missing}' for missing")
+
+        keys = list(keys)
+        if not keys:
+            return []
+
+        found: Dict[str, TModel] = {}
+        identity_map = get_identity_map()
+        if identity_map is not None:
+            for key in keys:
+                known = identity_map.get(cls, key)
+                if known is not None:
+                    found[key] = known  # type: ignore
+        query_keys = [key for key in keys if key not in found]
+        if query_keys:
+            found.update(await cls._load_many(query_keys))
+
+        missing_keys = [key for key in keys if key not in found]
+        if missing_keys and missing == "raise":
+            missing_str = ", ".join(f"'{key}'" for key in missing_keys)
+            raise ModelNotFoundError(
+                f"No '{cls.__name__}' found with _key {missing_str}"
+            )
+
+        if missing == "skip":
+            return [found[key] for key in keys if key in found]
+        return [found.get(key) for key in keys]
+
+    @classmethod
+    async def _load_many(cls: Type[TModel], keys: List[str]) -> Dict[str, TModel]:
+        """
+        Get the models with the given "_key"s from the database in a single query.
 
-        return cls(**response)
+        :param keys: The "_key"s of the models to get.
+        :return: The found models by their "_key".
+        """
+        query = remove_whitespace_lines(
+            textwrap.dedent(
+                """
+                FOR i IN @@collection
+                    FILTER i._key IN @keys
+                    RETURN i
+                """
+            )
+        )
+        bind_vars = {"@collection": cls.get_collection_name(), "keys": keys}
+
+        cursor = await cls.get_db().aql.execute(
+            query, bind_vars=bind_vars, batch_size=len(keys)
+        )
+        async with ArangodanticCursor(cls, cursor) as models:
+            return {model.key_: model async for model in models}
+
+    @classmethod
+    async def _check_rev(cls, key: str, rev: str) -> Optional[bool]:
+        """
+        Check if the document still has the given revision with a HEAD request, without
+        transferring the document.
+
+        :param key: The "_key" of the document.
+        :param rev: The expected "_rev" of the document.
+        :return: True if the document has the revision, False if the document has
+        changed and None if the document no longer exists.
+        """
+        collection = cls.get_collection()
+        request = Request(
+            method="head",
+            endpoint=f"/_api/document/{collection.name}/{key}",
+            headers={"If-None-Match": rev},
+            read=collection.name,
+        )
+
+        def response_handler(resp) -> Optional[bool]:
+            if resp.status_code == 304:
+                return True
+            if resp.status_code == 404:
+                return None
+            if resp.is_success:
+                return False
+            raise aioarangodb.exceptions.DocumentGetError(resp, request)
+
+        result: Optional[bool] = await collection._execute(request, response_handler)
+        return result
 
     async def reload(self) -> None:
         """
@@ -109,8 +486,9 @@ class Model(pydantic.BaseModel, ABC):
             raise ModelNotFoundError(
                 f"Can't reload '{self.__class__.__name__}' without a key"
             )
-        new = await self.load(self.key_)
+        new = await self._load(self.key_, use_cache=False)
         self.__dict__.update(new.__dict__)
+        self._saved_data = new._saved_data
 
     @classmethod
     @asynccontextmanager
@@ -132,14 +510,112 @@ class Model(pydantic.BaseModel, ABC):
             await self.reload()
             yield
 
-    async def save(self, **kwargs) -> None:
+    @classmethod
+    async def update_with_retry(
+        cls: Type[TModel],
+        key: str,
+        fn: Callable[[TModel], Union[None, Awaitable[None]]],
+        max_attempts: int = 5,
+        **kwargs,
+    ) -> TModel:
+        """
+        Load a model, change it with a function and save it, checking that no one else
+        changed the document in between. On a conflict the model is reloaded and the
+        function applied again, so concurrent updates are safe without a lock.
+
+        Example:
+            >>> def increment(counter):
+            ...     counter.value += 1
+            >>> await Counter.update_with_retry("visits", increment)
+
+        :param key: The "_key" of the document.
+        :param fn: Function, sync or async, that changes the model in place. It may be
+        called several times, so it should not have other side effects.
+        :param max_attempts: Maximum number of times to try saving the model.
+        :param kwargs: Passed on to "save".
+        :return: The saved model.
+        :raise RevisionConflictError: Raised if the document still had a conflicting
+        change on the last attempt.
+        :raise ModelNotFoundError: Raised if the document is not found.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be a positive integer")
+
+        model = await cls.load(key)
+        attempt = 1
+        while True:
+            result = fn(model)
+            if inspect.isawaitable(result):
+                await result
+            try:
+                await model.save(check_rev=True, **kwargs)
+                return model
+            except RevisionConflictError:
+                if attempt >= max_attempts:
+                    raise
+            attempt += 1
+            await model.reload()
+
+    async def save(
+        self,
+        *,
+        keep_null: bool = True,
+        merge_objects: bool = False,
+        check_rev: bool = True,
+        buffered: bool = False,
+        **kwargs,
+    ) -> Optional["asyncio.Future[Dict[str, str]]"]:
         """
         Save the document; either creates a new one or updates/replaces an existing
         document.
 
+        With **buffered**, a new document is added to the write buffer of the model
+        and inserted in the background together with other documents, see
+        "WriteBuffer". This waits only while the buffer is full.
+
+        When partial updates are enabled in the "ArangodanticConfig" of the model, only
+        the fields that changed since the model was loaded or saved are sent to
+        ArangoDB for existing documents, and nothing is sent if no field changed.
+
+        :param keep_null: Store fields set to None as null in partial updates, instead
+        of removing them from the document.
+        :param merge_objects: Merge objects with the existing objects in partial
+        updates, instead of replacing them.
+        :param check_rev: Only update an existing document if it still has the
+        revision of the model, i.e. no one else changed it since the model was loaded
+        or saved. Set to False to overwrite the document regardless.
+        :param buffered: Insert the new document later through the write buffer.
+        :return: With **buffered**, a future with the "_key", "_id" and "_rev" of the
+        document once it is inserted, else None.
         :raise UniqueConstraintViolated: Raised when there is a unique constraint
         violation.
+        :raise RevisionConflictError: Raised when **check_rev** is set and the document
+        has another revision, or on a write-write conflict that was not resolved by
+        retrying.
         """
+        transaction = get_transaction()
+        if buffered:
+            if self.rev_:
+                raise ValueError("Only new documents can be saved buffered")
+            if transaction is not None:
+                raise ValueError("Documents can not be saved buffered in a transaction")
+            if not self.key_ and CONF.key_gen:
+                self.key_ = str(CONF.key_gen())
+            return await self.get_write_buffer().put(self, **kwargs)
+
+        if transaction is not None and transaction.unit_of_work:
+            # Save with the other models when the transaction is committed, but with
+            # the key already known so it can be referred to
+            if not self.rev_ and not self.key_ and CONF.key_gen:
+                self.key_ = str(CONF.key_gen())
+            transaction.add_save(
+                self,
+                keep_null=keep_null,
+                merge_objects=merge_objects,
+                check_rev=check_rev,
+                **kwargs,
+            )
+            return None
 
         if not self.rev_:
             # Insert new document
@@ -155,50 +631,842 @@ class Model(pydantic.BaseModel, ABC):
                 del data["_key"]
 
             try:
-                response = await self.get_collection().insert(document=data)
+                response = await self._with_retry(
+                    "save",
+                    lambda: self.get_collection().insert(document=data),
+                    idempotent=False,
+                )
             except aioarangodb.exceptions.DocumentInsertError as ex:
                 if ex.error_code == ERROR_ARANGO_UNIQUE_CONSTRAINT_VIOLATED:
                     raise UniqueConstraintError(ex.error_message)
                 raise
+        elif self.uses_partial_updates() and self._saved_data is not None:
+            # Update the changed fields of an existing document
+            await self.before_save(new=False, **kwargs)
+            data = self.get_arangodb_data()
+            changed = self._get_changed_data(data)
+            if not changed:
+                return None
+
+            try:
+                response = await self._with_retry(
+                    "save",
+                    lambda: self.get_collection().update(
+                        document=changed,
+                        check_rev=check_rev,
+                        keep_none=keep_null,
+                        merge=merge_objects,
+                    ),
+                    # Once applied, the revision check of a retry would fail
+                    idempotent=not check_rev,
+                )
+            except aioarangodb.exceptions.DocumentRevisionError as ex:
+                raise RevisionConflictError(ex.error_message)
+            except aioarangodb.exceptions.DocumentUpdateError as ex:
+                if ex.error_code == ERROR_ARANGO_UNIQUE_CONSTRAINT_VIOLATED:
+                    raise UniqueConstraintError(ex.error_message)
+                elif ex.error_code == ERROR_ARANGO_CONFLICT:
+                    raise RevisionConflictError(ex.error_message)
+                raise
         else:
             # Update existing document
             await self.before_save(new=False, **kwargs)
             data = self.get_arangodb_data()
             try:
-                response = await self.get_collection().replace(document=data)
+                response = await self._with_retry(
+                    "save",
+                    lambda: self.get_collection().replace(
+                        document=data, check_rev=check_rev
+                    ),
+                    idempotent=not check_rev,
+                )
+            except aioarangodb.exceptions.DocumentRevisionError as ex:
+                raise RevisionConflictError(ex.error_message)
             except aioarangodb.exceptions.DocumentReplaceError as ex:
                 if ex.error_code == ERROR_ARANGO_UNIQUE_CONSTRAINT_VIOLATED:
                     raise UniqueConstraintError(ex.error_message)
+                elif ex.error_code == ERROR_ARANGO_CONFLICT:
+                    raise RevisionConflictError(ex.error_message)
                 raise
 
         self.key_ = response["_key"]
         self.rev_ = response["_rev"]
+        self._mark_saved(data)
+        self._add_to_identity_map()
+        await self._remove_from_cache()
+        return None
 
-    async def delete(self, ignore_missing=False) -> bool:
+    @classmethod
+    async def save_many(
+        cls: Type[TModel],
+        models: Iterable[TModel],
+        *,
+        batch_size: int = 1000,
+        keep_null: bool = True,
+        merge_objects: bool = False,
+        check_rev: bool = True,
+        **kwargs,
+    ) -> List[Optional[Exception]]:
+        """
+        Save multiple documents using the multi-document endpoints of ArangoDB; new
+        documents are inserted and existing documents are replaced, in batches of at
+        most **batch_size** documents per request.
+
+        A failure for a single document does not fail the whole batch, instead the
+        error is returned in the position of the failed model. With partial updates
+        enabled, existing documents are updated in the same way as by "save".
+
+        :param models: The models to save.
+        :param batch_size: Maximum number of documents to send in one request.
+        :param keep_null: Store fields set to None as null in partial updates.
+        :param merge_objects: Merge objects with the existing objects in partial
+        updates.
+        :param check_rev: Only update existing documents that still have the revision
+        of the model, see "save".
+        :param kwargs: Passed on to "before_save" of each model.
+        :return: A list with one item per model; None if the model was saved
+        successfully, else the error, e.g. an UniqueConstraintError.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+
+        models = list(models)
+        errors: List[Optional[Exception]] = [None] * len(models)
+
+        partial_updates = cls.uses_partial_updates()
+        new_models = []
+        new_data = []
+        existing_models = []
+        existing_data = []
+        updated_models = []
+        updated_data = []
+        for i, model in enumerate(models):
+            if not model.rev_:
+                if not model.key_ and CONF.key_gen:
+                    # Use generator to generate new key
+                    model.key_ = str(CONF.key_gen())
+
+                await model.before_save(new=True, **kwargs)
+
+                data = model.get_arangodb_data()
+                if not model.key_:
+                    # Let ArangoDB handle key generation
+                    del data["_key"]
+                    del data["_id"]
+                new_models.append((i, model, data))
+                new_data.append(data)
+            else:
+                await model.before_save(new=False, **kwargs)
+                data = model.get_arangodb_data()
+                if partial_updates and model._saved_data is not None:
+                    changed = model._get_changed_data(data)
+                    if not changed:
+                        continue
+                    updated_models.append((i, model, data))
+                    updated_data.append(changed)
+                else:
+                    existing_models.append((i, model, data))
+                    existing_data.append(data)
+
+        collection = cls.get_collection()
+        for batch_models, batch_data in zip(
+            chunks(new_models, batch_size), chunks(new_data, batch_size)
+        ):
+            results = await cls._with_bulk_retry(
+                "save_many",
+                lambda documents: collection.insert_many(documents=documents),
+                batch_data,
+                idempotent=False,
+            )
+            cls._apply_bulk_results(batch_models, results, errors)
+
+        for batch_models, batch_data in zip(
+            chunks(existing_models, batch_size), chunks(existing_data, batch_size)
+        ):
+            results = await cls._with_bulk_retry(
+                "save_many",
+                lambda documents: collection.replace_many(
+                    documents=documents, check_rev=check_rev
+                ),
+                batch_data,
+                check_rev=check_rev,
+                idempotent=not check_rev,
+            )
+            cls._apply_bulk_results(batch_models, results, errors)
+
+        for batch_models, batch_data in zip(
+            chunks(updated_models, batch_size), chunks(updated_data, batch_size)
+        ):
+            results = await cls._with_bulk_retry(
+                "save_many",
+                lambda documents: collection.update_many(
+                    documents=documents,
+                    check_rev=check_rev,
+                    merge=merge_objects,
+                    keep_none=keep_null,
+                ),
+                batch_data,
+                check_rev=check_rev,
+                idempotent=not check_rev,
+            )
+            cls._apply_bulk_results(batch_models, results, errors)
+
+        for model in models:
+            await model._remove_from_cache()
+
+        return errors
+
+    @staticmethod
+    def _apply_bulk_results(
+        models: Sequence[Tuple[int, "Model", dict]],
+        results: list,
+        errors: List[Optional[Exception]],
+    ) -> None:
+        """
+        Write back "_key" and "_rev" from the results of a multi-document request to
+        the models and store any errors in the position of the related model.
+
+        :param models: List of tuples with the original position, the model and the
+        data of the model.
+        :param results: The per-document results from aioarangodb.
+        :param errors: The list of errors to update.
+        """
+        for (i, model, data), result in zip(models, results):
+            if isinstance(result, aioarangodb.exceptions.ArangoServerError):
+                if result.error_code == ERROR_ARANGO_UNIQUE_CONSTRAINT_VIOLATED:
+                    errors[i] = UniqueConstraintError(result.error_message)
+                elif result.error_code == ERROR_ARANGO_CONFLICT:
+                    errors[i] = RevisionConflictError(result.error_message)
+                else:
+                    errors[i] = result
+            else:
+                model.key_ = result["_key"]
+                model.rev_ = result["_rev"]
+                model._mark_saved(data)
+                model._add_to_identity_map()
+
+    @classmethod
+    async def upsert_one(
+        cls: Type[TModel],
+        filters: FilterTypes,
+        *,
+        insert: TModel,
+        update: Union[Iterable[str], Dict[str, Any], None] = None,
+        keep_null: bool = True,
+        merge_objects: bool = False,
+        **kwargs,
+    ) -> bool:
+        """
+        Insert a document, or update the document matching the filters if there is
+        one, with a single query instead of finding and saving the document. The
+        "_key", "_rev" and the fields of the resulting document are written back to
+        the model given as **insert**.
+
+        Example:
+            >>> await Person.upsert_one(
+            ...     {"email": person.email}, insert=person, update=["name"]
+            ... )
+            True
+
+        As with the UPSERT of ArangoDB, concurrent upserts can both insert a document;
+        use a unique index on the fields of the filters to prevent duplicates.
+
+        :param filters: Filters in same way as accepted by "find", to find the
+        document to update.
+        :param insert: The model to insert if no document matches. "before_save" is
+        called for it with new=True.
+        :param update: The fields to update if a document matches; either names of
+        fields to take the values from the model, or a dictionary of fields and
+        values. By default all fields of the model are updated.
+        :param keep_null: Store fields set to None as null when updating, instead of
+        removing them from the document.
+        :param merge_objects: Merge objects with the existing objects when updating,
+        instead of replacing them.
+        :param kwargs: Passed on to "before_save".
+        :return: True if the document was inserted, False if it was updated.
+        :raise UniqueConstraintError: Raised when there is a unique constraint
+        violation.
+        """
+        (created,) = await cls.upsert_many(
+            [(filters, insert)],
+            update=update,
+            keep_null=keep_null,
+            merge_objects=merge_objects,
+            **kwargs,
+        )
+        return created
+
+    @classmethod
+    async def upsert_many(
+        cls: Type[TModel],
+        items: Iterable[Tuple[FilterTypes, TModel]],
+        *,
+        update: Union[Iterable[str], Dict[str, Any], None] = None,
+        keep_null: bool = True,
+        merge_objects: bool = False,
+        batch_size: int = 1000,
+        **kwargs,
+    ) -> List[bool]:
+        """
+        Upsert multiple documents in the same way as "upsert_one", with one query per
+        batch of at most **batch_size** documents whose filters have the same shape.
+
+        Documents are matched against the documents as they were before the query, so
+        models in the same batch should not match the same document.
+
+        :param items: Tuples of the filters and the model to insert.
+        :param update: The fields to update, in the same way as for "upsert_one".
+        :param keep_null: Store fields set to None as null when updating.
+        :param merge_objects: Merge objects with the existing objects when updating.
+        :param batch_size: Maximum number of documents to upsert in one query.
+        :param kwargs: Passed on to "before_save" of each model.
+        :return: A list with one item per model; True if the document was inserted,
+        False if it was updated.
+        :raise UniqueConstraintError: Raised when there is a unique constraint
+        violation, the documents of the batch are then not saved.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+
+        items = list(items)
+        created: List[bool] = [False] * len(items)
+
+        # Rows with the values of the filters and the data, grouped by the shape of
+        # the filters which determines the query
+        shapes: Dict[FiltersShape, List[Tuple[int, TModel, dict]]] = {}
+        for i, (filters, model) in enumerate(items):
+            if not filters:
+                raise ValueError("Upserting requires filters to match documents")
+            if not model.key_ and CONF.key_gen:
+                # Use generator to generate new key
+                model.key_ = str(CONF.key_gen())
+
+            await model.before_save(new=True, **kwargs)
+
+            data = model.get_arangodb_data()
+            del data["_id"]
+            del data["_rev"]
+            if not model.key_:
+                # Let ArangoDB handle key generation
+                del data["_key"]
+
+            row = {
+                "values": build_filter_values(filters),
+                "insert": data,
+                "update": cls._get_upsert_update(data, update),
+            }
+            shapes.setdefault(get_filters_shape(filters), []).append((i, model, row))
+
+        db = cls.get_db()
+        for filters_shape, rows in shapes.items():
+            query, field_bind_vars = _compile_upsert_query(filters_shape)
+            for batch in chunks(rows, batch_size):
+                bind_vars = dict(field_bind_vars)
+                bind_vars.update(
+                    {
+                        "@collection": cls.get_collection_name(),
+                        "rows": [row for _, _, row in batch],
+                        "keep_null": keep_null,
+                        "merge_objects": merge_objects,
+                    }
+                )
+                try:
+                    cursor = await cls._with_retry(
+                        "upsert_many",
+                        lambda: db.aql.execute(query, bind_vars=bind_vars),
+                    )
+                except aioarangodb.exceptions.AQLQueryExecuteError as ex:
+                    if ex.error_code == ERROR_ARANGO_UNIQUE_CONSTRAINT_VIOLATED:
+                        raise UniqueConstraintError(ex.error_message)
+                    raise
+
+                async with ArangodanticCursor(cls, cursor, raw=True) as results:
+                    results_list = [result async for result in results]
+                for (i, model, _), result in zip(batch, results_list):
+                    cls._apply_upsert_result(model, result["new"])
+                    created[i] = result["created"]
+                    await model._remove_from_cache()
+
+        return created
+
+    @classmethod
+    def _get_upsert_update(
+        cls, data: dict, update: Union[Iterable[str], Dict[str, Any], None]
+    ) -> dict:
+        """
+        Get the fields to update for "upsert_many".
+
+        :param data: The data of the model to insert.
+        :param update: The fields to update, see "upsert_one".
+        """
+        if update is None:
+            return {field: value for field, value in data.items() if field != "_key"}
+        if isinstance(update, dict):
+            return {cls.__fields__[name].alias: value for name, value in update.items()}
+        fields = {cls.__fields__[name].alias for name in update}
+        return {field: value for field, value in data.items() if field in fields}
+
+    @classmethod
+    def _apply_upsert_result(cls, model: "Model", document: dict) -> None:
+        """
+        Write back the resulting document of an upsert to the model.
+
+        :param model: The model that was upserted.
+        :param document: The document as returned by ArangoDB.
+        """
+        new = cls.parse_obj(document)
+        model.__dict__.update(new.__dict__)
+        model._mark_saved(new.get_arangodb_data())
+        model._add_to_identity_map()
+
+    async def delete(self, ignore_missing=False, check_rev: bool = True) -> bool:
         """
         Delete the document.
 
         :param ignore_missing: Do not raise an exception on missing document.
+        :param check_rev: Only delete the document if it still has the revision of the
+        model. Set to False to delete the document regardless.
         :return: Returns False if document was not found and ignore_missing was set to
         True, else always returns True.
         :raise ModelNotFoundError: Raised if the document is not found in the database
         and ignore_missing is set to False (the default value).
+        :raise RevisionConflictError: Raised when **check_rev** is set and the document
+        has another revision.
         """
+        transaction = get_transaction()
+        if transaction is not None and transaction.unit_of_work:
+            # Delete with the other models when the transaction is committed
+            transaction.add_delete(
+                self, ignore_missing=ignore_missing, check_rev=check_rev
+            )
+            return True
 
-        data = self.get_arangodb_data()
+        # Only the key and revision are needed to identify the document
+        data = {"_key": self.key_, "_rev": self.rev_}
         try:
-            result: bool = await self.get_collection().delete(
-                document=data, silent=True, ignore_missing=ignore_missing
+            result: bool = await self._with_retry(
+                "delete",
+                lambda: self.get_collection().delete(
+                    document=data,
+                    check_rev=check_rev,
+                    silent=True,
+                    ignore_missing=ignore_missing,
+                ),
+                # Once applied, a retry would not find the document
+                idempotent=ignore_missing,
             )
+        except aioarangodb.exceptions.DocumentRevisionError as ex:
+            raise RevisionConflictError(ex.error_message)
         except aioarangodb.exceptions.DocumentDeleteError as ex:
             if ex.error_code == ERROR_ARANGO_DOCUMENT_NOT_FOUND:
                 raise ModelNotFoundError(
                     f"No '{self.__class__.__name__}' found with _key '{self.key_}'"
                 )
+            elif ex.error_code == ERROR_ARANGO_CONFLICT:
+                raise RevisionConflictError(ex.error_message)
             raise
+        finally:
+            self._remove_from_identity_map()
+            await self._remove_from_cache()
 
         return result
 
+    @classmethod
+    async def delete_many(
+        cls,
+        models_or_keys: Iterable[Union["Model", str]],
+        *,
+        batch_size: int = 1000,
+        ignore_missing: bool = False,
+        check_rev: bool = True,
+    ) -> List[Optional[Exception]]:
+        """
+        Delete multiple documents using the multi-document endpoint of ArangoDB, in
+        batches of at most **batch_size** documents per request.
+
+        A failure for a single document does not fail the whole batch, instead the
+        error is returned in the position of the failed model or key.
+
+        :param models_or_keys: The models or "_key"s of the documents to delete.
+        :param batch_size: Maximum number of documents to send in one request.
+        :param ignore_missing: Do not report missing documents as errors.
+        :param check_rev: Only delete documents that still have the revision of the
+        model.
+        :return: A list with one item per model or key; None if the document was
+        deleted successfully (or was missing and **ignore_missing** was set to True),
+        else the error, e.g. a ModelNotFoundError.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+
+        documents: List[Union[dict, str]] = []
+        for model_or_key in models_or_keys:
+            if isinstance(model_or_key, Model):
+                documents.append({"_key": model_or_key.key_, "_rev": model_or_key.rev_})
+            else:
+                documents.append(model_or_key)
+
+        identity_map = get_identity_map()
+        if identity_map is not None:
+            for document in documents:
+                key = document if isinstance(document, str) else document["_key"]
+                identity_map.remove(cls, key)
+
+        for document in documents:
+            key = document if isinstance(document, str) else document["_key"]
+            await cls._remove_key_from_cache(key)
+
+        errors: List[Optional[Exception]] = []
+        collection = cls.get_collection()
+        for batch in chunks(documents, batch_size):
+            results = await cls._with_bulk_retry(
+                "delete_many",
+                lambda documents: collection.delete_many(
+                    documents=documents, check_rev=check_rev
+                ),
+                batch,
+                check_rev=check_rev,
+                # Once applied, a retry would not find the documents
+                idempotent=ignore_missing,
+            )
+            for document, result in zip(batch, results):
+                if not isinstance(result, aioarangodb.exceptions.ArangoServerError):
+                    errors.append(None)
+                elif result.error_code == ERROR_ARANGO_DOCUMENT_NOT_FOUND:
+                    if ignore_missing:
+                        errors.append(None)
+                    else:
+                        key = (
+                            document if isinstance(document, str) else document["_key"]
+                        )
+                        errors.append(
+                            ModelNotFoundError(
+                                f"No '{cls.__name__}' found with _key '{key}'"
+                            )
+                        )
+                elif result.error_code == ERROR_ARANGO_CONFLICT:
+                    errors.append(RevisionConflictError(result.error_message))
+                else:
+                    errors.append(result)
+
+        return errors
+
+    @classmethod
+    async def delete_where(cls, filters: FilterTypes = None) -> int:
+        """
+        Delete all documents matching the optional filters in a single query, without
+        transferring the documents to the client. Without filters all documents are
+        deleted.
+
+        :param filters: Filters in same way as accepted by "find".
+        :return: The number of deleted documents.
+        """
+        instance_name = "i"
+        filter_str, bind_vars = cls._build_filter_str(
+            filters, instance_name=instance_name
+        )
+
+        query = remove_whitespace_lines(
+            textwrap.dedent(
+                """
+                FOR {instance_name} IN @@collection
+                    {filter_str}
+                    REMOVE {instance_name} IN @@collection
+                """
+            ).format(instance_name=instance_name, filter_str=filter_str)
+        )
+        bind_vars["@collection"] = cls.get_collection_name()
+
+        identity_map = get_identity_map()
+        if identity_map is not None:
+            identity_map.remove_collection(cls)
+
+        cache = cls.get_cache()
+        if cache is not None:
+            await cache.clear_collection(cls.get_collection_name())
+
+        cursor = await cls._with_retry(
+            "delete_where",
+            lambda: cls.get_db().aql.execute(query, bind_vars=bind_vars),
+        )
+        removed: int = cursor.statistics()["modified"]
+        return removed
+
+    @classmethod
+    async def count_documents(cls, filters: FilterTypes = None) -> int:
+        """
+        Count the documents matching the optional filters, without transferring the
+        documents. Without filters the count of the collection is used.
+
+        :param filters: Filters in same way as accepted by "find".
+        :return: The number of matching documents.
+        """
+        if not filters:
+            count: int = await cls.get_collection().count()
+            return count
+
+        instance_name = "i"
+        filter_str, bind_vars = cls._build_filter_str(
+            filters, instance_name=instance_name
+        )
+
+        query = remove_whitespace_lines(
+            textwrap.dedent(
+                """
+                FOR {instance_name} IN @@collection
+                    {filter_str}
+                    COLLECT WITH COUNT INTO length
+                    RETURN length
+                """
+            ).format(instance_name=instance_name, filter_str=filter_str)
+        )
+        bind_vars["@collection"] = cls.get_collection_name()
+
+        # The single result is always in the first batch
+        cursor = await cls.get_db().aql.execute(query, bind_vars=bind_vars)
+        count = cursor.pop()
+        return count
+
+    @classmethod
+    async def exists_where(cls, filters: FilterTypes = None) -> bool:
+        """
+        Tell if any document matches the optional filters, without transferring the
+        document.
+
+        :param filters: Filters in same way as accepted by "find".
+        :return: True if at least one document matches, else False.
+        """
+        instance_name = "i"
+        filter_str, bind_vars = cls._build_filter_str(
+            filters, instance_name=instance_name
+        )
+
+        query = remove_whitespace_lines(
+            textwrap.dedent(
+                """
+                FOR {instance_name} IN @@collection
+                    {filter_str}
+                    LIMIT 1
+                    RETURN true
+                """
+            ).format(instance_name=instance_name, filter_str=filter_str)
+        )
+        bind_vars["@collection"] = cls.get_collection_name()
+
+        cursor = await cls.get_db().aql.execute(query, bind_vars=bind_vars)
+        return not cursor.empty()
+
+    @classmethod
+    async def aggregate_documents(
+        cls,
+        filters: FilterTypes = None,
+        *,
+        group_by: GroupByTypes = None,
+        metrics: MetricsTypes = None,
+        sort: SortTypes = None,
+        limit: Optional[int] = None,
+        row_model: Optional[Type[pydantic.BaseModel]] = None,
+    ) -> List[pydantic.BaseModel]:
+        """
+        Group the documents matching the optional filters and calculate aggregates
+        for each group on the server, using COLLECT ... AGGREGATE in AQL. Only the
+        aggregated rows are transferred.
+
+        Example:
+            >>> await Order.aggregate_documents(
+            ...     {"status": "paid"},
+            ...     group_by=["customer"],
+            ...     metrics={"total": ("SUM", "amount"), "orders": ("COUNT", None)},
+            ...     sort=[("total", DESCENDING)],
+            ... )
+            [OrderAggregate(customer='acme', total=120.0, orders=3), ...]
+
+        :param filters: Filters in same way as accepted by "find".
+        :param group_by: The fields to group by; either a list of fields, named after
+        the fields with dots replaced by underscores, or a dictionary of names and
+        fields. Without fields all matching documents are aggregated to one row.
+        :param metrics: Dictionary of names and tuples of the aggregate function (e.g.
+        "SUM", "AVERAGE", "MIN", "MAX", "COUNT", "COUNT_DISTINCT" or "UNIQUE") and the
+        field to aggregate, the field can be None for "COUNT".
+        :param sort: How to sort the rows, by the names of the groups and metrics.
+        :param limit: Limit the number of rows.
+        :param row_model: Model to build the rows as, by default a model with types
+        based on the aggregated fields is used.
+        :return: The rows as models.
+        """
+        group_by_items = normalize_group_by(group_by)
+        metrics_items = tuple(
+            (name, function, field)
+            for name, (function, field) in (metrics or {}).items()
+        )
+
+        instance_name = "i"
+        filter_str, bind_vars = cls._build_filter_str(
+            filters, instance_name=instance_name
+        )
+        collect_str, sort_str, return_str, aggregate_bind_vars = build_aggregate(
+            instance_name=instance_name,
+            group_by=group_by_items,
+            metrics=metrics_items,
+            sort=sort,
+        )
+        bind_vars.update(aggregate_bind_vars)
+
+        limit_str = ""
+        if limit is not None:
+            limit_str = "LIMIT @limit"
+            bind_vars["limit"] = int(limit)
+
+        query = remove_whitespace_lines(
+            textwrap.dedent(
+                """
+                FOR {instance_name} IN @@collection
+                    {filter_str}
+                    {collect_str}
+                    {sort_str}
+                    {limit_str}
+                    {return_str}
+                """
+            ).format(
+                instance_name=instance_name,
+                filter_str=filter_str,
+                collect_str=collect_str,
+                sort_str=sort_str,
+                limit_str=limit_str,
+                return_str=return_str,
+            )
+        )
+        bind_vars["@collection"] = cls.get_collection_name()
+
+        if row_model is None:
+            row_model = get_row_model(cls, group_by_items, metrics_items)
+
+        cursor = await cls.get_db().aql.execute(query, bind_vars=bind_vars)
+        async with ArangodanticCursor(cls, cursor, raw=True) as rows:
+            return [row_model(**row) async for row in rows]
+
+    @classmethod
+    async def distinct(cls, field: str, filters: FilterTypes = None) -> List[Any]:
+        """
+        Get the distinct values of a field of the documents matching the optional
+        filters, in ascending order.
+
+        :param field: The field, with dots separating nested fields.
+        :param filters: Filters in same way as accepted by "find".
+        :return: The values.
+        """
+        rows = await cls.aggregate_documents(
+            filters, group_by={"value": field}, row_model=_DistinctRow
+        )
+        return [row.value for row in rows]  # type: ignore
+
+    @classmethod
+    def _construct(cls: Type[TModel], data: dict) -> TModel:
+        """
+        Build a model from trusted data from the database without validation. Any
+        fields missing from the data are left unset.
+
+        :param data: The document as returned by ArangoDB.
+        """
+        values = {
+            name: data[field.alias]
+            for name, field in cls.__fields__.items()
+            if field.alias in data
+        }
+        return cls.construct(**values)
+
+    def _mark_saved(self, data: Optional[dict] = None) -> None:
+        """
+        Store a snapshot of the data as it is in the database, used to find the
+        changed fields for partial updates. Does nothing unless partial updates are
+        enabled for the model.
+
+        :param data: The data that was saved, by default the current data is used.
+        """
+        if not self.uses_partial_updates():
+            return
+        if data is None:
+            # All fields are included, also those missing from the loaded document
+            # that got their default, so changing them in place is noticed; fields
+            # that were not loaded are still only sent if they are changed
+            data = self.get_arangodb_data()
+        self._saved_data = data
+
+    def _add_to_identity_map(self) -> None:
+        """
+        Add the model to the identity map of the current scope, if any.
+        """
+        identity_map = get_identity_map()
+        if identity_map is not None:
+            identity_map.add(self)
+
+    def _remove_from_identity_map(self) -> None:
+        """
+        Remove the model from the identity map of the current scope, if any.
+        """
+        identity_map = get_identity_map()
+        if identity_map is not None and self.key_:
+            identity_map.remove(self.__class__, self.key_)
+
+    async def _remove_from_cache(self) -> None:
+        """
+        Remove the document from the cache, if any.
+        """
+        await self._remove_key_from_cache(self.key_)
+
+    @classmethod
+    async def _remove_key_from_cache(cls, key: Optional[str]) -> None:
+        """
+        Remove a document from the cache, if any, after it was written. Within a
+        transaction it is removed again when the transaction ends.
+
+        :param key: The "_key" of the document.
+        """
+        if key is None:
+            return
+        transaction = get_transaction()
+        if transaction is not None:
+            transaction.add_written(cls, key)
+        cache = cls.get_cache()
+        if cache is not None:
+            await cache.delete(f"{cls.get_collection_name()}/{key}")
+
+    def _get_changed_data(self, data: dict) -> dict:
+        """
+        Get the fields of the data that changed since the model was loaded or saved,
+        along with the "_key" and "_rev" needed to update the document.
+
+        :param data: The current data, as given by "get_arangodb_data".
+        :return: The changed data, or an empty dictionary if nothing changed.
+        """
+        saved_data = self._saved_data or {}
+        # Fields that are not in the snapshot are only sent if they have been set, to
+        # not overwrite fields that were left out when loading the model
+        fields_set = {self.__fields__[name].alias for name in self.__fields_set__}
+        changed = {
+            field: value
+            for field, value in data.items()
+            if field not in META_FIELDS
+            and (
+                saved_data[field] != value
+                if field in saved_data
+                else field in fields_set
+            )
+        }
+        if not changed:
+            return {}
+        changed["_key"] = self.key_
+        changed["_rev"] = self.rev_
+        return changed
+
+    def get_changed_fields(self) -> Set[str]:
+        """
+        Get the names (aliases) of the fields that changed since the model was loaded
+        or saved. Only tracked when partial updates are enabled for the model.
+        """
+        changed = self._get_changed_data(self.get_arangodb_data())
+        return set(changed) - META_FIELDS
+
     def get_arangodb_data(self) -> dict:
         """
         Get a dictionary of the data to pass on to ArangoDB when inserting, updating and
@@ -210,20 +1478,134 @@ class Model(pydantic.BaseModel, ABC):
 
     @classmethod
     def get_db(cls) -> StandardDatabase:
+        transaction = get_transaction()
+        if transaction is not None:
+            return cast(StandardDatabase, transaction.db)
         return CONF.db
 
     @classmethod
     @lru_cache()
     def get_collection_name(cls) -> str:
-        cls_config: ArangodanticCollectionConfig = getattr(
-            cls, "ArangodanticConfig", ArangodanticCollectionConfig()
-        )
-        if getattr(cls_config, "collection_name", None):
-            collection = cls_config.collection_name
-        else:
+        collection = cls.get_config_value("collection_name")
+        if not collection:
             collection = CONF.collection_generator(cls)  # type: ignore
         return f"{CONF.prefix}{collection}"
 
+    @classmethod
+    def get_config_value(cls, name: str, default: Any = None) -> Any:
+        """
+        Get a value from the "ArangodanticConfig" of the model.
+
+        :param name: The name of the configuration value.
+        :param default: Value to return if the model does not configure the value.
+        """
+        cls_config = getattr(cls, "ArangodanticConfig", ArangodanticCollectionConfig())
+        return getattr(cls_config, name, default)
+
+    @classmethod
+    def uses_partial_updates(cls) -> bool:
+        """
+        Tell if only the changed fields are sent when saving existing documents.
+        """
+        return bool(cls.get_config_value("partial_updates", False))
+
+    @classmethod
+    def get_cache(cls) -> Optional[ModelCache]:
+        """
+        Get the cache for documents loaded with "load"; the cache in the
+        "ArangodanticConfig" of the model, or else the one set with "configure".
+        Documents are removed from the cache when they are saved or deleted through
+        this process, other changes are only noticed when the cached document expires
+        or if the cache validates the revision.
+        """
+        cache = cls.get_config_value("cache")
+        if cache is None:
+            return CONF.cache
+        if cache is False:
+            return None
+        return cast(ModelCache, cache)
+
+    @classmethod
+    def get_write_buffer(cls) -> WriteBuffer:
+        """
+        Get the buffer for documents saved with "buffered=True"; the buffer in the
+        "ArangodanticConfig" of the model, or else a buffer of the model with the
+        default options.
+        """
+        buffer = cls.get_config_value("write_buffer")
+        if buffer is None:
+            buffer = _write_buffers.get(cls)
+            if buffer is None:
+                buffer = _write_buffers[cls] = WriteBuffer()
+        return cast(WriteBuffer, buffer)
+
+    @classmethod
+    def get_retry_policy(cls) -> Optional[RetryPolicy]:
+        """
+        Get the policy for retrying writes that fail with transient errors; the policy
+        in the "ArangodanticConfig" of the model, or else the one set with
+        "configure".
+        """
+        policy = cls.get_config_value("retry_policy")
+        if policy is None:
+            return CONF.retry_policy
+        if policy is False:
+            return None
+        return cast(RetryPolicy, policy)
+
+    @classmethod
+    async def _with_retry(
+        cls,
+        operation: str,
+        fn: Callable[[], Awaitable[T]],
+        idempotent: bool = True,
+    ) -> T:
+        """
+        Make a request, retrying it according to the retry policy of the model.
+
+        :param operation: Name of the operation, used for counting the retries.
+        :param fn: Async function that makes the request.
+        :param idempotent: The request has the same result when made again, so it
+        can also be retried after timeouts.
+        """
+        policy = cls.get_retry_policy()
+        if policy is None:
+            return await fn()
+        return await policy.call(cls.__name__, operation, fn, idempotent)
+
+    @classmethod
+    async def _with_bulk_retry(
+        cls,
+        operation: str,
+        fn: Callable[[List[T]], Awaitable[list]],
+        items: List[T],
+        check_rev: bool = False,
+        idempotent: bool = True,
+    ) -> list:
+        """
+        Make a bulk request, retrying it for the items that failed according to the
+        retry policy of the model.
+
+        :param operation: Name of the operation, used for counting the retries.
+        :param fn: Async function that makes the request for some of the items.
+        :param items: The items.
+        :param check_rev: The request checks the revisions of the items, so conflicts
+        of items are failed revision checks that are not retried.
+        :param idempotent: The request has the same result when made again, so it
+        can also be retried after timeouts.
+        """
+        policy = cls.get_retry_policy()
+        if policy is None:
+            return await fn(items)
+        return await policy.call_bulk(
+            cls.__name__,
+            operation,
+            fn,
+            items,
+            check_rev=check_rev,
+            idempotent=idempotent,
+        )
+
     @classmethod
     def get_collection(cls) -> StandardCollection:
         return cls.get_db().collection(cls.get_collection_name())
@@ -239,6 +1621,31 @@ class Model(pydantic.BaseModel, ABC):
         if not await db.has_collection(name):
             await db.create_collection(name, *args, **kwargs)
 
+    @classmethod
+    async def ensure_indexes(cls) -> List[dict]:
+        """
+        Ensure the indexes declared in the "indexes" of the "ArangodanticConfig" of the
+        model exist, and create the ones that are missing. Existing indexes that are
+        not declared are left as they are.
+
+        :return: The indexes that were created, as returned by ArangoDB.
+        """
+        indexes: List[Index] = cls.get_config_value("indexes", [])
+        if not indexes:
+            return []
+
+        collection = cls.get_collection()
+        existing = await collection.indexes()
+
+        created = []
+        for index in indexes:
+            if any(index.matches(existing_index) for existing_index in existing):
+                continue
+            result = await collection._add_index(index.get_definition())
+            existing.append(result)
+            created.append(result)
+        return created
+
     @classmethod
     async def delete_collection(cls, ignore_missing: bool = True):
         """
@@ -296,6 +1703,161 @@ class Model(pydantic.BaseModel, ABC):
         """
         pass
 
+    @classmethod
+    def _build_filter_str(
+        cls, filters: FilterTypes, instance_name: str
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the AQL FILTER clause for the given filters and corresponding bind_vars.
+
+        :param filters: Filters in same way as accepted by "find".
+        :param instance_name: The name we're using in the AQL query for the instances
+        we're looping over.
+        :return: A tuple of the "FILTER ..." string (empty if there are no filters)
+        and the related bind_vars as a dictionary.
+        """
+        # List of AQL FILTER expressions that will be added together using "AND" and
+        # corresponding bind_vars
+        filter_list, bind_vars = build_filters(filters, instance_name=instance_name)
+
+        filter_str = ""
+        if filter_list:
+            indented_and = "\n        AND "
+            filter_str += "FILTER " + indented_and.join(filter_list)
+
+        return filter_str, bind_vars
+
+    @staticmethod
+    def get_query_cache_info():
+        """
+        Get the statistics (hits, misses, maxsize and currsize) of the cache of compiled
+        queries used by "find".
+        """
+        return _compile_find_query_cached.cache_info()
+
+    @staticmethod
+    def clear_query_cache() -> None:
+        """
+        Clear the cache of compiled queries used by "find".
+        """
+        _compile_find_query_cached.cache_clear()
+
+    @classmethod
+    def _build_find_query(
+        cls,
+        filters: FilterTypes = None,
+        *,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        sort: SortTypes = None,
+        fields: Optional[Iterable[str]] = None,
+        resolve: Iterable[str] = (),
+        after: Optional[List[Any]] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the AQL query and bind_vars for finding instances of the class.
+
+        :param filters: Filters in same way as accepted by "find".
+        :param limit: Limit returned records to a maximum amount.
+        :param offset: Offset used when using a limit.
+        :param sort: Sort in same way as accepted by "find".
+        :param fields: Fields to return in same way as accepted by "find".
+        :param resolve: Fields of edge models to resolve, see "find".
+        :param after: Values of the sort fields to continue after, for keyset
+        pagination.
+        :return: A tuple of the AQL query and the bind_vars.
+        """
+        sort = tuple((field, direction) for field, direction in sort or ())
+        query, bind_vars = _compile_find_query(
+            filters_shape=get_filters_shape(filters),
+            sort=sort,
+            has_limit=limit is not None,
+            has_fields=fields is not None,
+            resolve=tuple(cls.__fields__[name].alias for name in resolve),
+            keyset=after is not None,
+        )
+        bind_vars.update(build_filter_values(filters))
+
+        if after is not None:
+            for i, value in enumerate(after):
+                bind_vars[f"after_{i}"] = value
+
+        if limit is not None:
+            bind_vars["offset"] = int(offset or 0)
+            bind_vars["limit"] = int(limit)
+
+        if fields is not None:
+            keep = ["_key", "_rev"]
+            if issubclass(cls, EdgeModel):
+                keep += ["_from", "_to"]
+            bind_vars["fields"] = list(dict.fromkeys([*keep, *fields]))
+
+        bind_vars["@collection"] = cls.get_collection_name()
+        return query, bind_vars
+
+    @classmethod
+    async def explain_find(
+        cls,
+        filters: FilterTypes = None,
+        *,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        sort: SortTypes = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> QueryPlan:
+        """
+        Get the execution plan of the query "find" would run, without running it, e.g.
+        to check that the query uses an index.
+
+        Example:
+            >>> plan = await Person.explain_find(
+            ...     {"name": "John"}, sort=[("age", ASCENDING)]
+            ... )
+            >>> plan.collection_scans
+            []
+            >>> [index["fields"] for index in plan.indexes]
+            [['name', 'age']]
+
+        :param filters: Filters in same way as accepted by "find".
+        :param limit: Limit in same way as accepted by "find".
+        :param offset: Offset in same way as accepted by "find".
+        :param sort: Sort in same way as accepted by "find".
+        :param fields: Fields to return in same way as accepted by "find".
+        :return: The plan, with the indexes it uses, its estimated cost and the
+        collections it reads all documents of.
+        """
+        if offset and limit is None:
+            raise ValueError("Offset is only supported together with limit")
+
+        query, bind_vars = cls._build_find_query(
+            filters, limit=limit, offset=offset, sort=sort, fields=fields
+        )
+        return await explain_query(cls.get_db(), query, bind_vars)
+
+    @classmethod
+    async def _check_full_scans(cls, query: str, bind_vars: Dict[str, Any]) -> None:
+        """
+        Explain the query and warn or raise if it reads all documents of a collection
+        with more documents than the configured "full_scan_threshold".
+        """
+        threshold = CONF.full_scan_threshold
+        if threshold is None:
+            return
+
+        db = cls.get_db()
+        plan = await explain_query(db, query, bind_vars)
+        for collection_name in plan.collection_scans:
+            size = await db.collection(collection_name).count()
+            if size <= threshold:
+                continue
+            message = (
+                f"Query of {cls.__name__} reads all {size} documents of collection "
+                f"'{collection_name}': {' '.join(query.split())}"
+            )
+            if CONF.full_scan_action == "raise":
+                raise FullCollectionScanError(message)
+            logger.warning(message)
+
     @classmethod
     async def find(
         cls,
@@ -306,6 +1868,16 @@ class Model(pydantic.BaseModel, ABC):
         limit: Optional[int] = None,
         offset: Optional[int] = None,
         sort: SortTypes = None,
+        fields: Optional[Iterable[str]] = None,
+        batch_size: Optional[int] = None,
+        stream: Optional[bool] = None,
+        ttl: Optional[int] = None,
+        memory_limit: Optional[int] = None,
+        prefetch: int = 0,
+        raw: bool = False,
+        validate: bool = True,
+        lazy: bool = False,
+        resolve: Union[Iterable[str], Dict[str, Optional[Type["Model"]]], None] = None,
     ) -> ArangodanticCursor:
         """
         Find instances of the class using an optional filter and limit.
@@ -321,56 +1893,75 @@ class Model(pydantic.BaseModel, ABC):
         :param offset: Offset used when using a limit.
         :param sort: How to sort the results. Can for example be a list of tuples with
         the field name and direction. E.g. [("name", "ASC")].
+        :param fields: Only return these (top level) fields of the documents, in
+        addition to "_key" and "_rev" (and "_from" and "_to" for edges). The models are
+        then built without validation and lack the other fields, so they should not be
+        saved unless partial updates are enabled.
+        :param batch_size: Number of documents fetched by the cursor in one round trip.
+        :param stream: Execute the query in a streaming fashion; the results are
+        calculated on the fly instead of being stored on the server. Can not be
+        combined with **count** and **full_count**.
+        :param ttl: Server side time-to-live for the cursor in seconds.
+        :param memory_limit: Max amount of memory the query is allowed to use in
+        bytes, 0 means no limit.
+        :param prefetch: Number of batches the cursor fetches in the background while
+        the current batch is being consumed, 0 disables prefetching.
+        :param raw: Give back the documents as dictionaries instead of models.
+        :param validate: Validate the documents when building the models. Only set to
+        False for trusted data, the models are then built from the data as is.
+        :param lazy: Give back proxies that build (and validate) the models on first
+        attribute access.
+        :param resolve: Fields of edge models ("from_" and/or "to_") to set to the
+        vertex models instead of their "_id", loaded in the same query. Each vertex is
+        built once, even if it is referred to by multiple edges. The model class of the
+        vertices is found by their collection, or can be given with a dictionary of
+        fields and model classes. With **raw** the vertices are given as dictionaries.
         """
 
-        # The name we use to refer to the items we're looping over in the AQL FOR loop
-        instance_name = "i"
-
-        # List of AQL FILTER expressions that will be added together using "AND" and
-        # corresponding bind_vars
-        filter_list, bind_vars = build_filters(filters, instance_name=instance_name)
-
-        filter_str = ""
-        if filter_list:
-            indented_and = "\n        AND "
-            filter_str += "FILTER " + indented_and.join(filter_list)
-
-        limit_str = ""
-        if limit is not None:
-            if offset is None:
-                offset = 0
-            limit_str += f"LIMIT {int(offset)}, {int(limit)}"
         if offset and limit is None:
             raise ValueError("Offset is only supported together with limit")
-
-        sort_str, sort_bind_vars = build_sort(sort=sort, instance_name=instance_name)
-        bind_vars.update(sort_bind_vars)
-
-        query = remove_whitespace_lines(
-            textwrap.dedent(
-                """
-                FOR {instance_name} IN @@collection
-                    {filter_str}
-                    {sort_str}
-                    {limit_str}
-                    RETURN {instance_name}
-                """
-            ).format(
-                instance_name=instance_name,
-                filter_str=filter_str,
-                limit_str=limit_str,
-                sort_str=sort_str,
-            )
+        if raw and lazy:
+            raise ValueError("raw and lazy can not be combined")
+
+        resolve_models: Dict[str, Optional[Type[Model]]] = {}
+        if isinstance(resolve, dict):
+            resolve_models.update(resolve)
+        elif resolve is not None:
+            resolve_models.update((name, None) for name in resolve)
+        for name in resolve_models:
+            if not issubclass(cls, EdgeModel) or name not in {"from_", "to_"}:
+                raise ValueError(f"Can not resolve '{name}' of '{cls.__name__}'")
+
+        query, bind_vars = cls._build_find_query(
+            filters,
+            limit=limit,
+            offset=offset,
+            sort=sort,
+            fields=fields,
+            resolve=resolve_models,
         )
-        bind_vars["@collection"] = cls.get_collection_name()
+        await cls._check_full_scans(query, bind_vars)
 
         cursor = await cls.get_db().aql.execute(
             query,
             count=count,
             bind_vars=bind_vars,
             full_count=full_count,
+            batch_size=batch_size,
+            stream=stream,
+            ttl=ttl,
+            memory_limit=memory_limit,
+        )
+        return ArangodanticCursor(
+            cls,
+            cursor,
+            validate=validate and fields is None,
+            partial=fields is not None,
+            raw=raw,
+            lazy=lazy,
+            prefetch=prefetch,
+            resolve=resolve_models,
         )
-        return ArangodanticCursor(cls, cursor)
 
     @classmethod
     async def find_one(
@@ -379,6 +1970,11 @@ class Model(pydantic.BaseModel, ABC):
         raise_on_multiple: bool = False,
         *,
         sort: SortTypes = None,
+        fields: Optional[Iterable[str]] = None,
+        stream: Optional[bool] = None,
+        ttl: Optional[int] = None,
+        memory_limit: Optional[int] = None,
+        resolve: Union[Iterable[str], Dict[str, Optional[Type["Model"]]], None] = None,
     ):
         """
         Find at most one item matching the optional filters.
@@ -386,6 +1982,13 @@ class Model(pydantic.BaseModel, ABC):
         :param filters: Filters in same way as accepted by "find".
         :param raise_on_multiple: Raise an exception if more than one match is found.
         :param sort: Sort in same way as accepted by "find".
+        :param fields: Fields to return in same way as accepted by "find".
+        :param stream: Execute the query in a streaming fashion, see "find".
+        :param ttl: Server side time-to-live for the cursor in seconds.
+        :param memory_limit: Max amount of memory the query is allowed to use in
+        bytes, 0 means no limit.
+        :param resolve: Fields of edge models to resolve in same way as accepted by
+        "find".
         :raises ModelNotFoundError: If no model matched the given filters.
         :raises MultipleModelsFoundError: If "raise_on_multiple" is set to True and more
         than one match is found.
@@ -395,7 +1998,16 @@ class Model(pydantic.BaseModel, ABC):
             limit = 2
 
         results = await (
-            await cls.find(filters=filters, limit=limit, sort=sort)
+            await cls.find(
+                filters=filters,
+                limit=limit,
+                sort=sort,
+                fields=fields,
+                stream=stream,
+                ttl=ttl,
+                memory_limit=memory_limit,
+                resolve=resolve,
+            )
         ).to_list()
         try:
             if raise_on_multiple and len(results) > 1:
@@ -406,6 +2018,94 @@ class Model(pydantic.BaseModel, ABC):
         except IndexError:
             raise ModelNotFoundError(f"No '{cls.__name__}' matched given filters")
 
+    @classmethod
+    async def find_page(
+        cls: Type[TModel],
+        filters: FilterTypes = None,
+        *,
+        sort: SortTypes = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[Iterable[str]] = None,
+        validate: bool = True,
+    ) -> Page[TModel]:
+        """
+        Find a page of instances of the class using keyset pagination. Instead of
+        skipping an offset, each page continues after the position of the last result
+        of the previous page, so deep pages are as fast as the first one (given an
+        index on the sort fields).
+
+        The results are sorted by "_key" after the given sort, so each result has a
+        unique position.
+
+        Example:
+            >>> page = await Model.find_page(sort=[("name", ASCENDING)], limit=10)
+            >>> next_page = await Model.find_page(
+            ...     sort=[("name", ASCENDING)], limit=10, after=page.next_token
+            ... )
+
+        :param filters: Filters in same way as accepted by "find".
+        :param sort: Sort in same way as accepted by "find".
+        :param after: The "next_token" of the previous page, None for the first page.
+        :param limit: Maximum number of results on the page.
+        :param fields: Fields to return in same way as accepted by "find".
+        :param validate: Validate the documents when building the models, see "find".
+        :return: The page of results.
+        :raise ValueError: Raised if the token is invalid or was created for another
+        sort.
+        """
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+
+        sort_list = [(field, direction) for field, direction in sort or ()]
+        if not any(field == "_key" for field, _ in sort_list):
+            sort_list.append(("_key", ASCENDING))
+
+        after_values = None
+        if after is not None:
+            after_values = decode_page_token(after, sort_list)
+
+        if fields is not None:
+            # The sort fields are needed for the token of the next page
+            fields = [
+                *fields,
+                *(field.strip(".").split(".")[0] for field, _ in sort_list),
+            ]
+
+        # Get one more result than needed to know if there is a next page
+        query, bind_vars = cls._build_find_query(
+            filters,
+            limit=limit + 1,
+            sort=sort_list,
+            fields=fields,
+            after=after_values,
+        )
+        await cls._check_full_scans(query, bind_vars)
+        cursor = await cls.get_db().aql.execute(
+            query, bind_vars=bind_vars, batch_size=limit + 1
+        )
+        async with ArangodanticCursor(cls, cursor, raw=True) as rows_cursor:
+            rows = [row async for row in rows_cursor]
+
+        next_token = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_token = encode_page_token(
+                sort_list, [get_field_value(rows[-1], field) for field, _ in sort_list]
+            )
+
+        identity_map = get_identity_map() if fields is None else None
+        items = [
+            build_model(
+                cls,
+                row,
+                validate=validate and fields is None,
+                identity_map=identity_map,
+            )
+            for row in rows
+        ]
+        return Page(items, next_token)
+
 
 class DocumentModel(Model, ABC):
     """
@@ -413,6 +2113,37 @@ class DocumentModel(Model, ABC):
     """
 
 
+def get_document_model(collection_name: str) -> Type[DocumentModel]:
+    """
+    Get the document model class of a collection, e.g. to build the vertices of
+    edges. If multiple classes use the collection, their common base class is used.
+
+    :param collection_name: The name of the collection.
+    :raise ConfigError: Raised if there is no single document model class for the
+    collection.
+    """
+    models = []
+    subclasses = DocumentModel.__subclasses__()
+    while subclasses:
+        model = subclasses.pop()
+        subclasses.extend(model.__subclasses__())
+        if model.get_collection_name() == collection_name:
+            models.append(model)
+
+    # Subclasses of other matching classes are variants of the same documents
+    bases = [
+        model
+        for model in set(models)
+        if not any(model is not other and issubclass(model, other) for other in models)
+    ]
+    if len(bases) != 1:
+        raise ConfigError(
+            f"Expected one DocumentModel for collection '{collection_name}', found "
+            f"{len(bases)}"
+        )
+    return bases[0]
+
+
 class EdgeModel(Model, ABC):
     """
     Base edge model class.
@@ -0,0 +1,73 @@
+import base64
+import binascii
+import json
+from typing import Any, Generic, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(Generic[T]):
+    """
+    A page of results from keyset pagination, with the token to get the next page.
+    """
+
+    __slots__ = ["items", "next_token"]
+
+    def __init__(self, items: List[T], next_token: Optional[str] = None):
+        """
+        :param items: The results on the page.
+        :param next_token: The token to pass as "after" to get the next page, None if
+        this is the last page.
+        """
+        self.items = items
+        self.next_token = next_token
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index: int) -> T:
+        return self.items[index]
+
+    @property
+    def has_more(self) -> bool:
+        """
+        Tells if there are more results after this page.
+        """
+        return self.next_token is not None
+
+
+def encode_page_token(sort: Sequence[Tuple[str, str]], values: List[Any]) -> str:
+    """
+    Encode the position in the sort order into an opaque token.
+
+    :param sort: The sort used for the pagination.
+    :param values: The values of the sort fields of the last result on the page.
+    :return: The token.
+    """
+    data = json.dumps({"sort": [list(item) for item in sort], "after": values})
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_page_token(token: str, sort: Sequence[Tuple[str, str]]) -> List[Any]:
+    """
+    Decode the position in the sort order from a token.
+
+    :param token: The token from "encode_page_token".
+    :param sort: The sort used for the pagination, must be the same as when the
+    token was created.
+    :return: The values of the sort fields to continue after.
+    :raise ValueError: Raised if the token is invalid or was created for another sort.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode()))
+        token_sort = [tuple(item) for item in data["sort"]]
+        values: List[Any] = data["after"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValueError("Invalid page token")
+
+    if token_sort != [tuple(item) for item in sort] or len(values) != len(sort):
+        raise ValueError("Page token does not match the sort")
+    return values
@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import random
+from collections import Counter
+from typing import Any, Awaitable, Callable, Iterable, List, Tuple, TypeVar
+
+from aioarangodb.exceptions import ArangoServerError
+
+from arangodantic.arangdb_error_codes import (
+    ERROR_ARANGO_CONFLICT,
+    ERROR_ARANGO_WRITE_THROTTLE_TIMEOUT,
+    ERROR_CLUSTER_BACKEND_UNAVAILABLE,
+    ERROR_CLUSTER_LEADERSHIP_CHALLENGE_ONGOING,
+    ERROR_CLUSTER_NOT_LEADER,
+    ERROR_CLUSTER_SHARD_LEADER_REFUSES_REPLICATION,
+    ERROR_CLUSTER_SHARD_LEADER_RESIGNED,
+    ERROR_CLUSTER_TIMEOUT,
+    ERROR_LOCK_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Errors that are expected to go away when the operation is retried; write-write
+# conflicts, timeouts and changes of the shard leaders in a cluster
+RETRY_ERROR_CODES = frozenset(
+    {
+        ERROR_LOCK_TIMEOUT,
+        ERROR_ARANGO_CONFLICT,
+        ERROR_ARANGO_WRITE_THROTTLE_TIMEOUT,
+        ERROR_CLUSTER_TIMEOUT,
+        ERROR_CLUSTER_BACKEND_UNAVAILABLE,
+        ERROR_CLUSTER_SHARD_LEADER_REFUSES_REPLICATION,
+        ERROR_CLUSTER_SHARD_LEADER_RESIGNED,
+        ERROR_CLUSTER_LEADERSHIP_CHALLENGE_ONGOING,
+        ERROR_CLUSTER_NOT_LEADER,
+    }
+)
+
+# Errors after which the operation may have been applied anyway, so operations that
+# are not idempotent are not retried on them; retrying an insert could create a
+# duplicate document or fail with a unique constraint violation
+TIMEOUT_ERROR_CODES = frozenset({ERROR_LOCK_TIMEOUT, ERROR_CLUSTER_TIMEOUT})
+
+# A failed revision check ("If-Match" or "_rev") also has the conflict error code,
+# but fails in the same way when retried
+HTTP_PRECONDITION_FAILED = 412
+
+
+class RetryPolicy:
+    """
+    Retry writes that fail with transient errors, waiting with exponential backoff and
+    jitter between the attempts. The number of retries is counted per model and
+    operation, to find the documents that are contended.
+
+    Operations that are not idempotent, i.e. inserts and writes with revision checks
+    or that fail on missing documents, are not retried after timeouts, as they might
+    have been applied; a retry could then create a duplicate document or fail with a
+    unique constraint violation or revision conflict.
+
+    Example:
+        >>> configure(db, retry_policy=RetryPolicy(max_attempts=5))
+        >>> CONF.retry_policy.retries
+        Counter({('Identity', 'save'): 2})
+
+    :param max_attempts: Maximum number of times to try an operation.
+    :param error_codes: The ArangoDB error codes to retry.
+    :param base_delay: Number of seconds to wait before the first retry, doubled for
+    each following retry.
+    :param max_delay: Maximum number of seconds to wait before a retry.
+    :param jitter: Wait a random time up to the delay, so concurrent writers that
+    conflicted do not retry at the same time.
+    :param retry_non_idempotent: Also retry operations that are not idempotent after
+    timeouts.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        error_codes: Iterable[int] = RETRY_ERROR_CODES,
+        base_delay: float = 0.05,
+        max_delay: float = 2.0,
+        jitter: bool = True,
+        retry_non_idempotent: bool = False,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be a positive integer")
+
+        self.max_attempts = max_attempts
+        self.error_codes = frozenset(error_codes)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_non_idempotent = retry_non_idempotent
+        # Number of retries by the name of the model and the operation
+        self.retries: "Counter[Tuple[str, str]]" = Counter()
+        # Number of operations that still failed after the last attempt
+        self.exhausted: "Counter[Tuple[str, str]]" = Counter()
+
+    def is_retryable(self, error: Any, idempotent: bool = True) -> bool:
+        """
+        Tell if an operation that failed with the error should be retried.
+
+        :param error: The error, or a result of a bulk operation.
+        :param idempotent: The operation has the same result when applied again.
+        """
+        return (
+            isinstance(error, ArangoServerError)
+            and error.error_code in self.error_codes
+            and error.http_code != HTTP_PRECONDITION_FAILED
+            and (
+                idempotent
+                or self.retry_non_idempotent
+                or error.error_code not in TIMEOUT_ERROR_CODES
+            )
+        )
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        Get the number of seconds to wait before retrying.
+
+        :param attempt: The number of the attempt that failed, starting from 1.
+        """
+        delay: float = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    async def call(
+        self,
+        name: str,
+        operation: str,
+        fn: Callable[[], Awaitable[T]],
+        idempotent: bool = True,
+    ) -> T:
+        """
+        Call a function, and call it again while it fails with a retryable error.
+
+        :param name: Name of the model, used for counting the retries.
+        :param operation: Name of the operation, used for counting the retries.
+        :param fn: Async function that makes the request.
+        :param idempotent: The request has the same result when made again.
+        :return: The result of the function.
+        """
+        attempt = 1
+        while True:
+            try:
+                return await fn()
+            except ArangoServerError as ex:
+                if not self.is_retryable(ex, idempotent):
+                    raise
+                if attempt >= self.max_attempts:
+                    self.exhausted[(name, operation)] += 1
+                    raise
+                await self._wait(name, operation, attempt, ex)
+            attempt += 1
+
+    async def call_bulk(
+        self,
+        name: str,
+        operation: str,
+        fn: Callable[[List[T]], Awaitable[list]],
+        items: List[T],
+        check_rev: bool = False,
+        idempotent: bool = True,
+    ) -> list:
+        """
+        Call a function for a bulk operation, and call it again for the items that
+        failed with a retryable error.
+
+        The errors of the items have the status code of the whole request, so failed
+        revision checks can not be told apart from write-write conflicts; with
+        **check_rev** conflicts of items are not retried.
+
+        :param name: Name of the model, used for counting the retries.
+        :param operation: Name of the operation, used for counting the retries.
+        :param fn: Async function that makes the request for some items, returning a
+        list with a result or an error per item.
+        :param items: The items.
+        :param check_rev: The request checks the revisions of the items.
+        :param idempotent: The request has the same result when made again.
+        :return: The results, in the same order as the items.
+        """
+        results: list = [None] * len(items)
+        pending = list(range(len(items)))
+        attempt = 1
+        while True:
+            pending_items = [items[i] for i in pending]
+            pending_results = await self.call(
+                name, operation, lambda: fn(pending_items), idempotent
+            )
+
+            failed = []
+            for i, result in zip(pending, pending_results):
+                results[i] = result
+                if self.is_retryable(result, idempotent) and not (
+                    check_rev and result.error_code == ERROR_ARANGO_CONFLICT
+                ):
+                    failed.append(i)
+            if not failed:
+                return results
+            if attempt >= self.max_attempts:
+                self.exhausted[(name, operation)] += len(failed)
+                return results
+
+            await self._wait(name, operation, attempt, results[failed[0]])
+            pending = failed
+            attempt += 1
+
+    async def _wait(
+        self, name: str, operation: str, attempt: int, error: ArangoServerError
+    ) -> None:
+        """
+        Count a retry and wait before it.
+        """
+        self.retries[(name, operation)] += 1
+        delay = self.get_delay(attempt)
+        logger.debug(
+            "Retrying %s of %s in %.3f seconds after error %s: %s",
+            operation,
+            name,
+            delay,
+            error.error_code,
+            error.error_message,
+        )
+        await asyncio.sleep(delay)
@@ -1,6 +1,6 @@
 import random
 import string
-from typing import Optional
+from typing import List, Optional
 from uuid import uuid4
 
 import pydantic
@@ -76,6 +76,16 @@ class ExtendedIdentity(Identity):
             self.extra = override_extra
 
 
+class PartialIdentity(Identity):
+    """Dummy identity Arangodantic model using partial updates."""
+
+    tags: List[str] = []
+
+    class ArangodanticConfig:
+        collection_name = "partial_identities"
+        partial_updates = True
+
+
 class Link(EdgeModel):
     """Dummy Arangodantic edge model."""
 
@@ -150,6 +160,13 @@ async def extended_identity_collection(configure_db):
     await ExtendedIdentity.delete_collection()
 
 
+@pytest.fixture
+async def partial_identity_collection(configure_db):
+    await PartialIdentity.ensure_collection()
+    yield
+    await PartialIdentity.delete_collection()
+
+
 @pytest.fixture
 async def link_collection(configure_db):
     await Link.ensure_collection()
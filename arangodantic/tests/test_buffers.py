@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from arangodantic import UniqueConstraintError, WriteBuffer
+from arangodantic.tests.conftest import Identity
+
+
+class BufferedIdentity(Identity):
+    """Dummy identity Arangodantic model saved through a small write buffer."""
+
+    class ArangodanticConfig:
+        collection_name = "identities"
+        write_buffer = WriteBuffer(batch_size=2, flush_interval=0.05, max_pending=3)
+
+
+@pytest.mark.asyncio
+async def test_save_buffered(identity_collection):
+    buffer = Identity.get_write_buffer()
+    assert buffer is Identity.get_write_buffer()
+
+    identity = Identity(name="Buffered")
+    future = await identity.save(buffered=True)
+    assert future is not None
+    assert len(buffer) == 1
+
+    result = await asyncio.wait_for(future, 5)
+    assert result["_key"] == identity.key_
+    assert result["_rev"] == identity.rev_
+    assert len(buffer) == 0
+    assert (await Identity.load(identity.key_)).name == "Buffered"
+
+    with pytest.raises(ValueError):
+        await identity.save(buffered=True)
+
+    await buffer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_save_buffered_flush(identity_collection, identity_alice):
+    buffer = BufferedIdentity.get_write_buffer()
+
+    futures = [
+        await BufferedIdentity(name=f"Person {i}").save(buffered=True) for i in range(5)
+    ]
+    duplicate = BufferedIdentity(_key=identity_alice.key_, name="Alice")
+    duplicate_future = await duplicate.save(buffered=True)
+
+    await buffer.flush()
+    assert len(buffer) == 0
+    assert all(future.done() for future in futures)
+    with pytest.raises(UniqueConstraintError):
+        duplicate_future.result()
+    assert await Identity.count_documents({"name": {"like": "Person %"}}) == 5
+
+    await buffer.aclose()
+
+
+class StuckIdentity(Identity):
+    """Dummy identity Arangodantic model that is never written."""
+
+    class ArangodanticConfig:
+        write_buffer = WriteBuffer(batch_size=1, max_pending=1)
+
+    @classmethod
+    async def save_many(cls, models, **kwargs):
+        await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_save_buffered_cancelled():
+    buffer = StuckIdentity.get_write_buffer()
+    future = await StuckIdentity(name="Stuck").save(buffered=True)
+    await asyncio.sleep(0.01)
+    assert len(buffer) == 0
+
+    # Cancelling the write resolves the futures and frees the space in the buffer
+    task = buffer._task
+    assert task is not None
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await future
+    assert future.cancelled()
+    assert not buffer._slots.locked()
+
+    await buffer.aclose()
@@ -0,0 +1,144 @@
+import asyncio
+from typing import Any, Dict
+
+import pytest
+
+from arangodantic import CONF, MemoryCache, ModelNotFoundError
+from arangodantic.tests.conftest import Identity
+
+
+class MetaIdentity(Identity):
+    """Dummy identity Arangodantic model with a field of plain dictionaries."""
+
+    meta: Dict[str, Any] = {}
+
+    class ArangodanticConfig:
+        collection_name = "identities"
+
+
+@pytest.mark.asyncio
+async def test_memory_cache():
+    cache = MemoryCache(maxsize=2, ttl=None)
+    await cache.set("identities/a", {"_key": "a"})
+    await cache.set("identities/b", {"_key": "b"})
+    assert await cache.get("identities/a") == {"_key": "a"}
+
+    # The least recently used document is evicted
+    await cache.set("identities/c", {"_key": "c"})
+    assert await cache.get("identities/b") is None
+    assert "identities/a" in cache
+    assert cache.evictions == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+    # Changing stored or returned documents does not change the cached documents
+    document = await cache.get("identities/a")
+    document["_key"] = "changed"
+    assert await cache.get("identities/a") == {"_key": "a"}
+
+    await cache.delete("identities/a")
+    assert "identities/a" not in cache
+
+    # Only the documents of the collection are removed
+    await cache.set("links/a", {"_key": "a"})
+    await cache.clear_collection("identities")
+    assert "identities/c" not in cache
+    assert "links/a" in cache
+
+    await cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_ttl():
+    cache = MemoryCache(ttl=0.01)
+    await cache.set("identities/a", {"_key": "a"})
+    assert await cache.get("identities/a") is not None
+
+    await asyncio.sleep(0.02)
+    assert await cache.get("identities/a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_load_cache(identity_collection, identity_alice):
+    cache = MemoryCache()
+    CONF.cache = cache
+    try:
+        await Identity.load(identity_alice.key_)
+        assert identity_alice.id_ in cache
+
+        # Changes through other processes are not noticed
+        await Identity.get_collection().update(
+            {"_key": identity_alice.key_, "name": "Alice Liddell"}
+        )
+        assert (await Identity.load(identity_alice.key_)).name == "Alice"
+
+        # Saving invalidates the cached document
+        identity_alice.name = "Alice in Wonderland"
+        await identity_alice.save()
+        assert identity_alice.id_ not in cache
+        assert (await Identity.load(identity_alice.key_)).name == "Alice in Wonderland"
+
+        await identity_alice.delete()
+        assert identity_alice.id_ not in cache
+    finally:
+        CONF.cache = None
+
+
+@pytest.mark.asyncio
+async def test_load_cache_copies(identity_collection):
+    identity = MetaIdentity(name="Alice", meta={"tags": ["author"]})
+    await identity.save()
+
+    cache = MemoryCache()
+    CONF.cache = cache
+    try:
+        loaded = await MetaIdentity.load(identity.key_)
+        assert identity.id_ in cache
+
+        # Changing a loaded model in place does not change the cached document
+        loaded.meta["tags"].append("reader")
+        reloaded = await MetaIdentity.load(identity.key_)
+        assert cache.hits == 1
+        assert reloaded.meta == {"tags": ["author"]}
+    finally:
+        CONF.cache = None
+
+
+@pytest.mark.asyncio
+async def test_load_cache_validate_rev(identity_collection, identity_alice):
+    cache = MemoryCache(validate_rev=True)
+    CONF.cache = cache
+    try:
+        await Identity.load(identity_alice.key_)
+        assert (await Identity.load(identity_alice.key_)).name == "Alice"
+        assert cache.hits == 1
+
+        await Identity.get_collection().update(
+            {"_key": identity_alice.key_, "name": "Alice Liddell"}
+        )
+        assert (await Identity.load(identity_alice.key_)).name == "Alice Liddell"
+
+        await Identity.get_collection().delete({"_key": identity_alice.key_})
+        with pytest.raises(ModelNotFoundError):
+            await Identity.load(identity_alice.key_)
+        assert identity_alice.id_ not in cache
+    finally:
+        CONF.cache = None
+
+
+@pytest.mark.asyncio
+async def test_delete_where_cache(identity_collection, identity_alice, identity_bob):
+    cache = MemoryCache()
+    CONF.cache = cache
+    try:
+        await Identity.load(identity_alice.key_)
+        await cache.set("links/a", {"_key": "a"})
+
+        await Identity.delete_where({"name": "Bob"})
+        assert identity_alice.id_ not in cache
+        # Documents of other collections sharing the cache are kept
+        assert "links/a" in cache
+    finally:
+        CONF.cache = None
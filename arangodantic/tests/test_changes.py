@@ -0,0 +1,65 @@
+import pytest
+
+from arangodantic import (
+    CONF,
+    ChangeSubscriber,
+    MemoryCache,
+    ReplayChangeFeed,
+    use_identity_map,
+)
+from arangodantic.tests.conftest import Identity
+
+
+@pytest.mark.asyncio
+async def test_change_subscriber(identity_collection, identity_alice, identity_bob):
+    cache = MemoryCache()
+    CONF.cache = cache
+    try:
+        feed = ReplayChangeFeed()
+        changes = []
+
+        async def on_change(change):
+            changes.append(change)
+
+        async with use_identity_map() as identity_map:
+            subscriber = ChangeSubscriber([Identity], feed=feed)
+            subscriber.add_callback(on_change)
+
+            alice = await Identity.load(identity_alice.key_)
+            await Identity.load(identity_bob.key_)
+
+            collection_name = Identity.get_collection_name()
+            feed.append(
+                {
+                    "tick": "1",
+                    "type": 2300,
+                    "cname": collection_name,
+                    "data": {"_key": alice.key_, "_rev": "_changed"},
+                }
+            )
+            feed.append(
+                {
+                    "tick": "2",
+                    "type": 2300,
+                    "cname": "other_collection",
+                    "data": {"_key": identity_bob.key_, "_rev": "_changed"},
+                }
+            )
+            assert await subscriber.poll() == 1
+            assert alice.id_ not in cache
+            assert alice.id_ not in identity_map
+            assert identity_bob.id_ in cache
+            assert identity_bob.id_ in identity_map
+            assert [(change.type, change.key) for change in changes] == [
+                ("save", alice.key_)
+            ]
+
+            # Truncating the collection only removes the documents of the collection
+            await cache.set("other_collection/a", {"_key": "a"})
+            feed.append({"tick": "3", "type": 2004, "cname": collection_name})
+            assert await subscriber.poll() == 1
+            assert list(cache.documents) == ["other_collection/a"]
+            assert len(identity_map) == 0
+            assert subscriber.tick == "3"
+    finally:
+        CONF.cache = None
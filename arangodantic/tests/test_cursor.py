@@ -1,5 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
+from arangodantic import ASCENDING, LazyModel
 from arangodantic.tests.conftest import Identity
 
 
@@ -25,3 +28,68 @@ async def test_full_count(identity_collection, identity_alice, identity_bob):
     cursor = await Identity.find(limit=1, full_count=True)
     assert len(await cursor.to_list()) == 1
     assert cursor.full_count == 2
+
+
+@pytest.mark.asyncio
+async def test_batches(identity_collection):
+    await Identity.save_many([Identity(name=f"Person {i}") for i in range(5)])
+
+    async with await Identity.find(batch_size=2, stream=True) as cursor:
+        batches = [batch async for batch in cursor.batches()]
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert all(isinstance(i, Identity) for batch in batches for i in batch)
+
+
+@pytest.mark.asyncio
+async def test_prefetch(identity_collection):
+    await Identity.save_many([Identity(name=f"Person {i}") for i in range(5)])
+
+    async with await Identity.find(batch_size=2, prefetch=2) as cursor:
+        identities = [i async for i in cursor]
+
+    assert len(identities) == 5
+    assert cursor.rows_fetched == 5
+    assert cursor.batches_fetched == 3
+    assert cursor.batch_wait_time >= 0
+    assert cursor.throughput > 0
+
+    # Closing before all batches are read stops the prefetching
+    cursor = await Identity.find(batch_size=2, prefetch=1)
+    await cursor.next()
+    prefetch_task = cursor._prefetch_task
+    await cursor.close(ignore_missing=True)
+    assert prefetch_task is not None and prefetch_task.done()
+
+
+@pytest.mark.asyncio
+async def test_cursor_modes(identity_collection, identity_alice):
+    rows = await (await Identity.find(raw=True)).to_list()
+    assert rows[0]["name"] == "Alice"
+    assert rows[0]["_key"] == identity_alice.key_
+
+    identities = await (await Identity.find(validate=False)).to_list()
+    assert isinstance(identities[0], Identity)
+    assert identities[0].key_ == identity_alice.key_
+    assert identities[0].name == "Alice"
+
+    identities = await (await Identity.find(lazy=True)).to_list()
+    assert isinstance(identities[0], LazyModel)
+    assert isinstance(identities[0], Identity)
+    assert identities[0].name == "Alice"
+    assert identities[0].get_model() == identity_alice
+
+    with pytest.raises(ValueError):
+        await Identity.find(raw=True, lazy=True)
+
+
+@pytest.mark.asyncio
+async def test_to_list_in_executor(identity_collection):
+    await Identity.save_many([Identity(name=f"Person {i}") for i in range(5)])
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        cursor = await Identity.find(sort=[("name", ASCENDING)], batch_size=3)
+        identities = await cursor.to_list(executor=executor, chunk_size=2)
+
+    assert [i.name for i in identities] == [f"Person {i}" for i in range(5)]
+    assert all(isinstance(i, Identity) for i in identities)
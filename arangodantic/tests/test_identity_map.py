@@ -0,0 +1,50 @@
+import pytest
+
+from arangodantic import get_identity_map, use_identity_map
+from arangodantic.tests.conftest import Identity
+
+
+@pytest.mark.asyncio
+async def test_identity_map(identity_collection, identity_alice, identity_bob):
+    assert get_identity_map() is None
+
+    async with use_identity_map() as identity_map:
+        assert get_identity_map() is identity_map
+
+        alice = await Identity.load(identity_alice.key_)
+        assert alice is not identity_alice
+        assert await Identity.load(identity_alice.key_) is alice
+
+        identities = await Identity.load_many([identity_alice.key_, identity_bob.key_])
+        assert identities[0] is alice
+
+        found = await (await Identity.find(sort=[("name", "ASC")])).to_list()
+        assert found[0] is alice
+        assert found[1] is identities[1]
+
+        # Partial models are not shared
+        found = await Identity.find_one({"name": "Alice"}, fields=["name"])
+        assert found is not alice
+
+        cecil = Identity(name="Cecil")
+        await cecil.save()
+        assert await Identity.load(cecil.key_) is cecil
+
+        await cecil.delete()
+        assert cecil.id_ not in identity_map
+
+    assert get_identity_map() is None
+
+
+@pytest.mark.asyncio
+async def test_identity_map_reload(identity_collection, identity_alice):
+    async with use_identity_map():
+        alice = await Identity.load(identity_alice.key_)
+
+        identity_alice.name = "Alice in Wonderland"
+        await identity_alice.save()
+
+        # Loading gives back the known instance, reloading gets the latest data
+        assert (await Identity.load(identity_alice.key_)).name == "Alice"
+        await alice.reload()
+        assert alice.name == "Alice in Wonderland"
@@ -0,0 +1,100 @@
+from typing import List
+
+import pytest
+
+from arangodantic import (
+    DocumentModel,
+    GeoIndex,
+    HashIndex,
+    InvertedIndex,
+    PersistentIndex,
+    TTLIndex,
+)
+
+
+class IndexedIdentity(DocumentModel):
+    name: str = ""
+    email: str = ""
+    tags: List[str] = []
+    expires: int = 0
+
+    class ArangodanticConfig:
+        collection_name = "indexed_identities"
+        indexes = [
+            PersistentIndex(fields=["name"], stored_values=["email"]),
+            HashIndex(fields=["email"], unique=True, sparse=True),
+            PersistentIndex(fields=["tags[*]"]),
+            TTLIndex(fields=["expires"], expire_after=3600),
+        ]
+
+
+@pytest.fixture
+async def indexed_identity_collection(configure_db):
+    await IndexedIdentity.ensure_collection()
+    yield
+    await IndexedIdentity.delete_collection()
+
+
+def test_index_definition():
+    assert PersistentIndex(
+        fields=["name"], stored_values=["email"]
+    ).get_definition() == {
+        "type": "persistent",
+        "fields": ["name"],
+        "unique": False,
+        "sparse": False,
+        "storedValues": ["email"],
+    }
+    assert TTLIndex(
+        fields=["expires"], expire_after=60, name="ttl"
+    ).get_definition() == {
+        "type": "ttl",
+        "fields": ["expires"],
+        "name": "ttl",
+        "expireAfter": 60,
+    }
+    assert InvertedIndex(
+        fields=["name", {"name": "bio", "analyzer": "text_en"}],
+        options={"analyzer": "identity"},
+    ).get_definition() == {
+        "type": "inverted",
+        "fields": ["name", {"name": "bio", "analyzer": "text_en"}],
+        "analyzer": "identity",
+    }
+
+
+def test_index_matches():
+    existing = {
+        "id": "1",
+        "type": "persistent",
+        "fields": ["email"],
+        "unique": True,
+        "sparse": True,
+    }
+    # Hash indexes are reported as persistent indexes
+    assert HashIndex(fields=["email"], unique=True, sparse=True).matches(existing)
+    assert not PersistentIndex(fields=["email"]).matches(existing)
+    assert not PersistentIndex(fields=["email", "name"], unique=True).matches(existing)
+    assert GeoIndex(fields=["email"], name="idx_email").matches(
+        {**existing, "name": "idx_email"}
+    )
+    assert InvertedIndex(fields=[{"name": "bio"}]).matches(
+        {"id": "2", "type": "inverted", "fields": [{"name": "bio", "analyzer": "x"}]}
+    )
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes(indexed_identity_collection):
+    created = await IndexedIdentity.ensure_indexes()
+    assert len(created) == 4
+    assert {index["type"] for index in created} >= {"persistent", "ttl"}
+
+    # Only missing indexes are created
+    assert await IndexedIdentity.ensure_indexes() == []
+
+    indexes = await IndexedIdentity.get_collection().indexes()
+    await IndexedIdentity.get_collection().delete_index(
+        next(index["id"] for index in indexes if index["type"] == "ttl")
+    )
+    created = await IndexedIdentity.ensure_indexes()
+    assert [index["type"] for index in created] == ["ttl"]
@@ -7,13 +7,23 @@ from aioarangodb import CursorCountError
 
 from arangodantic import (
     ASCENDING,
+    CONF,
     DESCENDING,
     DataSourceNotFound,
+    DocumentModel,
+    FullCollectionScanError,
     ModelNotFoundError,
     MultipleModelsFoundError,
+    RevisionConflictError,
     UniqueConstraintError,
 )
-from arangodantic.tests.conftest import ExtendedIdentity, Identity, Link, SubModel
+from arangodantic.tests.conftest import (
+    ExtendedIdentity,
+    Identity,
+    Link,
+    PartialIdentity,
+    SubModel,
+)
 from arangodantic.utils import SortTypes
 
 
@@ -29,6 +39,24 @@ async def test_save_and_load_model(identity_collection):
     assert identity.key_ == loaded_identity.key_
 
 
+@pytest.mark.asyncio
+async def test_load_many(identity_collection, identity_alice, identity_bob):
+    keys = [identity_bob.key_, "missing", identity_alice.key_]
+
+    with pytest.raises(ModelNotFoundError):
+        await Identity.load_many(keys)
+
+    loaded = await Identity.load_many(keys, missing="skip")
+    assert [i.name for i in loaded] == ["Bob", "Alice"]
+
+    loaded = await Identity.load_many(keys, missing="none")
+    assert loaded[0].key_ == identity_bob.key_
+    assert loaded[1] is None
+    assert loaded[2].key_ == identity_alice.key_
+
+    assert await Identity.load_many([]) == []
+
+
 @pytest.mark.asyncio
 async def test_unique_constraint(identity_collection):
     # Create unique index on the "name" field.
@@ -65,6 +93,77 @@ async def test_unique_constraint(identity_collection):
         await identity_3.save()
 
 
+@pytest.mark.asyncio
+async def test_save_many(identity_collection):
+    # Create unique index on the "name" field.
+    await Identity.get_collection().add_hash_index(fields=["name"], unique=True)
+
+    identities = [Identity(name=f"Person {i}") for i in range(5)]
+    identities.append(Identity(name="Person 0"))
+
+    errors = await Identity.save_many(identities, batch_size=2)
+
+    assert errors[:5] == [None] * 5
+    assert isinstance(errors[5], UniqueConstraintError)
+    for identity in identities[:5]:
+        assert identity.key_ is not None
+        assert identity.rev_ is not None
+    assert identities[5].rev_ is None
+
+    # Existing documents are replaced
+    identities[0].name = "Jane Doe"
+    identities[1].name = "Person 2"
+    errors = await Identity.save_many(identities[:2])
+    assert errors[0] is None
+    assert isinstance(errors[1], UniqueConstraintError)
+
+    loaded_identity = await Identity.load(identities[0].key_)
+    assert loaded_identity.name == "Jane Doe"
+    assert loaded_identity.rev_ == identities[0].rev_
+
+
+@pytest.mark.asyncio
+async def test_upsert(extended_identity_collection):
+    alice = ExtendedIdentity(name="Alice", extra="first")
+    assert await ExtendedIdentity.upsert_one({"name": "Alice"}, insert=alice) is True
+    assert alice.key_ is not None
+    assert alice.rev_ is not None
+
+    # The existing document is updated, and the model gets its key
+    other = ExtendedIdentity(name="Alice", extra="second")
+    created = await ExtendedIdentity.upsert_one(
+        {"name": "Alice"}, insert=other, update={"extra": "updated"}
+    )
+    assert created is False
+    assert other.key_ == alice.key_
+    assert other.rev_ != alice.rev_
+    assert other.extra == "updated"
+    assert await ExtendedIdentity.count_documents() == 1
+
+
+@pytest.mark.asyncio
+async def test_upsert_many(extended_identity_collection):
+    await ExtendedIdentity(name="Bob", extra="old").save()
+
+    identities = [ExtendedIdentity(name=name, extra="new") for name in ["Alice", "Bob"]]
+    identities.append(ExtendedIdentity(name="Cecil"))
+    created = await ExtendedIdentity.upsert_many(
+        [
+            ({"name": identities[0].name}, identities[0]),
+            ({"name": identities[1].name}, identities[1]),
+            ({"name": {"in": ["Cecil", "Cecilia"]}}, identities[2]),
+        ],
+        update=["extra"],
+        batch_size=1,
+    )
+    assert created == [True, False, True]
+    assert all(identity.rev_ is not None for identity in identities)
+
+    bob = await ExtendedIdentity.find_one({"name": "Bob"})
+    assert bob.extra == "new"
+    assert await ExtendedIdentity.count_documents() == 3
+
+
 @pytest.mark.asyncio
 async def test_delete_model(identity_collection):
     identity = Identity(name="Jane Doe")
@@ -77,6 +176,87 @@ async def test_delete_model(identity_collection):
     assert await identity.delete(ignore_missing=True) is False
 
 
+@pytest.mark.asyncio
+async def test_check_rev(identity_collection):
+    identity = Identity(name="Jane Doe")
+    await identity.save()
+    stale = await Identity.load(identity.key_)
+
+    identity.name = "Jane Austen"
+    await identity.save()
+
+    stale.name = "Jane Eyre"
+    with pytest.raises(RevisionConflictError):
+        await stale.save()
+    with pytest.raises(RevisionConflictError):
+        await stale.delete()
+
+    # Without the check the last write wins
+    await stale.save(check_rev=False)
+    assert (await Identity.load(identity.key_)).name == "Jane Eyre"
+    assert await identity.delete(check_rev=False) is True
+
+
+@pytest.mark.asyncio
+async def test_update_with_retry(identity_collection):
+    identity = Identity(name="Jane")
+    await identity.save()
+
+    calls = []
+
+    async def rename(model: Identity):
+        calls.append(model.name)
+        if len(calls) == 1:
+            # Simulate a concurrent update between loading and saving
+            await Identity.get_collection().update(
+                {"_key": model.key_, "name": "Janet"}
+            )
+        model.name += " Doe"
+
+    updated = await Identity.update_with_retry(identity.key_, rename)
+    assert calls == ["Jane", "Janet"]
+    assert updated.name == "Janet Doe"
+    assert (await Identity.load(identity.key_)).name == "Janet Doe"
+
+    async def conflict(model: Identity):
+        await Identity.get_collection().update({"_key": model.key_, "name": "Jim"})
+
+    with pytest.raises(RevisionConflictError):
+        await Identity.update_with_retry(identity.key_, conflict, max_attempts=2)
+
+
+@pytest.mark.asyncio
+async def test_delete_many(identity_collection):
+    identities = [Identity(name=f"Person {i}") for i in range(5)]
+    await Identity.save_many(identities)
+
+    errors = await Identity.delete_many(
+        [identities[0], identities[1].key_, "missing"], batch_size=2
+    )
+    assert errors[:2] == [None, None]
+    assert isinstance(errors[2], ModelNotFoundError)
+
+    errors = await Identity.delete_many([identities[0]], ignore_missing=True)
+    assert errors == [None]
+
+    remaining = await (await Identity.find()).to_list()
+    assert {i.key_ for i in remaining} == {i.key_ for i in identities[2:]}
+
+
+@pytest.mark.asyncio
+async def test_delete_where(identity_collection):
+    identities = [Identity(name=name) for name in ["a", "b", "c", "d"]]
+    await Identity.save_many(identities)
+
+    assert await Identity.delete_where({"name": {"<": "c"}}) == 2
+    assert await Identity.delete_where({"name": "x"}) == 0
+
+    remaining = await (await Identity.find(sort=[("name", ASCENDING)])).to_list()
+    assert [i.name for i in remaining] == ["c", "d"]
+
+    assert await Identity.delete_where() == 2
+
+
 @pytest.mark.asyncio
 async def test_reload(identity_collection):
     identity = Identity(name="Jane Doe")
@@ -96,6 +276,42 @@ async def test_reload(identity_collection):
     assert loaded_identity.name == "Jane Austen"
 
 
+@pytest.mark.asyncio
+async def test_partial_updates(partial_identity_collection):
+    identity = PartialIdentity(name="Jane Doe")
+    await identity.save()
+    assert identity.get_changed_fields() == set()
+
+    # Nothing changed, so nothing is sent to the database
+    rev = identity.rev_
+    await identity.save()
+    assert identity.rev_ == rev
+
+    identity.tags.append("author")
+    assert identity.get_changed_fields() == {"tags"}
+    await identity.save()
+    assert identity.rev_ != rev
+    assert identity.get_changed_fields() == set()
+
+    # Fields not defined in the model are kept when updating
+    await PartialIdentity.get_collection().update(
+        {"_key": identity.key_, "extra": "foo"}
+    )
+    loaded_identity = await PartialIdentity.load(identity.key_)
+    loaded_identity.name = "Jane Austen"
+    await loaded_identity.save()
+
+    document = await PartialIdentity.get_collection().get(identity.key_)
+    assert document["name"] == "Jane Austen"
+    assert document["tags"] == ["author"]
+    assert document["extra"] == "foo"
+
+    # A stale revision is rejected
+    identity.name = "Jane Eyre"
+    with pytest.raises(RevisionConflictError):
+        await identity.save()
+
+
 @pytest.mark.asyncio
 async def test_locking(identity_collection):
     identity = Identity(name="James Doe")
@@ -163,6 +379,20 @@ async def test_find(identity_collection):
         assert len(cursor) == 2
 
 
+@pytest.mark.asyncio
+async def test_find_query_cache(identity_collection, identity_alice, identity_bob):
+    Identity.clear_query_cache()
+
+    alice = await Identity.find_one({"name": "Alice"})
+    bob = await Identity.find_one({"name": "Bob"})
+    assert alice.key_ == identity_alice.key_
+    assert bob.key_ == identity_bob.key_
+
+    cache_info = Identity.get_query_cache_info()
+    assert cache_info.misses == 1
+    assert cache_info.hits == 1
+
+
 @pytest.mark.asyncio
 async def test_find_with_comparisons(identity_collection):
     i_a = Identity(name="a")
@@ -244,6 +474,50 @@ async def test_find_one(identity_collection, bad_str: str):
         await Identity.find_one({bad_str: "John Doe"})
 
 
+@pytest.mark.asyncio
+async def test_find_with_fields(extended_identity_collection):
+    identity = ExtendedIdentity(name="John Doe", extra="foo", sub=SubModel(text="bar"))
+    await identity.save()
+
+    found = await ExtendedIdentity.find_one({"name": "John Doe"}, fields=["extra"])
+    assert found.key_ == identity.key_
+    assert found.rev_ == identity.rev_
+    assert found.extra == "foo"
+    assert found.sub is None
+    assert found.__fields_set__ == {"key_", "rev_", "extra"}
+
+
+@pytest.mark.asyncio
+async def test_partial_update_with_fields(partial_identity_collection):
+    identity = PartialIdentity(name="John Doe", tags=["author"])
+    await identity.save()
+
+    found = await PartialIdentity.find_one({"name": "John Doe"}, fields=["name"])
+    found.name = "Jane Doe"
+    await found.save()
+
+    # Fields that were not loaded are not overwritten
+    await identity.reload()
+    assert identity.name == "Jane Doe"
+    assert identity.tags == ["author"]
+
+
+@pytest.mark.asyncio
+async def test_partial_update_missing_field(partial_identity_collection):
+    # A document stored without a field of the model, e.g. one added later
+    result = await PartialIdentity.get_collection().insert({"name": "John Doe"})
+    identity = await PartialIdentity.load(result["_key"])
+    assert identity.tags == []
+    assert identity.get_changed_fields() == set()
+
+    # Changing the default in place is noticed and saved
+    identity.tags.append("author")
+    assert identity.get_changed_fields() == {"tags"}
+    await identity.save()
+    await identity.reload()
+    assert identity.tags == ["author"]
+
+
 @pytest.mark.asyncio
 async def test_find_one_multiple_matches(identity_collection):
     i = Identity(name="John Doe")
@@ -354,6 +628,171 @@ async def test_find_one_edge_model(
     )
 
 
+@pytest.mark.asyncio
+async def test_find_resolve_edge_model(
+    identity_collection,
+    link_collection,
+    identity_alice: Identity,
+    identity_bob: Identity,
+):
+    await Link(_from=identity_alice, _to=identity_bob, type="Knows").save()
+    await Link(_from=identity_alice, _to=identity_alice, type="Is").save()
+
+    links = await (
+        await Link.find(resolve=("from_", "to_"), sort=[("type", "DESC")])
+    ).to_list()
+    assert isinstance(links[0].from_, Identity)
+    assert links[0].from_.name == "Alice"
+    assert links[0].to_.name == "Bob"
+    # The same vertex is only built once
+    assert links[0].from_ is links[1].from_
+    assert links[1].to_ is links[1].from_
+    assert links[0].get_arangodb_data()["_from"] == identity_alice.id_
+
+    link = await Link.find_one({"type": "Knows"}, resolve={"to_": Identity})
+    assert link.to_ == identity_bob
+    assert link.from_ == identity_alice.id_
+
+    with pytest.raises(ValueError):
+        await Identity.find(resolve=["from_"])
+
+
+@pytest.mark.asyncio
+async def test_find_filter_operators(extended_identity_collection):
+    for name, extra in [("Alice", "a"), ("Bob", None), ("Cecil", "c")]:
+        await ExtendedIdentity(name=name, extra=extra).save()
+
+    async def find_names(filters):
+        found = await (
+            await ExtendedIdentity.find(filters, sort=[("name", ASCENDING)])
+        ).to_list()
+        return [identity.name for identity in found]
+
+    assert await find_names({"name": {"in": ["Alice", "Bob"]}}) == ["Alice", "Bob"]
+    assert await find_names({"name": {"not in": ["Alice", "Bob"]}}) == ["Cecil"]
+    assert await find_names({"name": {"like": "%e%"}}) == ["Alice", "Cecil"]
+    assert await find_names({"extra": {"exists": True}}) == ["Alice", "Cecil"]
+    assert await find_names({"extra": {"exists": False}}) == ["Bob"]
+    assert await find_names({"name": {"between": ("B", "Bz")}}) == ["Bob"]
+    assert await find_names(
+        {"$or": [{"name": "Alice"}, {"extra": "c", "name": {"!=": "Alice"}}]}
+    ) == ["Alice", "Cecil"]
+    assert await find_names({"$and": [{"name": {"!=": "Alice"}}, {"extra": "c"}]}) == [
+        "Cecil"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_explain(identity_collection, identity_alice, identity_bob):
+    plan = await Identity.explain_find({"_key": identity_alice.key_})
+    assert plan.collection_scans == []
+    assert [index["type"] for index in plan.indexes] == ["primary"]
+
+    plan = await Identity.explain_find({"name": "Alice"}, sort=[("name", ASCENDING)])
+    assert plan.collection_scans == [Identity.get_collection_name()]
+    assert plan.estimated_cost > 0
+
+
+@pytest.mark.asyncio
+async def test_find_full_scan_threshold(
+    identity_collection, identity_alice, identity_bob
+):
+    CONF.full_scan_threshold = 1
+    CONF.full_scan_action = "raise"
+    try:
+        with pytest.raises(FullCollectionScanError):
+            await Identity.find({"name": "Alice"})
+
+        # Queries using an index are fine
+        cursor = await Identity.find({"_key": identity_alice.key_})
+        assert len(await cursor.to_list()) == 1
+
+        CONF.full_scan_threshold = 2
+        await Identity.find({"name": "Alice"})
+    finally:
+        CONF.full_scan_threshold = None
+        CONF.full_scan_action = "warn"
+
+
+def test_field_names():
+    # Fields with common names do not collide with the methods of models
+    class Counter(DocumentModel):
+        count: int = 0
+        exists: bool = True
+        aggregate: str = ""
+        explain: str = ""
+        upsert: bool = False
+
+    assert Counter(count=1).count == 1
+
+
+@pytest.mark.asyncio
+async def test_count_and_exists(identity_collection, identity_alice, identity_bob):
+    assert await Identity.count_documents() == 2
+    assert await Identity.count_documents({"name": "Alice"}) == 1
+    assert await Identity.count_documents({"name": "Cecil"}) == 0
+
+    assert await Identity.exists_where()
+    assert await Identity.exists_where({"name": {"!=": "Alice"}})
+    assert not await Identity.exists_where({"name": "Cecil"})
+
+
+@pytest.mark.asyncio
+async def test_aggregate(extended_identity_collection):
+    for name, extra in [("Alice", "a"), ("Bob", "b"), ("Bob", "c"), ("Cecil", None)]:
+        await ExtendedIdentity(name=name, extra=extra).save()
+
+    rows = await ExtendedIdentity.aggregate_documents(
+        {"name": {"!=": "Cecil"}},
+        group_by=["name"],
+        metrics={
+            "count": ("COUNT", None),
+            "extras": ("SORTED_UNIQUE", "extra"),
+            "last_extra": ("MAX", "extra"),
+        },
+        sort=[("count", DESCENDING)],
+    )
+    assert [row.dict() for row in rows] == [
+        {"name": "Bob", "count": 2, "extras": ["b", "c"], "last_extra": "c"},
+        {"name": "Alice", "count": 1, "extras": ["a"], "last_extra": "a"},
+    ]
+
+    (total,) = await ExtendedIdentity.aggregate_documents(
+        metrics={"names": ("COUNT_DISTINCT", "name")}
+    )
+    assert total.names == 3
+
+    assert await ExtendedIdentity.distinct("name") == ["Alice", "Bob", "Cecil"]
+
+
+@pytest.mark.asyncio
+async def test_find_page(identity_collection):
+    for name in ["Alice", "Bob", "Bob", "Cecil", "David"]:
+        await Identity(name=name).save()
+
+    sort = [("name", DESCENDING)]
+    names = []
+    after = None
+    while True:
+        page = await Identity.find_page(sort=sort, after=after, limit=2)
+        assert len(page) <= 2
+        names.extend(identity.name for identity in page)
+        if not page.has_more:
+            break
+        after = page.next_token
+
+    assert names == ["David", "Cecil", "Bob", "Bob", "Alice"]
+
+    page = await Identity.find_page({"name": "Bob"}, limit=1, fields=["name"])
+    assert page[0].name == "Bob"
+    page = await Identity.find_page({"name": "Bob"}, after=page.next_token)
+    assert len(page) == 1
+    assert not page.has_more
+
+    with pytest.raises(ValueError):
+        await Identity.find_page(sort=[("name", ASCENDING)], after=after)
+
+
 @pytest.mark.parametrize(
     "sort,expected",
     [
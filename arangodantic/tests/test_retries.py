@@ -0,0 +1,141 @@
+import pytest
+from aioarangodb.exceptions import (
+    DocumentInsertError,
+    DocumentReplaceError,
+    DocumentRevisionError,
+)
+from aioarangodb.response import Response
+
+from arangodantic import CONF, RetryPolicy
+from arangodantic.arangdb_error_codes import (
+    ERROR_ARANGO_CONFLICT,
+    ERROR_ARANGO_UNIQUE_CONSTRAINT_VIOLATED,
+    ERROR_CLUSTER_TIMEOUT,
+)
+from arangodantic.tests.conftest import Identity
+
+
+def make_error(error_class, status_code: int, error_code: int):
+    resp = Response("put", "http://localhost", {}, status_code, "", "")
+    resp.error_code = error_code
+    resp.error_message = "error"
+    return error_class(resp, None)
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.3, jitter=False)
+    assert [policy.get_delay(attempt) for attempt in [1, 2, 3]] == [0.1, 0.2, 0.3]
+
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.3)
+    assert all(0 <= policy.get_delay(3) <= 0.3 for _ in range(100))
+
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+def test_retry_policy_is_retryable():
+    policy = RetryPolicy()
+    assert policy.is_retryable(
+        make_error(DocumentReplaceError, 409, ERROR_ARANGO_CONFLICT)
+    )
+    assert policy.is_retryable(
+        make_error(DocumentReplaceError, 500, ERROR_CLUSTER_TIMEOUT)
+    )
+    # Failed revision checks fail in the same way when retried
+    assert not policy.is_retryable(
+        make_error(DocumentRevisionError, 412, ERROR_ARANGO_CONFLICT)
+    )
+    assert not policy.is_retryable(
+        make_error(DocumentReplaceError, 409, ERROR_ARANGO_UNIQUE_CONSTRAINT_VIOLATED)
+    )
+    assert not policy.is_retryable({"_key": "a"})
+
+    # Operations that are not idempotent are not retried after timeouts, as they
+    # might have been applied
+    timeout = make_error(DocumentInsertError, 500, ERROR_CLUSTER_TIMEOUT)
+    assert not policy.is_retryable(timeout, idempotent=False)
+    assert policy.is_retryable(
+        make_error(DocumentInsertError, 409, ERROR_ARANGO_CONFLICT), idempotent=False
+    )
+    assert RetryPolicy(retry_non_idempotent=True).is_retryable(
+        timeout, idempotent=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_retry_policy_call():
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        if len(calls) < 3:
+            raise make_error(DocumentReplaceError, 409, ERROR_ARANGO_CONFLICT)
+        return "done"
+
+    assert await policy.call("Identity", "save", fn) == "done"
+    assert policy.retries[("Identity", "save")] == 2
+
+    calls.clear()
+    policy = RetryPolicy(max_attempts=2, base_delay=0)
+    with pytest.raises(DocumentReplaceError):
+        await policy.call("Identity", "save", fn)
+    assert len(calls) == 2
+    assert policy.exhausted[("Identity", "save")] == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_policy_call_bulk():
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    requests = []
+
+    async def fn(items):
+        requests.append(items)
+        return [
+            make_error(DocumentReplaceError, 409, ERROR_ARANGO_CONFLICT)
+            if item == "b" and len(requests) == 1
+            else item.upper()
+            for item in items
+        ]
+
+    assert await policy.call_bulk("Identity", "save_many", fn, ["a", "b", "c"]) == [
+        "A",
+        "B",
+        "C",
+    ]
+    # Only the failed items are sent again
+    assert requests == [["a", "b", "c"], ["b"]]
+    assert policy.retries[("Identity", "save_many")] == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_policy_call_bulk_check_rev():
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    requests = []
+
+    async def fn(items):
+        requests.append(items)
+        # Errors of items get the status code of the whole request
+        return [
+            make_error(DocumentRevisionError, 202, ERROR_ARANGO_CONFLICT)
+            for item in items
+        ]
+
+    results = await policy.call_bulk(
+        "Identity", "save_many", fn, ["a", "b"], check_rev=True
+    )
+    assert all(isinstance(result, DocumentRevisionError) for result in results)
+    # Failed revision checks are not sent again, nor counted
+    assert requests == [["a", "b"]]
+    assert not policy.retries
+    assert not policy.exhausted
+
+
+def test_get_retry_policy():
+    policy = RetryPolicy()
+    CONF.retry_policy = policy
+    try:
+        assert Identity.get_retry_policy() is policy
+    finally:
+        CONF.retry_policy = None
+    assert Identity.get_retry_policy() is None
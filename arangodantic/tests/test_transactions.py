@@ -0,0 +1,111 @@
+import pytest
+from aioarangodb.exceptions import TransactionAbortError
+from aioarangodb.response import Response
+
+from arangodantic import (
+    ModelNotFoundError,
+    UniqueConstraintError,
+    get_transaction,
+    transaction,
+)
+from arangodantic.tests.conftest import Identity
+
+
+@pytest.mark.asyncio
+async def test_transaction(identity_collection, identity_alice):
+    assert get_transaction() is None
+
+    async with transaction(write=[Identity]) as tx:
+        assert get_transaction() is tx
+        assert Identity.get_db() is tx.db
+
+        cecil = Identity(name="Cecil")
+        await cecil.save()
+        identity_alice.name = "Alice B."
+        await identity_alice.save()
+
+        # Changes are visible within the transaction only
+        assert (await Identity.load(cecil.key_)).name == "Cecil"
+        assert await Identity.find_one({"name": "Cecil"}) is not None
+
+    assert get_transaction() is None
+    assert (await Identity.load(cecil.key_)).name == "Cecil"
+    assert (await Identity.load(identity_alice.key_)).name == "Alice B."
+
+
+@pytest.mark.asyncio
+async def test_transaction_abort(identity_collection, identity_alice):
+    with pytest.raises(RuntimeError):
+        async with transaction(write=[Identity.get_collection_name()]):
+            dave = Identity(name="Dave")
+            await dave.save()
+            await identity_alice.delete()
+            raise RuntimeError("Abort")
+
+    assert get_transaction() is None
+    with pytest.raises(ModelNotFoundError):
+        await Identity.load(dave.key_)
+    assert await Identity.load(identity_alice.key_)
+
+
+@pytest.mark.asyncio
+async def test_transaction_unit_of_work(identity_collection, identity_alice):
+    async with transaction(write=[Identity], unit_of_work=True) as tx:
+        identities = [Identity(name=f"Person {i}") for i in range(3)]
+        for identity in identities:
+            await identity.save()
+        await identity_alice.delete()
+
+        # Keys are known before the models are saved
+        assert all(identity.key_ for identity in identities)
+        assert not any(identity.rev_ for identity in identities)
+        assert len(tx.pending) == 4
+
+        # Models saved and deleted before the commit are never sent
+        dave = Identity(name="Dave")
+        await dave.save()
+        await dave.delete()
+        assert len(tx.pending) == 4
+
+    assert all(identity.rev_ for identity in identities)
+    assert await Identity.find_one({"name": "Person 0"}) is not None
+    with pytest.raises(ModelNotFoundError):
+        await Identity.load(identity_alice.key_)
+
+
+@pytest.mark.asyncio
+async def test_transaction_unit_of_work_error(identity_collection, identity_alice):
+    with pytest.raises(UniqueConstraintError):
+        async with transaction(write=[Identity], unit_of_work=True):
+            await Identity(name="Eve").save()
+            # Another document with the same key
+            await Identity(_key=identity_alice.key_).save()
+
+    assert not await Identity.exists_where({"name": "Eve"})
+
+
+class ExpiredTransactionDatabase:
+    """Stand-in for a database whose transaction expired on the server."""
+
+    transaction_id = "1"
+
+    async def abort_transaction(self):
+        resp = Response("delete", "http://localhost", {}, 404, "", "")
+        resp.error_code = 1655
+        resp.error_message = "transaction not found"
+        raise TransactionAbortError(resp, None)
+
+
+class ExpiringDatabase:
+    async def begin_transaction(self, **kwargs):
+        return ExpiredTransactionDatabase()
+
+
+@pytest.mark.asyncio
+async def test_transaction_abort_error():
+    # The error of the body is raised, not the failure to abort
+    with pytest.raises(RuntimeError):
+        async with transaction(db=ExpiringDatabase()):
+            raise RuntimeError("Abort")
+
+    assert get_transaction() is None
@@ -0,0 +1,232 @@
+import pytest
+
+from arangodantic.aggregation import build_aggregate, normalize_group_by
+from arangodantic.pagination import decode_page_token, encode_page_token
+from arangodantic.utils import (
+    build_filter_values,
+    build_filters,
+    build_keyset_filter,
+    chunks,
+    get_field_value,
+    get_filters_shape,
+    get_placeholder_filters,
+)
+
+
+def test_build_filters():
+    filter_list, bind_vars = build_filters(
+        {"owner.name": "John", "founded": {">=": 2000}}, "i"
+    )
+    assert filter_list == [
+        "i.@field_0_0.@field_0_1 == @field_0_eq",
+        "i.@field_1_0 >= @field_1_gte",
+    ]
+    assert bind_vars == {
+        "field_0_0": "owner",
+        "field_0_1": "name",
+        "field_0_eq": "John",
+        "field_1_0": "founded",
+        "field_1_gte": 2000,
+    }
+
+
+def test_build_filters_operators():
+    filter_list, bind_vars = build_filters(
+        {
+            "name": {"in": ["John", "Jane"], "like": "J%"},
+            "tags": {"any ==": "admin"},
+            "age": {"between": (18, 65), "not in": [30]},
+            "email": {"exists": True},
+            "phone": {"exists": False},
+        },
+        "i",
+    )
+    assert filter_list == [
+        "i.@field_0_0 IN @field_0_in",
+        "i.@field_0_0 LIKE @field_0_like",
+        "@field_1_any_eq IN i.@field_1_0[*]",
+        "i.@field_2_0 >= @field_2_between_min AND i.@field_2_0 <= @field_2_between_max",
+        "i.@field_2_0 NOT IN @field_2_not_in",
+        "i.@field_3_0 != null",
+        "i.@field_4_0 == null",
+    ]
+    assert bind_vars == {
+        "field_0_0": "name",
+        "field_0_in": ["John", "Jane"],
+        "field_0_like": "J%",
+        "field_1_0": "tags",
+        "field_1_any_eq": "admin",
+        "field_2_0": "age",
+        "field_2_between_min": 18,
+        "field_2_between_max": 65,
+        "field_2_not_in": [30],
+        "field_3_0": "email",
+        "field_4_0": "phone",
+    }
+
+    with pytest.raises(NotImplementedError):
+        build_filters({"name": {"=~": "J.*"}}, "i")
+
+
+def test_build_filters_groups():
+    filters = {
+        "active": True,
+        "$or": [{"name": "John", "age": {">": 18}}, {"admin": True}],
+    }
+    filter_list, bind_vars = build_filters(filters, "i")
+    assert filter_list == [
+        "i.@field_0_0 == @field_0_eq",
+        "((i.@field_1_0_0_0 == @field_1_0_0_eq AND i.@field_1_0_1_0 > @field_1_0_1_gt)"
+        " OR i.@field_1_1_0_0 == @field_1_1_0_eq)",
+    ]
+    assert bind_vars == {
+        "field_0_0": "active",
+        "field_0_eq": True,
+        "field_1_0_0_0": "name",
+        "field_1_0_0_eq": "John",
+        "field_1_0_1_0": "age",
+        "field_1_0_1_gt": 18,
+        "field_1_1_0_0": "admin",
+        "field_1_1_0_eq": True,
+    }
+
+    # Empty filters in a group match all documents
+    assert build_filters({"$or": [{}]}, "i") == (["(true)"], {})
+    assert build_filters({"$or": [{}, {"a": 1}]}, "i") == (
+        ["(true OR i.@field_0_1_0_0 == @field_0_1_0_eq)"],
+        {"field_0_1_0_0": "a", "field_0_1_0_eq": 1},
+    )
+
+    with pytest.raises(ValueError):
+        build_filters({"$and": []}, "i")
+
+
+def test_build_filters_values_name():
+    filters = {"name": "John", "$or": [{"age": {"between": (18, 65)}}]}
+    filter_list, bind_vars = build_filters(filters, "i", values_name="row")
+    assert filter_list == [
+        "i.@field_0_0 == row.field_0_eq",
+        "(i.@field_1_0_0_0 >= row.field_1_0_0_between_min "
+        "AND i.@field_1_0_0_0 <= row.field_1_0_0_between_max)",
+    ]
+    # Only the fields are given as bind_vars
+    assert bind_vars == {"field_0_0": "name", "field_1_0_0_0": "age"}
+    assert set(build_filter_values(filters)) == {
+        "field_0_eq",
+        "field_1_0_0_between_min",
+        "field_1_0_0_between_max",
+    }
+
+
+def test_get_placeholder_filters():
+    filters = {
+        "name": {"in": ["John"]},
+        "age": {"between": (18, 65)},
+        "$or": [{"email": {"exists": False}}, {"tags": {"any ==": "admin"}}],
+    }
+    shape = get_filters_shape(filters)
+    assert shape == (
+        ("name", ("in",)),
+        ("age", ("between",)),
+        ("$or", ((("email", ("not exists",)),), (("tags", ("any ==",)),))),
+    )
+
+    # Filters of the same shape build the same AQL
+    filter_list, bind_vars = build_filters(filters, "i")
+    placeholder_list, _ = build_filters(get_placeholder_filters(shape), "i")
+    assert placeholder_list == filter_list
+
+    values = build_filter_values(filters)
+    assert all(bind_vars[name] == value for name, value in values.items())
+
+
+def test_build_filter_values():
+    filters = {"owner.name": "John", "founded": {">=": 2000, "<": 2010}}
+    _, bind_vars = build_filters(filters, "i")
+
+    values = build_filter_values(filters)
+    assert values == {"field_0_eq": "John", "field_1_gte": 2000, "field_1_lt": 2010}
+    assert all(bind_vars[name] == value for name, value in values.items())
+
+
+def test_get_filters_shape():
+    assert get_filters_shape(None) == ()
+    assert get_filters_shape({"name": "a", "age": {">": 1, "<": 5}}) == (
+        ("name", ("==",)),
+        ("age", (">", "<")),
+    )
+    assert get_filters_shape({"name": "a"}) == get_filters_shape({"name": "b"})
+    assert get_filters_shape({"name": "a"}) != get_filters_shape({"name": {"!=": "a"}})
+
+
+def test_chunks():
+    assert list(chunks([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+    assert list(chunks([], 2)) == []
+
+
+def test_build_keyset_filter():
+    expression, bind_vars = build_keyset_filter(
+        "i", [("name", "ASC"), ("age", "DESC"), ("_key", "ASC")]
+    )
+    assert expression == (
+        "i.@sort_0_0 >= @after_0 AND (i.@sort_0_0 > @after_0 OR "
+        "(i.@sort_0_0 == @after_0 AND (i.@sort_1_0 < @after_1 OR "
+        "(i.@sort_1_0 == @after_1 AND i.@sort_2_0 > @after_2))))"
+    )
+    assert bind_vars == {"sort_0_0": "name", "sort_1_0": "age", "sort_2_0": "_key"}
+
+    assert build_keyset_filter("i", [("_key", "DESC")]) == (
+        "i.@sort_0_0 < @after_0",
+        {"sort_0_0": "_key"},
+    )
+
+
+def test_get_field_value():
+    document = {"owner": {"name": "John"}, "founded": 2000}
+    assert get_field_value(document, "owner.name") == "John"
+    assert get_field_value(document, "founded") == 2000
+    assert get_field_value(document, "founded.year") is None
+    assert get_field_value(document, "missing") is None
+
+
+def test_page_token():
+    sort = [("name", "ASC"), ("_key", "ASC")]
+    token = encode_page_token(sort, ["John", "123"])
+    assert decode_page_token(token, sort) == ["John", "123"]
+
+    with pytest.raises(ValueError):
+        decode_page_token(token, [("name", "DESC"), ("_key", "ASC")])
+    with pytest.raises(ValueError):
+        decode_page_token("invalid", sort)
+
+
+def test_build_aggregate():
+    group_by = normalize_group_by(["owner.name"])
+    assert group_by == (("owner_name", "owner.name"),)
+
+    collect_str, sort_str, return_str, bind_vars = build_aggregate(
+        "i",
+        group_by=group_by,
+        metrics=(("total", "SUM", "amount"), ("count", "COUNT", None)),
+        sort=[("total", "DESC")],
+    )
+    assert collect_str == (
+        "COLLECT group_0 = i.@group_0_0.@group_0_1 "
+        "AGGREGATE metric_0 = SUM(i.@metric_0_0), metric_1 = COUNT(1)"
+    )
+    assert sort_str == "SORT metric_0 DESC"
+    assert return_str == (
+        "RETURN {[@group_0_name]: group_0, [@metric_0_name]: metric_0, "
+        "[@metric_1_name]: metric_1}"
+    )
+    assert bind_vars == {
+        "group_0_0": "owner",
+        "group_0_1": "name",
+        "group_0_name": "owner_name",
+        "metric_0_0": "amount",
+        "metric_0_name": "total",
+        "metric_1_name": "count",
+    }
+
+    with pytest.raises(NotImplementedError):
+        build_aggregate("i", group_by=(), metrics=(("x", "REMOVE", "amount"),))
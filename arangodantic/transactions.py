@@ -0,0 +1,251 @@
+import logging
+from contextvars import ContextVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+from aioarangodb.database import StandardDatabase, TransactionDatabase
+
+from arangodantic.configurations import CONF
+from arangodantic.identity_map import get_identity_map
+
+if TYPE_CHECKING:  # pragma: no cover
+    from arangodantic.models import Model
+
+try:
+    from contextlib import asynccontextmanager  # type: ignore
+except ImportError:
+    from arangodantic.asynccontextmanager import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+_transaction: ContextVar[Optional["Transaction"]] = ContextVar(
+    "arangodantic_transaction", default=None
+)
+
+CollectionsTypes = Iterable[Union[Type["Model"], str]]
+
+
+class Transaction:
+    """
+    A stream transaction of ArangoDB, see "transaction". All requests made by models
+    within the transaction are part of it.
+
+    In unit-of-work mode, "save" and "delete" of models only record the change, and
+    the changes are sent with the multi-document endpoints of ArangoDB, grouped per
+    model, when the transaction is committed or flushed.
+    """
+
+    def __init__(self, db: TransactionDatabase, *, unit_of_work: bool = False):
+        """
+        :param db: The database of the transaction.
+        :param unit_of_work: Record the saves and deletes of models to send them when
+        the transaction is committed or flushed.
+        """
+        self.db = db
+        self.unit_of_work = unit_of_work
+        # Changes that are not sent yet by the id() of the model, as a tuple of the
+        # action ("save" or "delete"), the model and the options of the action
+        self.pending: Dict[int, Tuple[str, "Model", Dict[str, Any]]] = {}
+        # Documents written in the transaction, as tuples of the model class and key
+        self.written: Set[Tuple[Type["Model"], str]] = set()
+
+    @property
+    def transaction_id(self) -> str:
+        return str(self.db.transaction_id)
+
+    def add_save(self, model: "Model", **options) -> None:
+        """
+        Record that a model is to be saved in unit-of-work mode.
+
+        :param model: The model.
+        :param options: The options of "save".
+        """
+        self.pending[id(model)] = ("save", model, options)
+
+    def add_delete(self, model: "Model", **options) -> None:
+        """
+        Record that a model is to be deleted in unit-of-work mode.
+
+        :param model: The model.
+        :param options: The options of "delete".
+        """
+        pending = self.pending.get(id(model))
+        if pending is not None and pending[0] == "save" and not model.rev_:
+            # The model was never saved, so there is nothing to delete
+            del self.pending[id(model)]
+            return
+        self.pending[id(model)] = ("delete", model, options)
+
+    def add_written(self, model_cls: Type["Model"], key: Optional[str]) -> None:
+        """
+        Record that a document was written in the transaction, so it can be removed
+        from the identity map and cache when the transaction ends.
+
+        :param model_cls: The model class of the document.
+        :param key: The "_key" of the document.
+        """
+        if key is not None:
+            self.written.add((model_cls, key))
+
+    async def flush(self) -> None:
+        """
+        Send the recorded changes, with one multi-document request per model class,
+        action and options. The changes are not visible to others before the
+        transaction is committed.
+
+        :raise ArangodanticError: The error of the first change that failed, e.g. an
+        UniqueConstraintError.
+        """
+        # Groups of models as lists of the action, model class, options and models
+        groups: List[Tuple[str, Type["Model"], Dict[str, Any], List["Model"]]] = []
+        for action, model, options in self.pending.values():
+            for group_action, group_cls, group_options, models in groups:
+                if (
+                    group_action == action
+                    and group_cls is model.__class__
+                    and group_options == options
+                ):
+                    models.append(model)
+                    break
+            else:
+                groups.append((action, model.__class__, options, [model]))
+        self.pending.clear()
+
+        # Saves first, so models that were saved and deleted are deleted in the end
+        groups.sort(key=lambda group: group[0] == "delete")
+        for action, model_cls, options, models in groups:
+            if action == "save":
+                errors = await model_cls.save_many(models, **options)
+            else:
+                errors = await model_cls.delete_many(models, **options)
+            for error in errors:
+                if error is not None:
+                    raise error
+
+    async def _commit(self) -> None:
+        try:
+            await self.db.commit_transaction()
+        except BaseException:
+            await self._forget_written(identity_map=True)
+            raise
+        await self._forget_written(identity_map=False)
+
+    async def _abort(self) -> None:
+        """
+        Abort the transaction after an error. A failure to abort, e.g. because the
+        transaction already expired on the server, is only logged so it does not
+        replace the original error.
+        """
+        self.pending.clear()
+        try:
+            await self.db.abort_transaction()
+        except Exception as ex:
+            logger.warning(
+                "Failed to abort transaction %s: %s", self.transaction_id, ex
+            )
+        finally:
+            await self._forget_written(identity_map=True)
+
+    async def _forget_written(self, identity_map: bool) -> None:
+        """
+        Remove the written documents from the caches, which could have been filled
+        with the old documents by others while the transaction was running, and from
+        the identity map after an abort.
+        """
+        current_identity_map = get_identity_map()
+        for model_cls, key in self.written:
+            if identity_map and current_identity_map is not None:
+                current_identity_map.remove(model_cls, key)
+            cache = model_cls.get_cache()
+            if cache is not None:
+                await cache.delete(f"{model_cls.get_collection_name()}/{key}")
+        self.written.clear()
+
+
+def get_transaction() -> Optional[Transaction]:
+    """
+    Get the transaction of the current scope, if any.
+    """
+    return _transaction.get()
+
+
+def _get_collection_names(collections: CollectionsTypes) -> List[str]:
+    return [
+        collection if isinstance(collection, str) else collection.get_collection_name()
+        for collection in collections
+    ]
+
+
+@asynccontextmanager
+async def transaction(
+    read: CollectionsTypes = (),
+    write: CollectionsTypes = (),
+    exclusive: CollectionsTypes = (),
+    *,
+    unit_of_work: bool = False,
+    sync: Optional[bool] = None,
+    allow_implicit: Optional[bool] = None,
+    lock_timeout: Optional[int] = None,
+    max_size: Optional[int] = None,
+    db: Optional[StandardDatabase] = None,
+):
+    """
+    Context manager running a stream transaction of ArangoDB. The requests of models
+    and graphs within the scope are made in the transaction, which is committed when
+    the scope exits, or aborted if an exception is raised.
+
+    Requests in a transaction must not be made concurrently, e.g. with
+    "asyncio.gather". The cache of models is not used within a transaction.
+
+    Example:
+        >>> async with transaction(write=[Person, Knows]) as tx:
+        ...     await alice.save()
+        ...     await Knows(_from=alice, _to=bob).save()
+
+    :param read: Models (or collection names) read in the transaction.
+    :param write: Models (or collection names) written in the transaction.
+    :param exclusive: Models (or collection names) written in the transaction with
+    exclusive access.
+    :param unit_of_work: Record the saves and deletes of models and send them with
+    multi-document requests when committing, see "Transaction". "save" then does not
+    give the models their "_rev" until the transaction is committed or flushed.
+    :param sync: Wait until the changes are synchronized to disk when committing.
+    :param allow_implicit: Allow reading from collections that are not declared.
+    :param lock_timeout: Number of seconds to wait for the locks on the collections.
+    :param max_size: Maximum size of the transaction in bytes.
+    :param db: The database, by default the configured database.
+    """
+    if db is None:
+        db = cast(StandardDatabase, CONF.db)
+    tx_db = await db.begin_transaction(
+        read=_get_collection_names(read) or None,
+        write=_get_collection_names(write) or None,
+        exclusive=_get_collection_names(exclusive) or None,
+        sync=sync,
+        allow_implicit=allow_implicit,
+        lock_timeout=lock_timeout,
+        max_size=max_size,
+    )
+    tx = Transaction(tx_db, unit_of_work=unit_of_work)
+    token = _transaction.set(tx)
+    try:
+        try:
+            yield tx
+            await tx.flush()
+        except BaseException:
+            await tx._abort()
+            raise
+        await tx._commit()
+    finally:
+        _transaction.reset(token)
@@ -1,21 +1,74 @@
 import re
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
-from arangodantic.directions import DIRECTIONS
+from arangodantic.directions import ASCENDING, DIRECTIONS
 
 FilterTypes = Optional[Dict[str, Any]]
 SortTypes = Optional[Iterable[Tuple[str, str]]]
 
 ONE_OR_MORE_DOTS_PATTERN = re.compile(r"\.+")
 
+T = TypeVar("T")
+
+# List of supported operators mapped to a-z string representations that can be used
+# safely in the names of bind_vars in AQL
+COMPARISON_OPERATORS = {
+    "<": "lt",
+    "<=": "lte",
+    ">": "gt",
+    ">=": "gte",
+    "!=": "ne",
+    "==": "eq",
+}
+
+# All supported filter operators mapped to the representation used in the names of
+# bind_vars and the AQL expression; {field} is replaced with the field and {value}
+# with the bind_var of the value
+FILTER_OPERATORS = {
+    **{
+        operator: (name, f"{{field}} {operator} {{value}}")
+        for operator, name in COMPARISON_OPERATORS.items()
+    },
+    "in": ("in", "{field} IN {value}"),
+    "not in": ("not_in", "{field} NOT IN {value}"),
+    "like": ("like", "{field} LIKE {value}"),
+    # The array field contains the value
+    "any ==": ("any_eq", "{value} IN {field}[*]"),
+    "exists": ("exists", "{field} != null"),
+    "not exists": ("not_exists", "{field} == null"),
+    # Inclusive range given as a (min, max) tuple
+    "between": ("between", "{field} >= {value}_min AND {field} <= {value}_max"),
+}
+
+# Operators that do not use the value in the AQL expression, only to choose between
+# each other
+EXISTS_OPERATORS = {"exists": "not exists", "not exists": "exists"}
+
+# Groups of filters mapped to the AQL operator used to combine them
+FILTER_GROUPS = {"$or": "OR", "$and": "AND"}
+
+# Values used in place of the actual values when building the AQL for filters of a
+# certain shape, see "get_placeholder_filters"
+FILTER_PLACEHOLDERS = {"between": (None, None), "exists": True, "not exists": True}
+
+FiltersShape = Tuple[Tuple[str, Tuple[Any, ...]], ...]
+
 
 def build_filters(
-    filters: FilterTypes, instance_name: str
-) -> Tuple[List[str], Dict[str, str]]:
+    filters: FilterTypes,
+    instance_name: str,
+    prefix: str = "field",
+    values_name: Optional[str] = None,
+) -> Tuple[List[str], Dict[str, Any]]:
     """
     Turn filters into a list of AQL FILTER statements (using bind_vars) and
     corresponding bind_vars.
 
+    Besides the comparison operators ("<", "<=", ">", ">=", "!=" and "=="), the
+    operators "in", "not in", "like", "any ==" (array contains), "exists" (with True
+    or False) and "between" (with a (min, max) tuple) are supported. Filters can be
+    combined with "$or" and "$and" groups, given as a list of filters.
+
     Example:
     >>> build_filters({"owner.name": "John", "founded": {">=": 2000}}, "i")
     (
@@ -31,58 +84,220 @@ def build_filters(
             'field_1_gte': 2000
         }
     )
+    >>> build_filters({"$or": [{"name": "John"}, {"age": {"in": [1, 2]}}]}, "i")
+    (
+        [
+            '(i.@field_0_0_0_0 == @field_0_0_0_eq '
+            'OR i.@field_0_1_0_0 IN @field_0_1_0_in)'
+        ],
+        {
+            'field_0_0_0_0': 'name',
+            'field_0_0_0_eq': 'John',
+            'field_0_1_0_0': 'age',
+            'field_0_1_0_in': [1, 2]
+        }
+    )
+
+    :param filters: The filters.
+    :param instance_name: The name we're using in the AQL query for the instances
+    we're looping over.
+    :param prefix: Prefix to use for all the generated bind_vars.
+    :param values_name: Name of an AQL variable with the values as attributes, named
+    like the bind_vars of "build_filter_values", to use instead of bind_vars for the
+    values, e.g. when looping over the values of many filters.
     """
-    from arangodantic.models import Model
+    filter_list: List[str] = []
+    bind_vars: Dict[str, Any] = {}
 
-    filter_list = []
-    bind_vars = {}
+    if not filters:
+        return filter_list, bind_vars
+
+    for i, (field, expr) in enumerate(filters.items()):
+        item_prefix = f"{prefix}_{i}"
 
-    # List of supported operators mapped to a-z string representations that can be
-    # used safely in the names of bind_vars in AQL
-    comparison_operators = {
-        "<": "lt",
-        "<=": "lte",
-        ">": "gt",
-        ">=": "gte",
-        "!=": "ne",
-        "==": "eq",
-    }
-
-    if filters:
-        for i, (field, expr) in enumerate(filters.items()):
-            if not isinstance(expr, Dict):
-                # Convert literal value to an explicit {"==": value} expression to
-                # simplify next steps
-                expr = {"==": expr}
-
-            for operator, value in expr.items():
-                if operator not in comparison_operators:
-                    raise NotImplementedError(
-                        f"Support for '{operator}' not implemented"
-                    )
-
-                bind_var_prefix = f"field_{i}"
-
-                # For left side of comparison
-                field_str, field_bind_vars = split_field(field, prefix=bind_var_prefix)
-                bind_vars.update(field_bind_vars)
-
-                # For right side of comparison
-                value_bind_var = f"{bind_var_prefix}_{comparison_operators[operator]}"
-                if isinstance(value, Model):
-                    # Make it possible to compare a field to a model; handy for
-                    # example to match the "_from" or "_to" of an edge to a model.
-                    value = value.id_
-                bind_vars[value_bind_var] = value
-
-                # The actual comparison
-                filter_list.append(
-                    f"{instance_name}.{field_str} {operator} @{value_bind_var}"
+        if field in FILTER_GROUPS:
+            group_list = []
+            for k, group_filters in enumerate(_get_group_filters(field, expr)):
+                sub_list, sub_bind_vars = build_filters(
+                    group_filters,
+                    instance_name,
+                    prefix=f"{item_prefix}_{k}",
+                    values_name=values_name,
                 )
+                bind_vars.update(sub_bind_vars)
+                if not sub_list:
+                    # Empty filters match all documents, like they do outside groups
+                    group_list.append("true")
+                elif len(sub_list) > 1:
+                    group_list.append("(" + " AND ".join(sub_list) + ")")
+                else:
+                    group_list.extend(sub_list)
+            filter_list.append("(" + f" {FILTER_GROUPS[field]} ".join(group_list) + ")")
+            continue
+
+        # For left side of comparison
+        field_str, field_bind_vars = split_field(field, prefix=item_prefix)
+        bind_vars.update(field_bind_vars)
+
+        for operator, value_bind_var, values in _iter_comparisons(item_prefix, expr):
+            # For right side of comparison
+            if values_name is None:
+                bind_vars.update(values)
+                value_str = f"@{value_bind_var}"
+            else:
+                value_str = f"{values_name}.{value_bind_var}"
+
+            # The actual comparison
+            filter_list.append(
+                FILTER_OPERATORS[operator][1].format(
+                    field=f"{instance_name}.{field_str}", value=value_str
+                )
+            )
 
     return filter_list, bind_vars
 
 
+def build_filter_values(filters: FilterTypes, prefix: str = "field") -> Dict[str, Any]:
+    """
+    Get only the bind_vars for the values of the filters, i.e. the bind_vars of
+    "build_filters" that change when the same fields are filtered with other values.
+
+    Example:
+    >>> build_filter_values({"owner.name": "John", "founded": {">=": 2000}})
+    {'field_0_eq': 'John', 'field_1_gte': 2000}
+    """
+    values: Dict[str, Any] = {}
+    if not filters:
+        return values
+
+    for i, (field, expr) in enumerate(filters.items()):
+        item_prefix = f"{prefix}_{i}"
+        if field in FILTER_GROUPS:
+            for k, group_filters in enumerate(_get_group_filters(field, expr)):
+                values.update(
+                    build_filter_values(group_filters, prefix=f"{item_prefix}_{k}")
+                )
+        else:
+            for _, _, comparison_values in _iter_comparisons(item_prefix, expr):
+                values.update(comparison_values)
+    return values
+
+
+def get_filters_shape(filters: FilterTypes) -> FiltersShape:
+    """
+    Get the shape of the filters, i.e. the fields and the operators used on them, but
+    not the values. Filters with the same shape compile to the same AQL.
+
+    Example:
+    >>> get_filters_shape({"owner.name": "John", "founded": {">=": 2000, "<": 2010}})
+    (('owner.name', ('==',)), ('founded', ('>=', '<')))
+    >>> get_filters_shape({"$or": [{"name": "John"}, {"age": {"exists": False}}]})
+    (('$or', ((('name', ('==',)),), (('age', ('not exists',)),))),)
+    """
+    if not filters:
+        return ()
+
+    shape: List[Tuple[str, Tuple[Any, ...]]] = []
+    for field, expr in filters.items():
+        if field in FILTER_GROUPS:
+            shape.append(
+                (
+                    field,
+                    tuple(
+                        get_filters_shape(group_filters)
+                        for group_filters in _get_group_filters(field, expr)
+                    ),
+                )
+            )
+        else:
+            shape.append(
+                (
+                    field,
+                    tuple(operator for operator, _, _ in _iter_comparisons("", expr)),
+                )
+            )
+    return tuple(shape)
+
+
+def get_placeholder_filters(shape: FiltersShape) -> Dict[str, Any]:
+    """
+    Get filters of the given shape, with placeholders in place of the values, that
+    can be used to build the AQL for all filters of the same shape.
+
+    Example:
+    >>> get_placeholder_filters((("name", ("==",)), ("age", ("between",))))
+    {'name': {'==': None}, 'age': {'between': (None, None)}}
+    """
+    filters: Dict[str, Any] = {}
+    for field, operators in shape:
+        if field in FILTER_GROUPS:
+            filters[field] = [get_placeholder_filters(group) for group in operators]
+        else:
+            filters[field] = {
+                operator: FILTER_PLACEHOLDERS.get(operator) for operator in operators
+            }
+    return filters
+
+
+def _get_group_filters(group: str, expr: Any) -> List[Dict[str, Any]]:
+    """
+    Get the filters of a "$or" or "$and" group.
+    """
+    if not isinstance(expr, (list, tuple)) or not expr:
+        raise ValueError(f"'{group}' requires a non-empty list of filters")
+    return list(expr)
+
+
+def _iter_comparisons(
+    prefix: str, expr: Any
+) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Iterate over the comparisons in the filter expression of a field.
+
+    :param prefix: The prefix of the bind_vars of the field.
+    :param expr: The expression; either a value to match or a dictionary of
+    operators and values.
+    :return: Iterator of tuples with the operator, the name of the bind_var for the
+    value and the bind_vars of the value(s).
+    """
+    from arangodantic.models import Model
+
+    if not isinstance(expr, Dict):
+        # Convert literal value to an explicit {"==": value} expression to
+        # simplify next steps
+        expr = {"==": expr}
+
+    for operator, value in expr.items():
+        operator = operator.lower()
+        if operator not in FILTER_OPERATORS:
+            raise NotImplementedError(f"Support for '{operator}' not implemented")
+
+        if operator in EXISTS_OPERATORS and not value:
+            operator = EXISTS_OPERATORS[operator]
+
+        value_bind_var = f"{prefix}_{FILTER_OPERATORS[operator][0]}"
+
+        if isinstance(value, Model):
+            # Make it possible to compare a field to a model; handy for
+            # example to match the "_from" or "_to" of an edge to a model.
+            value = value.id_
+        elif operator in {"in", "not in"} and value is not None:
+            value = [v.id_ if isinstance(v, Model) else v for v in value]
+
+        if operator in EXISTS_OPERATORS:
+            values = {}
+        elif operator == "between":
+            min_value, max_value = value
+            values = {
+                f"{value_bind_var}_min": min_value,
+                f"{value_bind_var}_max": max_value,
+            }
+        else:
+            values = {value_bind_var: value}
+
+        yield operator, value_bind_var, values
+
+
 def split_field(name: str, prefix: str) -> Tuple[str, Dict[str, str]]:
     """
     Split the name of a field at each dot into a new bind_var.
@@ -121,6 +336,26 @@ def split_field(name: str, prefix: str) -> Tuple[str, Dict[str, str]]:
     return new_str, bind_vars
 
 
+def get_field_value(document: Dict[str, Any], name: str) -> Any:
+    """
+    Get the value of a (nested) field of a document, like "i.owner.name" in AQL.
+
+    Example:
+        >>> get_field_value({"owner": {"name": "John"}}, "owner.name")
+        'John'
+
+    :param document: The document.
+    :param name: The name of the field, with dots separating the nested fields.
+    :return: The value, or None if the field does not exist.
+    """
+    value: Any = document
+    for part in ONE_OR_MORE_DOTS_PATTERN.sub(".", name).strip(".").split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
 def remove_whitespace_lines(text: str) -> str:
     """
     Remove lines that only contains whitespace from a string.
@@ -157,3 +392,73 @@ def build_sort(
         sort_str += "SORT " + ", ".join(sort_lst)
 
     return sort_str, bind_vars
+
+
+def build_keyset_filter(
+    instance_name: str, sort: Iterable[Tuple[str, str]]
+) -> Tuple[str, Dict[str, str]]:
+    """
+    Build an AQL expression that matches the documents after a given position in the
+    sort order, for keyset pagination. The sort should end with a unique field (e.g.
+    "_key") and the values at the position are passed in the bind_vars "after_0",
+    "after_1" etc. The expression is a tuple comparison written out in terms of the
+    individual fields, starting with a range on the first field so indexes can be
+    used.
+
+    Example:
+        >>> build_keyset_filter("i", [("name", "ASC"), ("_key", "DESC")])
+        (
+            'i.@sort_0_0 >= @after_0 AND (i.@sort_0_0 > @after_0 OR '
+            '(i.@sort_0_0 == @after_0 AND i.@sort_1_0 < @after_1))',
+            {'sort_0_0': 'name', 'sort_1_0': '_key'}
+        )
+
+    :param instance_name: The name we're using in the AQL query for the instances we're
+    looping over.
+    :param sort: An Iterable containing tuples of fields and directions.
+    :return: A tuple of the expression and the bind_vars for the fields.
+    """
+    fields = []
+    bind_vars = {}
+    for i, (field, direction) in enumerate(sort):
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Invalid sort direction '{direction}' for field {field}")
+        field_str, field_bind_vars = split_field(field, f"sort_{i}")
+        bind_vars.update(field_bind_vars)
+        operator = ">" if direction == ASCENDING else "<"
+        fields.append((f"{instance_name}.{field_str}", operator, f"@after_{i}"))
+
+    if not fields:
+        raise ValueError("Keyset pagination requires a sort")
+
+    # Build the comparison from the last field backwards
+    field_str, operator, value = fields[-1]
+    expression = f"{field_str} {operator} {value}"
+    for i, (field_str, operator, value) in enumerate(reversed(fields[:-1])):
+        if i:
+            expression = f"({expression})"
+        expression = (
+            f"{field_str} {operator} {value} OR "
+            f"({field_str} == {value} AND {expression})"
+        )
+
+    field_str, operator, value = fields[0]
+    if len(fields) > 1:
+        expression = f"{field_str} {operator}= {value} AND ({expression})"
+
+    return expression, bind_vars
+
+
+def chunks(items: List[T], size: int) -> Iterator[List[T]]:
+    """
+    Split a list into consecutive chunks of at most **size** items.
+
+    Example:
+        >>> list(chunks([1, 2, 3, 4, 5], 2))
+        [[1, 2], [3, 4], [5]]
+
+    :param items: The list to split.
+    :param size: The maximum size of each chunk.
+    """
+    for i in range(0, len(items), size):
+        yield items[i : i + size]